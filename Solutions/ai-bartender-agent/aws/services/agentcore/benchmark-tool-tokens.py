@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Compare tool result sizes: getDrinks (whole menu) vs the filtered menu tools
+
+Builds the MCP tools' menu index (src/mcp-tools/menu_index.py) from the seed menu
+and runs a set of typical guest requests through findDrinks and getSections. Each
+result is serialized the way the gateway hands it to the model and compared with
+the full getDrinks payload, which the agent otherwise reads on every turn.
+
+Token counts are an estimate (words and punctuation marks, which tracks BPE
+tokenizers closely for short JSON); the ratio between payloads is what matters.
+Tool schemas are not included: they are sent with every model call either way.
+
+Runs locally with the standard library only.
+
+Usage:
+    python3 benchmark-tool-tokens.py [--menu ../../../database/seed-data/drinks.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "src", "mcp-tools"))
+
+from menu_index import MenuIndex, compact_drink  # noqa: E402
+
+DEFAULT_MENU = os.path.join(HERE, "..", "..", "..", "database", "seed-data", "drinks.json")
+TOKEN_ESTIMATE = re.compile(r"\w+|[^\w\s]")
+
+# (guest request, tool, arguments)
+QUERIES = [
+    ("Something with gin?", "findDrinks", {"ingredients": ["gin"]}),
+    ("Anything non-alcoholic?", "findDrinks", {"section": "Non-Alcoholic"}),
+    ("Sour and refreshing", "findDrinks", {"flavors": ["sour", "fresh"]}),
+    ("Vodka, but I can't have egg or dairy", "findDrinks", {"ingredients": ["vodka"], "exclude": ["egg", "dairy"]}),
+    ("Something bubbly from the festive menu", "findDrinks", {"section": "Festive", "flavors": ["sparkling"]}),
+    ("Fruity, no alcohol", "findDrinks", {"section": "Non-Alcoholic", "flavors": ["fruity"]}),
+    ("What kinds of drinks do you have?", "getSections", {}),
+]
+
+
+def load_menu(path: str) -> list[dict]:
+    """Seed menu (drinks.json) in the shape the handler loads from the database."""
+    with open(path, encoding="utf-8") as f:
+        menu = json.load(f)["menu"]
+    return [
+        {
+            "id": f"{section['name']}/{drink['name']}",
+            "section_id": section["name"],
+            "section_name": section["name"],
+            "name": drink["name"],
+            "description": drink.get("description", ""),
+            "ingredients": [ingredient["item"] for ingredient in drink["ingredients"]],
+        }
+        for section in menu["sections"]
+        for drink in section["drinks"]
+    ]
+
+
+def measure(payload: dict) -> tuple[int, int]:
+    text = json.dumps(payload, ensure_ascii=False)
+    return len(text), len(TOKEN_ESTIMATE.findall(text))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare getDrinks and filtered tool result sizes")
+    parser.add_argument("--menu", default=DEFAULT_MENU, help="Menu JSON in seed-data format (default: seed menu)")
+    args = parser.parse_args()
+
+    index = MenuIndex(load_menu(args.menu))
+    full = {"drinks": [compact_drink(d) for d in index.drinks], "count": len(index.drinks)}
+    full_chars, full_tokens = measure(full)
+
+    print(f"Menu: {len(index.drinks)} drinks in {len(index.sections)} sections\n")
+    print(f"{'Guest request':<40} {'Tool':<12} {'Drinks':>6} {'Chars':>7} {'~Tokens':>8} {'vs getDrinks':>13}")
+    print("-" * 91)
+    print(f"{'(any)':<40} {'getDrinks':<12} {full['count']:>6} {full_chars:>7} {full_tokens:>8} {'100.0%':>13}")
+
+    total_tokens = 0
+    for request, tool, arguments in QUERIES:
+        result = index.find(**arguments) if tool == "findDrinks" else index.list_sections()
+        chars, tokens = measure(result)
+        total_tokens += tokens
+        drinks = len(result.get("drinks", [])) if tool == "findDrinks" else "-"
+        print(f"{request:<40} {tool:<12} {drinks:>6} {chars:>7} {tokens:>8} {tokens / full_tokens:>13.1%}")
+
+    average = total_tokens / len(QUERIES)
+    print(f"\nAverage filtered result: ~{average:.0f} tokens vs ~{full_tokens} for getDrinks "
+          f"({1 - average / full_tokens:.0%} fewer input tokens per tool call)")
+
+
+if __name__ == "__main__":
+    main()
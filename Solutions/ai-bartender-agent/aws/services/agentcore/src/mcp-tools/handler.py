@@ -1,12 +1,19 @@
-"""MCP tool handler for AgentCore Gateway — provides drink-related tools."""
+"""MCP tool handler for AgentCore Gateway — provides drink-related tools.
+
+A warm container keeps one database connection and an index of the active menu
+in memory. The menu is re-read only when its version (drink and section counts
+and latest updated_at) changes, checked at most every MENU_VERSION_CHECK_SECONDS.
+"""
 
 import json
 import os
+import sys
 import time
 from contextlib import contextmanager
 
 import boto3
 import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 from psycopg2.extras import RealDictCursor
 
 from aws_lambda_powertools import Logger, Tracer
@@ -19,13 +26,26 @@ DSQL_PORT = 5432
 DSQL_DATABASE = "postgres"
 DSQL_SSL_MODE = "require"
 DEFAULT_REGION = "eu-west-1"
+# Aurora DSQL closes connections after one hour; reconnect well before that
+CONNECTION_MAX_AGE_SECONDS = int(os.environ.get("CONNECTION_MAX_AGE_SECONDS", "3000"))
+# How often a warm container asks the database whether the menu changed
+MENU_VERSION_CHECK_SECONDS = int(os.environ.get("MENU_VERSION_CHECK_SECONDS", "30"))
+
+sys.path.insert(0, "/opt/python")
+from shared import log_policy
+
+from menu_index import MenuIndex, compact_drink
 
 tracer = Tracer()
 logger = Logger()
+log_policy.install(logger)
 
 _db_config: dict | None = None
 _sts_cache: dict = {"credentials": None, "expires_at": 0}
 _auth_token_cache: dict = {"token": None, "expires_at": 0}
+_connection = None
+_connection_opened_at = 0.0
+_menu_cache: dict = {"version": None, "checked_at": 0.0, "index": None, "payloads": {}}
 
 
 def get_db_config() -> dict[str, str]:
@@ -93,12 +113,11 @@ def get_auth_token(endpoint: str, region: str, role_arn: str) -> str:
     return token
 
 
-@contextmanager
-def get_connection():
+def open_connection():
     """Create a database connection with DSQL IAM authentication."""
     config = get_db_config()
     token = get_auth_token(config["endpoint"], config["region"], config["role_arn"])
-    conn = psycopg2.connect(
+    return psycopg2.connect(
         host=config["endpoint"],
         port=DSQL_PORT,
         database=DSQL_DATABASE,
@@ -107,10 +126,45 @@ def get_connection():
         sslmode=DSQL_SSL_MODE,
         cursor_factory=RealDictCursor,
     )
+
+
+def close_connection() -> None:
+    global _connection
+    if _connection is not None and not _connection.closed:
+        _connection.close()
+    _connection = None
+
+
+@contextmanager
+def get_connection():
+    """Yield the container's warm connection, reopening it when closed or too old.
+
+    The transaction is always ended on exit so the next call reads a fresh snapshot.
+    A connection that raised a database error is discarded.
+    """
+    global _connection, _connection_opened_at
+
+    expired = time.monotonic() - _connection_opened_at > CONNECTION_MAX_AGE_SECONDS
+    if _connection is None or _connection.closed or expired:
+        close_connection()
+        _connection = open_connection()
+        _connection_opened_at = time.monotonic()
+        logger.info("Opened database connection")
+
+    conn = _connection
     try:
         yield conn
+    except psycopg2.Error:
+        close_connection()
+        raise
     finally:
-        conn.close()
+        if not conn.closed:
+            try:
+                if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                logger.warning("Discarding broken database connection")
+                close_connection()
 
 
 def parse_ingredients(ingredients) -> list:
@@ -123,70 +177,188 @@ def parse_ingredients(ingredients) -> list:
     return ingredients if isinstance(ingredients, list) else []
 
 
+def get_menu_version(cur) -> tuple:
+    """Cheap change marker: any insert, update or delete of a drink or section moves it."""
+    cur.execute(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM cocktails.drinks) AS drink_count,
+            (SELECT MAX(updated_at) FROM cocktails.drinks) AS drinks_updated,
+            (SELECT COUNT(*) FROM cocktails.sections) AS section_count,
+            (SELECT MAX(updated_at) FROM cocktails.sections) AS sections_updated
+        """
+    )
+    row = cur.fetchone()
+    return tuple(
+        value.isoformat() if hasattr(value, "isoformat") else value
+        for value in (row["drink_count"], row["drinks_updated"], row["section_count"], row["sections_updated"])
+    )
+
+
 @tracer.capture_method
-def get_drinks_from_db(section_id: str = None) -> list:
-    """Fetch drinks from the database, optionally filtered by section."""
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            if section_id:
-                cur.execute(
-                    """
-                    SELECT id, section_id, name, description,
-                           ingredients, image_url
-                    FROM cocktails.drinks
-                    WHERE section_id = %s AND is_active = true
-                    ORDER BY name
-                    """,
-                    [section_id],
-                )
-            else:
-                cur.execute(
-                    """
-                    SELECT id, section_id, name, description,
-                           ingredients, image_url
-                    FROM cocktails.drinks
-                    WHERE is_active = true
-                    ORDER BY name
-                    """
-                )
-            return cur.fetchall()
+def refresh_menu() -> bool:
+    """Check the menu version and reload the active drinks if it moved. Returns True on reload.
+
+    A connection dropped while the container was idle is reopened once.
+    """
+    for attempt in (1, 2):
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cur:
+                    version = get_menu_version(cur)
+                    if version == _menu_cache["version"]:
+                        return False
+                    cur.execute(
+                        """
+                        SELECT d.id, d.section_id, s.name AS section_name,
+                               d.name, d.description, d.ingredients
+                        FROM cocktails.drinks d
+                        LEFT JOIN cocktails.sections s ON s.id = d.section_id
+                        WHERE d.is_active = true
+                        """
+                    )
+                    rows = cur.fetchall()
+            break
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            if attempt == 2:
+                raise
+            logger.warning("Database connection lost, reconnecting")
+
+    _menu_cache["version"] = version
+    _menu_cache["index"] = MenuIndex(
+        [
+            {
+                "id": str(row["id"]),
+                "section_id": str(row["section_id"]),
+                "section_name": row["section_name"] or "",
+                "name": row["name"],
+                "description": row["description"] or "",
+                "ingredients": parse_ingredients(row["ingredients"]),
+            }
+            for row in rows
+        ]
+    )
+    _menu_cache["payloads"] = {}
+    return True
+
+
+def get_menu_index() -> tuple[MenuIndex, str]:
+    """The container's menu index and how it was served: cache, checked, reload or stale."""
+    served = "cache"
+    if _menu_cache["version"] is None or time.monotonic() - _menu_cache["checked_at"] >= MENU_VERSION_CHECK_SECONDS:
+        try:
+            served = "reload" if refresh_menu() else "checked"
+        except psycopg2.Error:
+            if _menu_cache["version"] is None:
+                raise
+            # The menu rarely changes; a short database outage shouldn't take the tool down
+            logger.warning("Menu version check failed, serving cached menu", exc_info=True)
+            served = "stale"
+        else:
+            _menu_cache["checked_at"] = time.monotonic()
+    return _menu_cache["index"], served
+
+
+def as_list(value) -> list[str]:
+    """Tool list arguments, tolerating a single string or a comma-separated one from the model."""
+    if isinstance(value, str):
+        value = value.split(",")
+    return [item.strip() for item in value or [] if isinstance(item, str) and item.strip()]
 
 
 @tracer.capture_method
-def handle_get_drinks(tool_input: dict) -> dict:
-    """Handle the getDrinks tool invocation."""
+def handle_get_drinks(tool_input: dict) -> tuple[dict, str]:
+    """Handle the getDrinks tool invocation: the whole menu, or one section by id."""
     section_id = tool_input.get("section_id")
+    index, served = get_menu_index()
 
-    rows = get_drinks_from_db(section_id)
+    key = section_id or ""
+    if key not in _menu_cache["payloads"]:
+        # Compact format: name + ingredients only
+        # The model knows what classic drinks are, no need for descriptions
+        drinks = [
+            compact_drink(drink)
+            for drink in index.drinks
+            if not section_id or drink["section_id"] == section_id
+        ]
+        _menu_cache["payloads"][key] = {"drinks": drinks, "count": len(drinks)}
+    return _menu_cache["payloads"][key], served
 
-    # Compact format: name + ingredients only
-    # The model knows what classic drinks are, no need for descriptions
-    drinks = [
-        {
-            "name": row["name"],
-            "ingredients": ", ".join(parse_ingredients(row["ingredients"])),
-        }
-        for row in rows
-    ]
 
-    logger.info(
-        "getDrinks tool executed",
-        extra={"count": len(drinks), "section_id": section_id},
+@tracer.capture_method
+def handle_find_drinks(tool_input: dict) -> tuple[dict, str]:
+    """Handle the findDrinks tool invocation: only the drinks matching every filter."""
+    index, served = get_menu_index()
+    return (
+        index.find(
+            ingredients=as_list(tool_input.get("ingredients")),
+            section=tool_input.get("section"),
+            flavors=as_list(tool_input.get("flavors")),
+            exclude=as_list(tool_input.get("exclude")),
+            limit=tool_input.get("limit"),
+        ),
+        served,
     )
 
-    return {"drinks": drinks, "count": len(drinks)}
+
+@tracer.capture_method
+def handle_get_sections(tool_input: dict) -> tuple[dict, str]:
+    """Handle the getSections tool invocation: section names with drink counts."""
+    index, served = get_menu_index()
+    return index.list_sections(), served
+
+
+@tracer.capture_method
+def handle_get_menu_version(tool_input: dict) -> tuple[dict, str]:
+    """Handle the getMenuVersion tool invocation: the version of the menu the other tools serve.
+
+    Not meant for the model; the chat functions key their response cache on it.
+    """
+    _, served = get_menu_index()
+    return {"version": ":".join(str(value) for value in _menu_cache["version"])}, served
+
+
+TOOL_HANDLERS = {
+    "getDrinks": handle_get_drinks,
+    "findDrinks": handle_find_drinks,
+    "getSections": handle_get_sections,
+    "getMenuVersion": handle_get_menu_version,
+}
+
+
+def get_tool_name(context: LambdaContext) -> str:
+    """Tool name from the gateway's client context ("<target>___<tool>"), getDrinks if absent."""
+    client_context = getattr(context, "client_context", None)
+    custom = getattr(client_context, "custom", None) or {}
+    return custom.get("bedrockAgentCoreToolName", "getDrinks").split("___")[-1]
 
 
 @logger.inject_lambda_context
 @tracer.capture_lambda_handler
 def handler(event: dict, context: LambdaContext) -> dict:
     """Lambda handler for MCP tool invocations from AgentCore Gateway."""
-    logger.info("MCP tool invocation received", extra={"event": event})
+    log_policy.start_invocation()
+    log_policy.log_payload(logger, "MCP tool invocation received", event)
 
-    try:
-        result = handle_get_drinks(event)
+    tool_name = get_tool_name(context)
+    tool = TOOL_HANDLERS.get(tool_name)
+    if tool is None:
+        logger.warning("Unknown tool requested", extra={"tool": tool_name})
+        return {"error": f"Unknown tool: {tool_name}"}
 
-        logger.info("Tool executed successfully", extra={"count": result.get("count")})
+    try:
+        result, served = tool(event)
+
+        logger.info(
+            "Tool executed successfully",
+            extra={
+                "tool": tool_name,
+                "input": event,
+                "count": result.get("count"),
+                "served": served,
+                "menu_version": list(_menu_cache["version"]),
+            },
+        )
         return result
 
     except Exception as e:
@@ -0,0 +1,145 @@
+"""In-memory index over the active menu for the filtered drink tools.
+
+Standard library only, so benchmark-tool-tokens.py can build the same index
+from the seed menu without a database.
+"""
+
+import re
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+DEFAULT_LIMIT = 5
+MAX_LIMIT = 20
+
+# Allergen groups the exclude filter expands into ingredient words. Keyword based:
+# it only knows what the ingredient names say, so guests should still ask staff.
+ALLERGEN_INGREDIENTS = {
+    "dairy": ("milk", "cream", "butter", "yoghurt", "yogurt", "cheese", "lactose"),
+    # Cocktail foam is usually egg white
+    "egg": ("egg", "eggs", "albumen", "meringue", "foam"),
+    "nuts": ("nut", "nuts", "almond", "hazelnut", "walnut", "pecan", "pistachio", "peanut", "orgeat", "amaretto"),
+    "gluten": ("beer", "wheat", "barley", "malt", "rye"),
+    "sulfites": ("wine", "vermouth", "prosecco", "champagne", "sherry", "port"),
+}
+
+# Ingredient names that contain an allergen word without containing the allergen
+ALLERGEN_FREE_NAMES = {
+    "beer": ("ginger beer", "root beer"),
+}
+
+# Flavor words guests use, mapped to words found in drink descriptions and ingredients
+FLAVOR_TERMS = {
+    "sour": ("sour", "tart", "lemon", "lime"),
+    "citrus": ("citrus", "lemon", "lime", "orange", "grapefruit", "limoncello"),
+    "sweet": ("sweet", "syrup", "liqueur", "honey"),
+    "bitter": ("bitter", "bitters", "campari", "aperol"),
+    "fruity": ("fruity", "fruit", "apple", "raspberry", "berry", "pineapple", "peach", "passion"),
+    "spicy": ("spicy", "spice", "spiced", "ginger", "cinnamon"),
+    "fresh": ("fresh", "refreshing", "light", "mint", "cucumber"),
+    "sparkling": ("sparkling", "bubbles", "prosecco", "champagne", "soda", "tonic"),
+    "creamy": ("creamy", "cream", "foam"),
+    "coffee": ("coffee", "espresso"),
+}
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+def normalize(value: str) -> str:
+    return " ".join(tokenize(value))
+
+
+def compact_drink(drink: dict) -> dict:
+    """Token-lean drink shape shared by all tools: name + joined ingredients."""
+    return {"name": drink["name"], "ingredients": ", ".join(drink["ingredients"])}
+
+
+class MenuIndex:
+    """Active drinks indexed by ingredient word, description/ingredient word and section.
+
+    Ingredients are matched on whole words or the full ingredient name, so "gin"
+    finds "Gin" but not "Ginger beer".
+    """
+
+    def __init__(self, drinks: list[dict]):
+        """drinks: dicts with id, section_id, section_name, name, description and ingredients (list)."""
+        self.drinks = sorted(drinks, key=lambda d: d["name"])
+        self.by_ingredient = {}
+        self.by_word = {}
+        self.by_section = {}
+        self.sections = {}
+
+        for position, drink in enumerate(self.drinks):
+            ingredients = [i for i in drink["ingredients"] if isinstance(i, str)]
+            for ingredient in ingredients:
+                for key in {normalize(ingredient), *tokenize(ingredient)}:
+                    self.by_ingredient.setdefault(key, set()).add(position)
+            for word in tokenize(drink["description"]) + tokenize(" ".join(ingredients)) + tokenize(drink["name"]):
+                self.by_word.setdefault(word, set()).add(position)
+
+            section = drink.get("section_name") or ""
+            self.by_section.setdefault(normalize(section), set()).add(position)
+            self.by_section.setdefault(str(drink["section_id"]), set()).add(position)
+            self.sections[section] = self.sections.get(section, 0) + 1
+
+    def match_ingredient(self, ingredient: str) -> set:
+        return self.by_ingredient.get(normalize(ingredient), set())
+
+    def match_flavor(self, flavor: str) -> set:
+        terms = FLAVOR_TERMS.get(normalize(flavor), ()) + tuple(tokenize(flavor))
+        return set().union(*(self.by_word.get(term, set()) for term in terms))
+
+    def match_excluded(self, allergen: str) -> set:
+        words = ALLERGEN_INGREDIENTS.get(normalize(allergen), ())
+        return set().union(self.match_ingredient(allergen), *(self.match_allergen_word(w) for w in words))
+
+    def match_allergen_word(self, word: str) -> set:
+        """Drinks with an ingredient containing word, not counting ALLERGEN_FREE_NAMES ("ginger beer" for "beer")."""
+        positions = self.by_ingredient.get(word, set())
+        free_names = ALLERGEN_FREE_NAMES.get(word)
+        if not free_names:
+            return positions
+
+        def contains(ingredient: str) -> bool:
+            name = f" {normalize(ingredient)} "
+            for free_name in free_names:
+                name = name.replace(f" {free_name} ", " ")
+            return word in name.split()
+
+        return {p for p in positions if any(contains(i) for i in self.drinks[p]["ingredients"] if isinstance(i, str))}
+
+    def find(
+        self,
+        ingredients: list[str] = (),
+        section: str | None = None,
+        flavors: list[str] = (),
+        exclude: list[str] = (),
+        limit: int = DEFAULT_LIMIT,
+    ) -> dict:
+        """Drinks matching every ingredient, the section and every flavor, minus excluded ones."""
+        candidates = set(range(len(self.drinks)))
+        if section:
+            key = str(section) if str(section) in self.by_section else normalize(section)
+            if key not in self.by_section:
+                # Let the model retry with a real section name
+                return {"drinks": [], "count": 0, "sections": sorted(self.sections)}
+            candidates &= self.by_section[key]
+        for ingredient in ingredients:
+            candidates &= self.match_ingredient(ingredient)
+        for flavor in flavors:
+            candidates &= self.match_flavor(flavor)
+        for allergen in exclude:
+            candidates -= self.match_excluded(allergen)
+
+        limit = max(1, min(int(limit or DEFAULT_LIMIT), MAX_LIMIT))
+        matches = sorted(candidates)
+        result = {"drinks": [compact_drink(self.drinks[p]) for p in matches[:limit]], "count": len(matches)}
+        if len(matches) > limit:
+            result["more"] = len(matches) - limit
+        if exclude:
+            # Exclusion only knows ingredient names; the model passes this on to the guest
+            result["confirm_with_staff"] = True
+        return result
+
+    def list_sections(self) -> dict:
+        return {"sections": [{"name": name, "drinks": count} for name, count in sorted(self.sections.items())]}
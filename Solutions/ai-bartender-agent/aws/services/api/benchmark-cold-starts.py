@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Simulate cold-start rate: one function per route vs the router build
+
+Replays a synthetic bar evening (guests browsing and ordering, bartenders working
+the queue, occasional menu admin) against two deployment shapes:
+
+    per-function  every route has its own Lambda and its own pool of warm instances
+    router        every route shares one Lambda (build-router.py)
+
+Each pool starts empty. An instance serves one request at a time and is reclaimed
+after --idle-minutes without traffic. A request that finds no idle warm instance
+is a cold start. Rates are requests per hour during the event; "rare" groups the
+routes used less than RARE_ROUTE_PER_HOUR times an hour, mostly menu admin.
+
+Runs locally with the standard library only.
+
+Usage:
+    python3 benchmark-cold-starts.py [--hours 4] [--idle-minutes 10] [--seed 1]
+"""
+
+import argparse
+import random
+from collections import defaultdict
+
+# (route, audience, requests per hour, warm duration ms)
+TRAFFIC_MIX = [
+    ("GET /sections", "guest", 300, 40),
+    ("GET /drinks", "guest", 600, 60),
+    ("GET /drinks/{id}", "guest", 400, 40),
+    ("GET /drinks/search", "guest", 60, 30),
+    ("POST /orders", "guest", 120, 80),
+    ("GET /orders", "guest", 240, 50),
+    ("GET /orders/{id}", "guest", 360, 40),
+    ("POST /register", "guest", 40, 120),
+    ("POST /auth/refresh", "guest", 20, 80),
+    ("OPTIONS *", "guest", 500, 5),
+    ("GET /admin/orders", "admin", 360, 80),
+    ("POST /admin/orders/claim", "admin", 110, 60),
+    ("PUT /admin/orders/{id}", "admin", 110, 60),
+    ("GET /admin/drinks", "admin", 6, 90),
+    ("PUT /admin/drinks/{id}", "admin", 2, 120),
+    ("POST /admin/drinks", "admin", 0.5, 120),
+    ("DELETE /admin/drinks/{id}", "admin", 0.2, 150),
+    ("GET /admin/sections", "admin", 3, 40),
+    ("PUT /admin/sections", "admin", 0.3, 90),
+    ("POST /admin/sections", "admin", 0.2, 80),
+    ("PUT /admin/sections/{id}", "admin", 0.3, 80),
+    ("DELETE /admin/sections/{id}", "admin", 0.1, 80),
+    ("GET /admin/registration-codes", "admin", 2, 60),
+    ("POST /admin/registration-codes", "admin", 1, 70),
+    ("DELETE /admin/registration-codes/{code}", "admin", 0.3, 60),
+    ("POST /admin/images/upload-url", "admin", 0.3, 40),
+    ("GET /admin/menu/export", "admin", 0.1, 200),
+    ("POST /admin/menu/import", "admin", 0.05, 800),
+]
+
+# Init time: a per-route package imports one handler; the router imports the
+# route table up front and each handler module lazily on its first request
+FUNCTION_INIT_MS = 700
+ROUTER_INIT_MS = 800
+
+# Routes below this rate are reported separately as "rare"
+RARE_ROUTE_PER_HOUR = 10
+
+
+def generate_requests(hours: float, rng: random.Random) -> list[tuple]:
+    """Poisson arrivals per route. Returns sorted (time_ms, route, audiences, duration_ms)."""
+    horizon_ms = hours * 3600 * 1000
+    requests = []
+    for route, audience, per_hour, duration_ms in TRAFFIC_MIX:
+        rate_per_ms = per_hour / 3600 / 1000
+        audiences = (audience, "rare", "all") if per_hour < RARE_ROUTE_PER_HOUR else (audience, "all")
+        t = rng.expovariate(rate_per_ms)
+        while t < horizon_ms:
+            requests.append((t, route, audiences, duration_ms))
+            t += rng.expovariate(rate_per_ms)
+    return sorted(requests)
+
+
+def simulate(requests: list[tuple], pool_for, init_ms: int, idle_ms: float) -> dict:
+    """Replay requests against warm pools keyed by pool_for(route)."""
+    pools = defaultdict(list)  # pool -> [busy_until_ms per instance]
+    stats = defaultdict(lambda: {"requests": 0, "cold": 0})
+
+    for t, route, audiences, duration_ms in requests:
+        instances = pools[pool_for(route)]
+        # Reclaim instances idle longer than the timeout
+        instances[:] = [busy_until for busy_until in instances if t - busy_until < idle_ms]
+
+        idle = [i for i, busy_until in enumerate(instances) if busy_until <= t]
+        cold = not idle
+        if cold:
+            instances.append(t + init_ms + duration_ms)
+        else:
+            instances[idle[0]] = t + duration_ms
+
+        for key in audiences:
+            stats[key]["requests"] += 1
+            stats[key]["cold"] += cold
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare cold-start rate per-function vs router build")
+    parser.add_argument("--hours", type=float, default=4, help="Length of the event (default: 4)")
+    parser.add_argument(
+        "--idle-minutes", type=float, default=10, help="Idle time before an instance is reclaimed (default: 10)"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    args = parser.parse_args()
+
+    requests = generate_requests(args.hours, random.Random(args.seed))
+    idle_ms = args.idle_minutes * 60 * 1000
+
+    results = {
+        "per-function": simulate(requests, lambda route: route, FUNCTION_INIT_MS, idle_ms),
+        "router": simulate(requests, lambda route: "router", ROUTER_INIT_MS, idle_ms),
+    }
+
+    print(f"{len(requests):,} requests over {args.hours:g}h, instances reclaimed after {args.idle_minutes:g} min idle\n")
+    print(f"{'Build':<14} {'Audience':<8} {'Requests':>9} {'Cold':>6} {'Cold rate':>10}")
+    print("-" * 51)
+    for build, stats in results.items():
+        for audience in ("guest", "admin", "rare", "all"):
+            s = stats[audience]
+            rate = s["cold"] / s["requests"] if s["requests"] else 0
+            print(f"{build:<14} {audience:<8} {s['requests']:>9,} {s['cold']:>6} {rate:>10.2%}")
+
+
+if __name__ == "__main__":
+    main()
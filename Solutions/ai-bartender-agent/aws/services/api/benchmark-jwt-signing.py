@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark JWT signing and verification per algorithm
+
+Compares sign/verify throughput for the algorithms setup-jwt-keys.py can generate
+(RS256, ES256, EdDSA), using the same access token payload the register and
+refreshToken handlers issue. The "RS256 (PEM per call)" row reproduces the old
+handlers, which re-read and re-parsed the private key on every token.
+
+Runs locally, no AWS access needed.
+
+Usage:
+    python3 benchmark-jwt-signing.py [--iterations N]
+
+Requirements:
+    - PyJWT and cryptography (pip install PyJWT cryptography)
+"""
+
+import argparse
+import time
+import uuid
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+
+def generate_keys():
+    """Return {algorithm: (private_key, public_key)} as parsed key objects."""
+    rsa_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    ec_key = ec.generate_private_key(ec.SECP256R1())
+    ed_key = ed25519.Ed25519PrivateKey.generate()
+    return {
+        "RS256": (rsa_key, rsa_key.public_key()),
+        "ES256": (ec_key, ec_key.public_key()),
+        "EdDSA": (ed_key, ed_key.public_key()),
+    }
+
+
+def to_pem(private_key) -> str:
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+def access_token_payload() -> dict:
+    now = int(time.time())
+    return {
+        "token_type": "access",
+        "username": "benchmark",
+        "user_key": str(uuid.uuid4()),
+        "iat": now,
+        "exp": now + (4 * 60 * 60),
+    }
+
+
+def ops_per_second(fn, iterations: int) -> float:
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def benchmark(iterations: int) -> list[tuple]:
+    payload = access_token_payload()
+    headers = {"kid": "benchmark"}
+    results = []
+
+    for algorithm, (private_key, public_key) in generate_keys().items():
+        token = jwt.encode(payload, private_key, algorithm=algorithm, headers=headers)
+        sign = ops_per_second(
+            lambda: jwt.encode(payload, private_key, algorithm=algorithm, headers=headers),
+            iterations,
+        )
+        verify = ops_per_second(
+            lambda: jwt.decode(token, public_key, algorithms=[algorithm]),
+            iterations,
+        )
+        results.append((algorithm, sign, verify, len(token)))
+
+        if algorithm == "RS256":
+            pem = to_pem(private_key)
+            sign_pem = ops_per_second(
+                lambda: jwt.encode(payload, pem, algorithm=algorithm, headers=headers),
+                iterations,
+            )
+            results.append(("RS256 (PEM per call)", sign_pem, None, len(token)))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JWT sign/verify throughput per algorithm")
+    parser.add_argument(
+        "--iterations", type=int, default=2000, help="Operations per measurement (default: 2000)"
+    )
+    args = parser.parse_args()
+
+    print(f"{'Algorithm':<22} {'Sign ops/s':>12} {'Verify ops/s':>14} {'Token bytes':>12}")
+    print("-" * 63)
+    for algorithm, sign, verify, size in benchmark(args.iterations):
+        verify_col = f"{verify:>14,.0f}" if verify else f"{'-':>14}"
+        print(f"{algorithm:<22} {sign:>12,.0f} {verify_col} {size:>12}")
+
+
+if __name__ == "__main__":
+    main()
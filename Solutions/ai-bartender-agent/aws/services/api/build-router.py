@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Generate the single-function router build of the API
+
+Reads template.yaml and writes template-router.yaml, where every function with
+API events is folded into one RouterFunction (src/router/). The router keeps all
+of their events, so paths, authorizers, caching and usage plans are unchanged,
+and gets the union of their environment variables and IAM statements.
+Authorizers and the SQS consumer stay separate functions.
+
+Also writes src/router/routes.json, which maps "METHOD /path" to the handler
+directory the router loads for that route and the database role ("reader",
+"writer" or null) its function was deployed with.
+
+Usage:
+    python3 build-router.py
+    sam build -t template-router.yaml --build-in-source
+    sam deploy -t template-router.yaml
+
+Requirements:
+    - PyYAML (pip install pyyaml)
+"""
+
+import json
+import os
+import sys
+
+import yaml
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SOURCE_TEMPLATE = os.path.join(HERE, "template.yaml")
+ROUTER_TEMPLATE = os.path.join(HERE, "template-router.yaml")
+ROUTES_FILE = os.path.join(HERE, "src", "router", "routes.json")
+
+
+class Tagged:
+    """A CloudFormation short-form intrinsic (!Ref, !Sub, ...) kept as-is."""
+
+    def __init__(self, tag, value):
+        self.tag = tag
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, Tagged) and (self.tag, self.value) == (other.tag, other.value)
+
+
+class TemplateLoader(yaml.SafeLoader):
+    pass
+
+
+class TemplateDumper(yaml.SafeDumper):
+    def ignore_aliases(self, data):
+        return True
+
+
+def construct_tagged(loader, suffix, node):
+    if isinstance(node, yaml.ScalarNode):
+        value = loader.construct_scalar(node)
+    elif isinstance(node, yaml.SequenceNode):
+        value = loader.construct_sequence(node, deep=True)
+    else:
+        value = loader.construct_mapping(node, deep=True)
+    return Tagged(f"!{suffix}", value)
+
+
+def represent_tagged(dumper, data):
+    if isinstance(data.value, list):
+        return dumper.represent_sequence(data.tag, data.value)
+    if isinstance(data.value, dict):
+        return dumper.represent_mapping(data.tag, data.value)
+    return dumper.represent_scalar(data.tag, data.value)
+
+
+TemplateLoader.add_multi_constructor("!", construct_tagged)
+TemplateDumper.add_representer(Tagged, represent_tagged)
+
+
+def api_events(properties):
+    return {
+        name: event
+        for name, event in (properties.get("Events") or {}).items()
+        if event.get("Type") == "Api"
+    }
+
+
+def build_router(template):
+    """Replace API functions with one RouterFunction. Returns (template, routes)."""
+    resources = template["Resources"]
+    routes = {}
+    events = {}
+    variables = {}
+    managed_policies = []
+    statements = []
+    timeout = memory = None
+    database_users = {}
+
+    for name, resource in list(resources.items()):
+        if resource.get("Type") != "AWS::Serverless::Function":
+            continue
+        properties = resource["Properties"]
+        function_events = api_events(properties)
+        if not function_events:
+            continue
+        if resource.get("Condition") or len(function_events) != len(properties.get("Events", {})):
+            sys.exit(f"✗ {name}: conditional functions or mixed event types can't be routed")
+
+        module = properties["CodeUri"].rstrip("/").split("/")[-1]
+        handler_name = properties.get("Handler", "handler.handler").split(".")[-1]
+
+        function_variables = dict((properties.get("Environment") or {}).get("Variables") or {})
+        # Per-function log service names would all collide on one function
+        function_variables.pop("POWERTOOLS_SERVICE_NAME", None)
+        # Reader and writer routes log in as different database users; keep both
+        database = next(
+            (role for role in ("writer", "reader") if f"DATABASE_{role.upper()}_ROLE" in function_variables), None
+        )
+        if database:
+            database_users[database] = function_variables.pop("DATABASE_USER")
+        variables.update(function_variables)
+
+        for event_name, event in function_events.items():
+            route_key = f"{event['Properties']['Method'].upper()} {event['Properties']['Path']}"
+            routes[route_key] = {"module": module, "handler": handler_name, "database": database}
+            events[event_name if event_name not in events else f"{name}{event_name}"] = event
+
+        for policy in properties.get("Policies", []):
+            if isinstance(policy, dict):
+                for statement in policy.get("Statement", []):
+                    if statement not in statements:
+                        statements.append(statement)
+            elif policy not in managed_policies:
+                managed_policies.append(policy)
+
+        timeout = max(filter(None, [timeout, properties.get("Timeout")]), default=None)
+        memory = max(filter(None, [memory, properties.get("MemorySize")]), default=None)
+        del resources[name]
+
+    # The router keeps one connection per role and picks it by the route's "database"
+    for role, user in database_users.items():
+        variables[f"DATABASE_{role.upper()}_USER"] = user
+
+    router = {
+        "CodeUri": "src/router/",
+        "Handler": "handler.handler",
+        "Description": "All API routes behind one function (router build)",
+    }
+    if timeout:
+        router["Timeout"] = timeout
+    if memory:
+        router["MemorySize"] = memory
+    router["Environment"] = {"Variables": {"POWERTOOLS_SERVICE_NAME": "api-router", **variables}}
+    router["Policies"] = managed_policies + [{"Version": "2012-10-17", "Statement": statements}]
+    router["Events"] = events
+
+    resources["RouterFunction"] = {
+        "Type": "AWS::Serverless::Function",
+        "Properties": router,
+        "Metadata": {"BuildMethod": "makefile"},
+    }
+    return template, routes
+
+
+def main():
+    with open(SOURCE_TEMPLATE) as f:
+        template = yaml.load(f, Loader=TemplateLoader)
+
+    template, routes = build_router(template)
+    template["Description"] = f"{template.get('Description', '').strip()} (router build)"
+
+    with open(ROUTER_TEMPLATE, "w") as f:
+        f.write("# Generated by build-router.py from template.yaml - do not edit\n")
+        yaml.dump(template, f, Dumper=TemplateDumper, sort_keys=False, width=120)
+
+    with open(ROUTES_FILE, "w") as f:
+        json.dump(dict(sorted(routes.items())), f, indent=2)
+        f.write("\n")
+
+    modules = {route["module"] for route in routes.values()}
+    print(f"✓ {len(routes)} routes from {len(modules)} functions folded into RouterFunction")
+    print(f"  {os.path.relpath(ROUTER_TEMPLATE, HERE)}")
+    print(f"  {os.path.relpath(ROUTES_FILE, HERE)}")
+
+
+if __name__ == "__main__":
+    main()
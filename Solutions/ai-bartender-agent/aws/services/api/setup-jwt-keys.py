@@ -2,11 +2,16 @@
 """
 Setup JWT Keys for User Authentication
 
-This script generates an RSA key pair and stores it in AWS Secrets Manager
-for use in JWT token signing and verification.
+This script generates a key pair (RSA, ECDSA P-256 or Ed25519) and stores it in
+AWS Secrets Manager for use in JWT token signing and verification. Each key gets
+a kid that is written into the token header.
+
+With --rotate, the current key is kept in "previous_keys" so tokens it already
+signed still verify until they expire; only the new key signs from then on.
 
 Usage:
     python3 setup-jwt-keys.py [--secret-name SECRET_NAME] [--region REGION] [--profile PROFILE]
+                              [--algorithm {RS256,ES256,EdDSA}] [--rotate]
 
 Requirements:
     - OpenSSL installed
@@ -16,22 +21,37 @@ Requirements:
 Examples:
     python3 setup-jwt-keys.py --profile <your-aws-profile> --region us-west-1
     python3 setup-jwt-keys.py --profile <your-aws-profile> --region eu-west-1
+    python3 setup-jwt-keys.py --profile <your-aws-profile> --algorithm ES256 --rotate
 """
 
 import argparse
 import json
 import os
+import secrets
 import subprocess
 import sys
 import tempfile
+import time
 
 import boto3
 from botocore.exceptions import ClientError
 
 
-def generate_rsa_keypair(key_size=2048):
-    """Generate RSA key pair using OpenSSL. Returns (private_key_pem, public_key_pem)."""
-    print(f"Generating {key_size}-bit RSA key pair...")
+# openssl genpkey arguments per JWT algorithm
+KEY_TYPES = {
+    "RS256": lambda key_size: ["-algorithm", "RSA", "-pkeyopt", f"rsa_keygen_bits:{key_size}"],
+    "ES256": lambda key_size: ["-algorithm", "EC", "-pkeyopt", "ec_paramgen_curve:P-256"],
+    "EdDSA": lambda key_size: ["-algorithm", "ED25519"],
+}
+
+# Rotated-out public keys kept for verification; older ones are dropped
+MAX_PREVIOUS_KEYS = 2
+
+
+def generate_keypair(algorithm="RS256", key_size=2048):
+    """Generate a key pair using OpenSSL. Returns (private_key_pem, public_key_pem)."""
+    label = f"{key_size}-bit RSA" if algorithm == "RS256" else algorithm
+    print(f"Generating {label} key pair...")
 
     with tempfile.TemporaryDirectory() as tmpdir:
         private_key_path = os.path.join(tmpdir, "private.pem")
@@ -39,7 +59,7 @@ def generate_rsa_keypair(key_size=2048):
 
         try:
             subprocess.run(
-                ["openssl", "genrsa", "-out", private_key_path, str(key_size)],
+                ["openssl", "genpkey", *KEY_TYPES[algorithm](key_size), "-out", private_key_path],
                 check=True,
                 capture_output=True,
                 text=True,
@@ -48,7 +68,7 @@ def generate_rsa_keypair(key_size=2048):
             subprocess.run(
                 [
                     "openssl",
-                    "rsa",
+                    "pkey",
                     "-in",
                     private_key_path,
                     "-pubout",
@@ -66,7 +86,7 @@ def generate_rsa_keypair(key_size=2048):
             with open(public_key_path, "r") as f:
                 public_key = f.read()
 
-            print("✓ RSA key pair generated successfully")
+            print(f"✓ {label} key pair generated successfully")
             return private_key, public_key
 
         except subprocess.CalledProcessError as e:
@@ -79,7 +99,44 @@ def generate_rsa_keypair(key_size=2048):
             sys.exit(1)
 
 
-def create_or_update_secret(secret_name, private_key, public_key, region, profile=None):
+def generate_kid(algorithm):
+    """Key id written to the JWT header, e.g. es256-20250101-1a2b3c."""
+    return f"{algorithm.lower()}-{time.strftime('%Y%m%d')}-{secrets.token_hex(3)}"
+
+
+def get_previous_keys(secret_name, region, profile=None):
+    """Public keys to keep verifying after rotation: the current key plus its predecessors."""
+    session = boto3.Session(profile_name=profile, region_name=region)
+    client = session.client("secretsmanager")
+
+    try:
+        current = json.loads(client.get_secret_value(SecretId=secret_name)["SecretString"])
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ResourceNotFoundException":
+            # First deployment: --rotate is safe to use before the secret exists
+            print("No current key to rotate out, generating the first key")
+            return []
+        print(f"✗ Error reading current secret: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if "public_key" not in current:
+        print("No current key to rotate out, generating the first key")
+        return []
+
+    retired = {
+        # Keys created before kid support sign without one; tokens are matched on None
+        "kid": current.get("kid"),
+        "public_key": current["public_key"],
+        "algorithm": current.get("algorithm", "RS256"),
+    }
+    print(f"Keeping current key '{retired['kid']}' for verification")
+    return [retired, *current.get("previous_keys", [])][:MAX_PREVIOUS_KEYS]
+
+
+def create_or_update_secret(
+    secret_name, private_key, public_key, region, profile=None,
+    algorithm="RS256", kid=None, previous_keys=None,
+):
     """Create or update the JWT keys secret in Secrets Manager."""
     session = boto3.Session(profile_name=profile, region_name=region)
     client = session.client("secretsmanager")
@@ -87,14 +144,16 @@ def create_or_update_secret(secret_name, private_key, public_key, region, profil
     secret_value = {
         "private_key": private_key,
         "public_key": public_key,
-        "algorithm": "RS256",
+        "algorithm": algorithm,
+        "kid": kid,
+        "previous_keys": previous_keys or [],
     }
 
     try:
         print(f"Creating secret '{secret_name}' in region '{region}'...")
         client.create_secret(
             Name=secret_name,
-            Description="RSA key pair for JWT token signing and verification",
+            Description="Key pair for JWT token signing and verification",
             SecretString=json.dumps(secret_value),
         )
         print(f"✓ Secret '{secret_name}' created successfully")
@@ -125,7 +184,7 @@ def verify_secret(secret_name, region, profile=None):
         response = client.get_secret_value(SecretId=secret_name)
         secret_data = json.loads(response["SecretString"])
 
-        required_keys = ["private_key", "public_key", "algorithm"]
+        required_keys = ["private_key", "public_key", "algorithm", "kid"]
         missing_keys = [key for key in required_keys if key not in secret_data]
 
         if missing_keys:
@@ -149,6 +208,8 @@ def verify_secret(secret_name, region, profile=None):
         print(f"  Name: {secret_name}")
         print(f"  Region: {region}")
         print(f"  Algorithm: {secret_data['algorithm']}")
+        print(f"  Key id: {secret_data['kid']}")
+        print(f"  Previous keys: {[k.get('kid') for k in secret_data.get('previous_keys', [])]}")
         print(f"  Private key length: {len(secret_data['private_key'])} chars")
         print(f"  Public key length: {len(secret_data['public_key'])} chars")
 
@@ -161,7 +222,7 @@ def verify_secret(secret_name, region, profile=None):
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Generate RSA keys and store in AWS Secrets Manager for JWT authentication"
+        description="Generate JWT signing keys and store in AWS Secrets Manager for JWT authentication"
     )
     parser.add_argument(
         "--secret-name",
@@ -176,7 +237,18 @@ def main():
         type=int,
         default=2048,
         choices=[2048, 3072, 4096],
-        help="RSA key size in bits (default: 2048)",
+        help="RSA key size in bits, RS256 only (default: 2048)",
+    )
+    parser.add_argument(
+        "--algorithm",
+        default="RS256",
+        choices=list(KEY_TYPES),
+        help="Signing algorithm: RS256, ES256 (ECDSA P-256) or EdDSA (Ed25519) (default: RS256)",
+    )
+    parser.add_argument(
+        "--rotate",
+        action="store_true",
+        help="Keep the current public key for verification instead of a hard cutover",
     )
     parser.add_argument(
         "--profile",
@@ -191,9 +263,14 @@ def main():
     print("=" * 60)
     print()
 
-    private_key, public_key = generate_rsa_keypair(args.key_size)
+    previous_keys = (
+        get_previous_keys(args.secret_name, args.region, args.profile) if args.rotate else []
+    )
+    private_key, public_key = generate_keypair(args.algorithm, args.key_size)
+    kid = generate_kid(args.algorithm)
     create_or_update_secret(
-        args.secret_name, private_key, public_key, args.region, args.profile
+        args.secret_name, private_key, public_key, args.region, args.profile,
+        algorithm=args.algorithm, kid=kid, previous_keys=previous_keys,
     )
 
     if verify_secret(args.secret_name, args.region, args.profile):
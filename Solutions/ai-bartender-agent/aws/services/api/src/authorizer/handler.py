@@ -2,6 +2,7 @@
 
 import json
 import os
+import sys
 
 import jwt
 import requests
@@ -9,8 +10,12 @@ import requests
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+sys.path.insert(0, "/opt/python")
+from shared import log_policy
+
 tracer = Tracer()
 logger = Logger()
+log_policy.install(logger)
 
 # Cache JWKS across invocations
 _jwks_cache = None
@@ -155,8 +160,9 @@ def generate_policy(
 @tracer.capture_lambda_handler
 def handler(event: dict, context: LambdaContext) -> dict:
     """Lambda authorizer handler."""
+    log_policy.start_invocation()
     method_arn = event.get("methodArn", "*")
-    logger.info("Authorizer invoked", extra={"event": event})
+    log_policy.log_payload(logger, "Authorizer invoked", event)
 
     try:
         # Extract token from Authorization header
@@ -168,7 +174,6 @@ def handler(event: dict, context: LambdaContext) -> dict:
             return generate_policy("unknown", "Deny", method_arn)
 
         token = auth_header[7:]
-        logger.info("Calling validate_token", extra={"token": token})
         claims = validate_token(token)
 
         # Check admin role for /admin/ endpoints
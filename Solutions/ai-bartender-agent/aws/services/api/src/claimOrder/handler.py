@@ -0,0 +1,218 @@
+"""POST /admin/orders/claim - Claim the oldest pending order for the calling bartender."""
+
+import json
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import boto3
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+from aws_lambda_powertools import Logger, Tracer
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+sys.path.insert(0, "/opt/python")
+from shared.event_publisher import publish_order_status_changed
+
+tracer = Tracer()
+logger = Logger()
+
+MAX_CLAIM_ATTEMPTS = int(os.environ.get("MAX_CLAIM_ATTEMPTS", "5"))
+CLAIM_BACKOFF_BASE_MS = 20
+
+_db_config = None
+
+
+def get_db_config():
+    global _db_config
+    if _db_config is None:
+        _db_config = {
+            "endpoint": os.environ.get("DSQL_CLUSTER_ENDPOINT", ""),
+            "region": os.environ.get("AWS_REGION", "eu-west-1"),
+            "role_arn": os.environ.get("DATABASE_WRITER_ROLE", ""),
+            "user": os.environ.get("DATABASE_USER", "admin"),
+        }
+    return _db_config
+
+
+@tracer.capture_method
+def get_auth_token(endpoint: str, region: str, role_arn: str) -> str:
+    if role_arn:
+        sts = boto3.client("sts", region_name=region)
+        creds = sts.assume_role(RoleArn=role_arn, RoleSessionName="dsql-session")[
+            "Credentials"
+        ]
+        dsql = boto3.client(
+            "dsql",
+            region_name=region,
+            aws_access_key_id=creds["AccessKeyId"],
+            aws_secret_access_key=creds["SecretAccessKey"],
+            aws_session_token=creds["SessionToken"],
+        )
+    else:
+        dsql = boto3.client("dsql", region_name=region)
+    return dsql.generate_db_connect_auth_token(Hostname=endpoint, Region=region)
+
+
+@contextmanager
+def get_connection():
+    config = get_db_config()
+    token = get_auth_token(config["endpoint"], config["region"], config["role_arn"])
+    conn = psycopg2.connect(
+        host=config["endpoint"],
+        port=5432,
+        database="postgres",
+        user=config["user"],
+        password=token,
+        sslmode="require",
+        cursor_factory=RealDictCursor,
+    )
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def response(status_code: int, body: dict, origin: str = "*") -> dict:
+    return {
+        "statusCode": status_code,
+        "headers": {
+            "Content-Type": "application/json",
+            "Access-Control-Allow-Origin": origin,
+            "Access-Control-Allow-Headers": "Content-Type,Authorization,X-Api-Key",
+            "Access-Control-Allow-Methods": "POST,OPTIONS",
+        },
+        "body": json.dumps(body),
+    }
+
+
+def get_admin_username(event: dict) -> str:
+    """Extract the bartender's username from the Cognito JWT authorizer context."""
+    authorizer = event.get("requestContext", {}).get("authorizer", {})
+    jwt_claims = authorizer.get("jwt", {}).get("claims", {})
+    rest_claims = authorizer.get("claims", {})
+
+    return (
+        jwt_claims.get("cognito:username")
+        or jwt_claims.get("username")
+        or jwt_claims.get("email")
+        or rest_claims.get("cognito:username")
+        or rest_claims.get("username")
+        or authorizer.get("username")
+        or "admin"
+    )
+
+
+def backoff_with_jitter(attempt: int) -> float:
+    """Full-jitter backoff in seconds so competing bartenders spread out their retries."""
+    return random.uniform(0, CLAIM_BACKOFF_BASE_MS * (2 ** attempt)) / 1000
+
+
+@tracer.capture_method
+def claim_next_order(claimed_by: str):
+    """Move the oldest pending order to in_progress in one statement.
+
+    DSQL uses optimistic concurrency, so when two bartenders claim the same order
+    one commit fails with a serialization error; that caller retries and picks up
+    the next oldest order. Returns (row, attempts) with row None if nothing is pending.
+    """
+    with get_connection() as conn:
+        for attempt in range(1, MAX_CLAIM_ATTEMPTS + 1):
+            now = datetime.utcnow()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        UPDATE cocktails.orders o
+                        SET status = 'in_progress', claimed_by = %s, claimed_at = %s, updated_at = %s
+                        FROM cocktails.drinks d
+                        WHERE o.id = (
+                            SELECT po.id FROM cocktails.orders po
+                            JOIN cocktails.drinks pd ON po.drink_id = pd.id
+                            WHERE po.status = 'pending'
+                            ORDER BY po.created_at ASC
+                            LIMIT 1
+                        )
+                        AND o.status = 'pending'
+                        AND d.id = o.drink_id
+                        RETURNING o.id, o.drink_id, o.user_session_id, o.user_key, o.status,
+                                  o.created_at, o.updated_at, o.completed_at, o.claimed_by, o.claimed_at,
+                                  d.name AS drink_name, d.image_url AS drink_image_url
+                        """,
+                        [claimed_by, now, now],
+                    )
+                    row = cur.fetchone()
+                    conn.commit()
+                    return row, attempt
+            except psycopg2.extensions.TransactionRollbackError:
+                conn.rollback()
+                if attempt == MAX_CLAIM_ATTEMPTS:
+                    raise
+                logger.info("Claim conflict, retrying", extra={"attempt": attempt})
+                time.sleep(backoff_with_jitter(attempt))
+
+
+def format_timestamp(value):
+    return value.isoformat() + "Z" if value else None
+
+
+@logger.inject_lambda_context
+@tracer.capture_lambda_handler
+def handler(event: dict, context: LambdaContext) -> dict:
+    """Handle POST /admin/orders/claim request."""
+    headers = event.get("headers") or {}
+    origin = headers.get("origin") or headers.get("Origin") or "*"
+
+    try:
+        claimed_by = get_admin_username(event)
+
+        try:
+            row, attempts = claim_next_order(claimed_by)
+        except psycopg2.extensions.TransactionRollbackError:
+            logger.warning("Claim retries exhausted", extra={"claimed_by": claimed_by})
+            return response(409, {"error": "Could not claim an order, please retry"}, origin)
+
+        if not row:
+            return response(404, {"error": "No pending orders"}, origin)
+
+        user_key = str(row["user_key"]) if row.get("user_key") else row["user_session_id"]
+
+        order = {
+            "id": str(row["id"]),
+            "drink": {
+                "id": str(row["drink_id"]),
+                "name": row["drink_name"],
+                "image_url": row["drink_image_url"],
+            },
+            "user_session_id": row["user_session_id"],
+            "user_key": user_key,
+            "status": row["status"],
+            "claimed_by": row["claimed_by"],
+            "claimed_at": format_timestamp(row["claimed_at"]),
+            "created_at": format_timestamp(row["created_at"]),
+            "updated_at": format_timestamp(row["updated_at"]),
+            "completed_at": format_timestamp(row["completed_at"]),
+        }
+
+        logger.info(
+            "Claimed order",
+            extra={"order_id": order["id"], "claimed_by": claimed_by, "attempts": attempts},
+        )
+
+        try:
+            publish_order_status_changed(order, user_key, "pending")
+        except Exception as e:
+            logger.warning(
+                "Failed to publish order status changed event",
+                extra={"order_id": order["id"], "error": str(e)},
+            )
+
+        return response(200, {"data": order}, origin)
+
+    except Exception:
+        logger.exception("Failed to claim order")
+        return response(500, {"error": "Internal server error"}, origin)
@@ -14,7 +14,7 @@ def handler(event, context):
         "statusCode": 200,
         "headers": {
             "Access-Control-Allow-Origin": allowed_origin,
-            "Access-Control-Allow-Headers": "Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,Accept,Accept-Language,X-Registration-Code",
+            "Access-Control-Allow-Headers": "Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,Accept,Accept-Language,X-Registration-Code,Idempotency-Key",
             "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
             "Access-Control-Max-Age": "600",
         },
@@ -2,9 +2,10 @@
 
 import json
 import os
+import time
 import uuid
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import boto3
 import psycopg2
@@ -18,7 +19,18 @@ from event_publisher import publish_order_created
 tracer = Tracer()
 logger = Logger()
 
+IDEMPOTENCY_KEY_HEADER = "idempotency-key"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+IDEMPOTENCY_TTL_HOURS = int(os.environ.get("IDEMPOTENCY_TTL_HOURS", "24"))
+
+# "direct" writes the order to DSQL in the request; "queued" enqueues it for processOrderQueue
+ORDER_INTAKE_MODE = os.environ.get("ORDER_INTAKE_MODE", "direct")
+ORDER_INTAKE_QUEUE_URL = os.environ.get("ORDER_INTAKE_QUEUE_URL", "")
+# Namespace for deriving stable order ids from idempotency keys in queued mode
+QUEUED_ORDER_NAMESPACE = uuid.UUID("5b8f7a3e-2c4d-4e91-9a57-0d6c1f2b8e34")
+
 _db_config = None
+_sqs_client = None
 
 
 def get_db_config():
@@ -54,6 +66,14 @@ def get_auth_token(endpoint: str, region: str, role_arn: str) -> str:
     return dsql.generate_db_connect_auth_token(Hostname=endpoint, Region=region)
 
 
+def get_sqs_client():
+    """Get a cached SQS client for the order intake queue."""
+    global _sqs_client
+    if _sqs_client is None:
+        _sqs_client = boto3.client("sqs")
+    return _sqs_client
+
+
 @contextmanager
 def get_connection():
     """Get database connection with IAM authentication."""
@@ -74,13 +94,16 @@ def get_connection():
         conn.close()
 
 
-def response(status_code: int, body: dict) -> dict:
+def response(status_code: int, body: dict, extra_headers: dict | None = None) -> dict:
+    headers = {
+        "Content-Type": "application/json",
+        "Access-Control-Allow-Origin": "*",
+    }
+    if extra_headers:
+        headers.update(extra_headers)
     return {
         "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": "*",
-        },
+        "headers": headers,
         "body": json.dumps(body),
     }
 
@@ -93,18 +116,89 @@ def get_user_context(event: dict):
     return user_key, username
 
 
+def get_idempotency_key(event: dict) -> tuple[str | None, str | None]:
+    """Extract the optional Idempotency-Key header. Returns (key, error)."""
+    headers = event.get("headers") or {}
+    key = next(
+        (value for name, value in headers.items() if name.lower() == IDEMPOTENCY_KEY_HEADER),
+        None,
+    )
+    if key is None:
+        return None, None
+
+    key = key.strip()
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        return None, f"Idempotency-Key must be 1-{IDEMPOTENCY_KEY_MAX_LENGTH} characters"
+    return key, None
+
+
+def format_order(row: dict) -> dict:
+    """Build the API representation of a newly created order."""
+    return {
+        "id": str(row["id"]),
+        "drink": {
+            "id": str(row["drink_id"]),
+            "name": row["drink_name"],
+            "image_url": row["drink_image_url"],
+        },
+        "user_session_id": str(row["user_key"]),
+        "user_key": str(row["user_key"]),
+        "status": row["status"],
+        "created_at": row["created_at"].isoformat() + "Z" if row["created_at"] else None,
+    }
+
+
+def get_stored_response(cur, user_key: str, idempotency_key: str):
+    """Return the stored response for an idempotency key, dropping it if expired."""
+    cur.execute(
+        """
+        SELECT drink_id, status_code, response_body, expires_at
+        FROM cocktails.order_idempotency_keys
+        WHERE user_key = %s AND idempotency_key = %s
+        """,
+        [user_key, idempotency_key],
+    )
+    stored = cur.fetchone()
+    if stored and stored["expires_at"] <= datetime.utcnow():
+        cur.execute(
+            """
+            DELETE FROM cocktails.order_idempotency_keys
+            WHERE user_key = %s AND idempotency_key = %s
+            """,
+            [user_key, idempotency_key],
+        )
+        return None
+    return stored
+
+
+def replay_stored_response(stored: dict, drink_id: str):
+    """Turn a stored idempotency record into (order_data, error_code, replayed)."""
+    if str(stored["drink_id"]) != drink_id:
+        return None, "idempotency_key_mismatch", False
+    return json.loads(stored["response_body"]), None, True
+
+
 @tracer.capture_method
-def create_order_in_db(drink_id: str, user_key: str):
-    """Create order for authenticated user. Returns (order_data, error_code)."""
+def create_order_in_db(drink_id: str, user_key: str, idempotency_key: str | None = None):
+    """Create order for authenticated user. Returns (order_data, error_code, replayed).
+
+    When an idempotency key is supplied, the order and its response are committed in
+    one transaction so a retry either sees both or neither.
+    """
     with get_connection() as conn:
         with conn.cursor() as cur:
+            if idempotency_key:
+                stored = get_stored_response(cur, user_key, idempotency_key)
+                if stored:
+                    return replay_stored_response(stored, drink_id)
+
             cur.execute(
                 "SELECT id, name, image_url FROM cocktails.drinks WHERE id = %s AND is_active = true",
                 [drink_id],
             )
             drink = cur.fetchone()
             if not drink:
-                return None, "drink_not_found"
+                return None, "drink_not_found", False
 
             cur.execute(
                 """
@@ -114,7 +208,7 @@ def create_order_in_db(drink_id: str, user_key: str):
                 [user_key],
             )
             if cur.fetchone():
-                return None, "active_order_exists"
+                return None, "active_order_exists", False
 
             # user_session_id uses user_key as placeholder (NOT NULL constraint in DSQL)
             order_id = str(uuid.uuid4())
@@ -128,12 +222,86 @@ def create_order_in_db(drink_id: str, user_key: str):
                 [order_id, drink_id, user_key, user_key, now, now],
             )
             row = cur.fetchone()
-            conn.commit()
-
             row["drink_name"] = drink["name"]
             row["drink_image_url"] = drink["image_url"]
+            order = format_order(row)
+
+            if idempotency_key:
+                cur.execute(
+                    """
+                    INSERT INTO cocktails.order_idempotency_keys
+                    (user_key, idempotency_key, order_id, drink_id, status_code, response_body, created_at, expires_at)
+                    VALUES (%s, %s, %s, %s, 201, %s, %s, %s)
+                    """,
+                    [
+                        user_key,
+                        idempotency_key,
+                        order_id,
+                        drink_id,
+                        json.dumps(order),
+                        now,
+                        now + timedelta(hours=IDEMPOTENCY_TTL_HOURS),
+                    ],
+                )
+
+            try:
+                conn.commit()
+            except (psycopg2.IntegrityError, psycopg2.extensions.TransactionRollbackError):
+                # A concurrent request with the same key won the race; answer with its response
+                conn.rollback()
+                if not idempotency_key:
+                    raise
+                stored = get_stored_response(cur, user_key, idempotency_key)
+                if not stored:
+                    raise
+                return replay_stored_response(stored, drink_id)
+
+            return order, None, False
+
+
+@tracer.capture_method
+def enqueue_order(drink_id: str, user_key: str, idempotency_key: str | None = None) -> dict:
+    """Assign an order id and hand the order to the intake queue without touching DSQL.
+
+    With an idempotency key the id is derived from the user, key and drink within the
+    current IDEMPOTENCY_TTL_HOURS window, so a retried request enqueues the same id.
+    processOrderQueue drops duplicates and rejects a key reused for another drink, using
+    the same expiring idempotency records as direct mode.
+    """
+    if idempotency_key:
+        window = int(time.time() // (IDEMPOTENCY_TTL_HOURS * 3600))
+        order_id = str(uuid.uuid5(QUEUED_ORDER_NAMESPACE, f"{user_key}:{idempotency_key}:{drink_id}:{window}"))
+    else:
+        order_id = str(uuid.uuid4())
+    requested_at = datetime.utcnow().isoformat() + "Z"
+
+    get_sqs_client().send_message(
+        QueueUrl=ORDER_INTAKE_QUEUE_URL,
+        MessageBody=json.dumps({
+            "order_id": order_id,
+            "drink_id": drink_id,
+            "user_key": user_key,
+            "idempotency_key": idempotency_key,
+            "requested_at": requested_at,
+        }),
+    )
+
+    return {
+        "id": order_id,
+        "drink": {"id": drink_id},
+        "user_session_id": user_key,
+        "user_key": user_key,
+        "status": "queued",
+        "created_at": requested_at,
+    }
+
 
-            return row, None
+def is_valid_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(str(value))
+        return True
+    except ValueError:
+        return False
 
 
 @logger.inject_lambda_context
@@ -166,7 +334,25 @@ def handler(event: dict, context: LambdaContext) -> dict:
                 "error": {"code": "INVALID_REQUEST", "message": "drink_id is required"},
             })
 
-        row, error = create_order_in_db(drink_id, user_key)
+        idempotency_key, key_error = get_idempotency_key(event)
+        if key_error:
+            return response(400, {
+                "success": False,
+                "error": {"code": "INVALID_REQUEST", "message": key_error},
+            })
+
+        if ORDER_INTAKE_MODE == "queued":
+            if not is_valid_uuid(drink_id):
+                return response(400, {
+                    "success": False,
+                    "error": {"code": "INVALID_REQUEST", "message": "drink_id must be a valid UUID"},
+                })
+
+            order = enqueue_order(drink_id, user_key, idempotency_key)
+            logger.info("Queued order", extra={"order_id": order["id"], "drink_id": drink_id, "user_key": user_key})
+            return response(202, {"success": True, "data": order})
+
+        order, error, replayed = create_order_in_db(drink_id, user_key, idempotency_key)
 
         if error == "drink_not_found":
             return response(404, {
@@ -180,20 +366,20 @@ def handler(event: dict, context: LambdaContext) -> dict:
                 "error": {"code": "CONFLICT", "message": "You already have an active order"},
             })
 
-        order = {
-            "id": row["id"],
-            "drink": {
-                "id": row["drink_id"],
-                "name": row["drink_name"],
-                "image_url": row["drink_image_url"],
-            },
-            "user_session_id": row["user_key"],
-            "user_key": row["user_key"],
-            "status": row["status"],
-            "created_at": row["created_at"].isoformat() + "Z" if row["created_at"] else None,
-        }
+        if error == "idempotency_key_mismatch":
+            return response(422, {
+                "success": False,
+                "error": {
+                    "code": "IDEMPOTENCY_KEY_REUSED",
+                    "message": "Idempotency-Key was already used for a different request",
+                },
+            })
+
+        if replayed:
+            logger.info("Replayed order response", extra={"order_id": order["id"], "user_key": user_key})
+            return response(201, {"success": True, "data": order}, {"Idempotent-Replayed": "true"})
 
-        logger.info("Created order", extra={"order_id": row["id"], "drink_id": drink_id, "user_key": user_key})
+        logger.info("Created order", extra={"order_id": order["id"], "drink_id": drink_id, "user_key": user_key})
 
         try:
             publish_order_created(order, user_key)
@@ -1,5 +1,7 @@
 """POST /admin/registration-codes - Create a new registration code."""
 
+import csv
+import io
 import json
 import os
 import uuid
@@ -8,7 +10,7 @@ from datetime import datetime, timedelta
 
 import boto3
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.utilities.typing import LambdaContext
@@ -16,6 +18,11 @@ from aws_lambda_powertools.utilities.typing import LambdaContext
 tracer = Tracer()
 logger = Logger()
 
+# Well below Aurora DSQL's per-transaction row limit, so one batch is one transaction
+MAX_BATCH_COUNT = 500
+
+CSV_COLUMNS = ["code", "registration_url", "expires_at", "max_uses", "notes", "created_by", "created_at"]
+
 _db_config = None
 
 
@@ -80,6 +87,22 @@ def response(status_code: int, body: dict) -> dict:
     }
 
 
+def csv_response(status_code: int, rows: list[dict], filename: str) -> dict:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(rows)
+    return {
+        "statusCode": status_code,
+        "headers": {
+            "Content-Type": "text/csv; charset=utf-8",
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Access-Control-Allow-Origin": "*",
+        },
+        "body": buffer.getvalue(),
+    }
+
+
 def get_admin_context(event: dict) -> tuple[str | None, str | None]:
     """Extract admin context from Cognito JWT authorizer."""
     authorizer = event.get("requestContext", {}).get("authorizer", {})
@@ -106,41 +129,65 @@ def get_admin_context(event: dict) -> tuple[str | None, str | None]:
 
 
 @tracer.capture_method
-def create_registration_code(
+def create_registration_codes(
     created_by: str,
+    count: int = 1,
     expires_in_hours: int = 24,
     notes: str | None = None,
     max_uses: int = 1,
-) -> dict:
-    """Create a new registration code in the database."""
-    code = str(uuid.uuid4())
+) -> list[dict]:
+    """Create registration codes with one multi-row INSERT in a single transaction."""
     expires_at = datetime.utcnow() + timedelta(hours=expires_in_hours)
+    values = [
+        (str(uuid.uuid4()), created_by, expires_at, notes, max_uses, 0)
+        for _ in range(count)
+    ]
 
     with get_connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(
+            rows = execute_values(
+                cur,
                 """
                 INSERT INTO cocktails.registration_codes
                 (code, created_by, expires_at, notes, max_uses, use_count)
-                VALUES (%s, %s, %s, %s, %s, 0)
+                VALUES %s
                 RETURNING code, created_at, created_by, expires_at, is_used, notes, max_uses, use_count
                 """,
-                [code, created_by, expires_at, notes, max_uses],
+                values,
+                page_size=MAX_BATCH_COUNT,
+                fetch=True,
             )
-            row = cur.fetchone()
             conn.commit()
 
             logger.info(
-                "Created registration code",
+                "Created registration codes",
                 extra={
-                    "code": code,
+                    "count": len(rows),
                     "created_by": created_by,
                     "expires_at": expires_at.isoformat(),
                     "max_uses": max_uses,
                 },
             )
 
-            return row
+            return rows
+
+
+def format_registration_code(row: dict, frontend_url: str) -> dict:
+    return {
+        "code": str(row["code"]),
+        "created_at": (
+            row["created_at"].isoformat() + "Z" if row["created_at"] else None
+        ),
+        "created_by": row["created_by"],
+        "expires_at": (
+            row["expires_at"].isoformat() + "Z" if row["expires_at"] else None
+        ),
+        "is_used": row["is_used"],
+        "notes": row["notes"],
+        "max_uses": row["max_uses"],
+        "use_count": row["use_count"],
+        "registration_url": f"{frontend_url}/register?code={row['code']}",
+    }
 
 
 @logger.inject_lambda_context
@@ -247,32 +294,59 @@ def handler(event: dict, context: LambdaContext) -> dict:
                 },
             )
 
-        row = create_registration_code(
+        count = body.get("count")
+        if count is not None:
+            if isinstance(count, str):
+                try:
+                    count = int(count)
+                except ValueError:
+                    count = None
+            # bool is an int subclass; {"count": true} must not mean 1
+            if isinstance(count, bool) or not isinstance(count, int) or count < 1 or count > MAX_BATCH_COUNT:
+                return response(
+                    400,
+                    {
+                        "success": False,
+                        "error": {
+                            "code": "INVALID_REQUEST",
+                            "message": f"count must be between 1 and {MAX_BATCH_COUNT}",
+                        },
+                    },
+                )
+
+        query_params = event.get("queryStringParameters") or {}
+        output_format = query_params.get("format") or body.get("format") or "json"
+        if output_format not in ("json", "csv"):
+            return response(
+                400,
+                {
+                    "success": False,
+                    "error": {
+                        "code": "INVALID_REQUEST",
+                        "message": "format must be json or csv",
+                    },
+                },
+            )
+
+        rows = create_registration_codes(
             created_by=created_by,
+            count=count or 1,
             expires_in_hours=expires_in_hours,
             notes=notes,
             max_uses=max_uses,
         )
 
         frontend_url = os.environ.get("FRONTEND_URL", "")
-        registration_url = f"{frontend_url}/register?code={row['code']}"
-
-        result = {
-            "code": str(row["code"]),
-            "created_at": (
-                row["created_at"].isoformat() + "Z" if row["created_at"] else None
-            ),
-            "created_by": row["created_by"],
-            "expires_at": (
-                row["expires_at"].isoformat() + "Z" if row["expires_at"] else None
-            ),
-            "is_used": row["is_used"],
-            "notes": row["notes"],
-            "max_uses": row["max_uses"],
-            "use_count": row["use_count"],
-            "registration_url": registration_url,
-        }
+        codes = [format_registration_code(row, frontend_url) for row in rows]
+
+        if output_format == "csv":
+            filename = f"registration-codes-{datetime.utcnow():%Y%m%d-%H%M%S}.csv"
+            return csv_response(201, codes, filename)
+
+        if count is not None:
+            return response(201, {"success": True, "data": codes, "count": len(codes)})
 
+        result = codes[0]
         return response(201, {"success": True, "data": result})
 
     except Exception as e:
@@ -0,0 +1,224 @@
+"""GET /admin/menu/export - Export the full menu as JSON or CSV."""
+
+import csv
+import io
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime
+
+import boto3
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+from aws_lambda_powertools import Logger, Tracer
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+tracer = Tracer()
+logger = Logger()
+
+_db_config = None
+
+
+def get_db_config():
+    global _db_config
+    if _db_config is None:
+        _db_config = {
+            "endpoint": os.environ.get("DSQL_CLUSTER_ENDPOINT", ""),
+            "region": os.environ.get("AWS_REGION", "eu-west-1"),
+            "role_arn": os.environ.get("DATABASE_READER_ROLE", ""),
+            "user": os.environ.get("DATABASE_USER", "admin"),
+        }
+    return _db_config
+
+
+@tracer.capture_method
+def get_auth_token(endpoint: str, region: str, role_arn: str) -> str:
+    if role_arn:
+        sts = boto3.client("sts", region_name=region)
+        creds = sts.assume_role(RoleArn=role_arn, RoleSessionName="dsql-session")[
+            "Credentials"
+        ]
+        dsql = boto3.client(
+            "dsql",
+            region_name=region,
+            aws_access_key_id=creds["AccessKeyId"],
+            aws_secret_access_key=creds["SecretAccessKey"],
+            aws_session_token=creds["SessionToken"],
+        )
+    else:
+        dsql = boto3.client("dsql", region_name=region)
+    return dsql.generate_db_connect_auth_token(Hostname=endpoint, Region=region)
+
+
+@contextmanager
+def get_connection():
+    config = get_db_config()
+    token = get_auth_token(config["endpoint"], config["region"], config["role_arn"])
+    conn = psycopg2.connect(
+        host=config["endpoint"],
+        port=5432,
+        database="postgres",
+        user=config["user"],
+        password=token,
+        sslmode="require",
+        cursor_factory=RealDictCursor,
+    )
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+CSV_COLUMNS = [
+    "section",
+    "section_order",
+    "name",
+    "description",
+    "ingredients",
+    "recipe",
+    "image_url",
+    "is_active",
+]
+
+
+def response(status_code: int, body: dict, origin: str = "*") -> dict:
+    return {
+        "statusCode": status_code,
+        "headers": {
+            "Content-Type": "application/json",
+            "Access-Control-Allow-Origin": origin,
+            "Access-Control-Allow-Headers": "Content-Type,Authorization,X-Api-Key",
+            "Access-Control-Allow-Methods": "GET,OPTIONS",
+        },
+        "body": json.dumps(body),
+    }
+
+
+def csv_response(status_code: int, rows: list[dict], filename: str, origin: str = "*") -> dict:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return {
+        "statusCode": status_code,
+        "headers": {
+            "Content-Type": "text/csv; charset=utf-8",
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Access-Control-Allow-Origin": origin,
+            "Access-Control-Allow-Headers": "Content-Type,Authorization,X-Api-Key",
+            "Access-Control-Allow-Methods": "GET,OPTIONS",
+        },
+        "body": buffer.getvalue(),
+    }
+
+
+def parse_ingredients(ingredients):
+    if isinstance(ingredients, str):
+        try:
+            return json.loads(ingredients)
+        except json.JSONDecodeError:
+            return []
+    return ingredients if isinstance(ingredients, list) else []
+
+
+@tracer.capture_method
+def get_menu_from_db():
+    """Read all sections and drinks with two queries on one connection."""
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT id, name, display_order FROM cocktails.sections ORDER BY display_order, name"
+            )
+            sections = cur.fetchall()
+
+            cur.execute(
+                """
+                SELECT section_id, name, description, ingredients, recipe, image_url, is_active
+                FROM cocktails.drinks
+                ORDER BY name
+                """
+            )
+            drinks = cur.fetchall()
+
+    return sections, drinks
+
+
+def build_menu_document(sections: list[dict], drinks: list[dict]) -> dict:
+    """Build a menu document in the format accepted by POST /admin/menu/import."""
+    drinks_by_section = {}
+    for drink in drinks:
+        drinks_by_section.setdefault(str(drink["section_id"]), []).append(
+            {
+                "name": drink["name"],
+                "description": drink["description"] or "",
+                "ingredients": parse_ingredients(drink["ingredients"]),
+                "recipe": json.loads(drink["recipe"]) if drink["recipe"] else None,
+                "image_url": drink["image_url"] or "",
+                "is_active": drink["is_active"],
+            }
+        )
+
+    return {
+        "menu": {
+            "exported_at": datetime.utcnow().isoformat() + "Z",
+            "sections": [
+                {
+                    "name": section["name"],
+                    "display_order": section["display_order"],
+                    "drinks": drinks_by_section.get(str(section["id"]), []),
+                }
+                for section in sections
+            ],
+        }
+    }
+
+
+def flatten_menu(document: dict) -> list[dict]:
+    """One CSV row per drink; list and object fields are serialized as JSON."""
+    return [
+        {
+            "section": section["name"],
+            "section_order": section["display_order"],
+            "name": drink["name"],
+            "description": drink["description"],
+            "ingredients": json.dumps(drink["ingredients"], ensure_ascii=False),
+            "recipe": json.dumps(drink["recipe"], ensure_ascii=False) if drink["recipe"] else "",
+            "image_url": drink["image_url"],
+            "is_active": str(drink["is_active"]).lower(),
+        }
+        for section in document["menu"]["sections"]
+        for drink in section["drinks"]
+    ]
+
+
+@logger.inject_lambda_context
+@tracer.capture_lambda_handler
+def handler(event: dict, context: LambdaContext) -> dict:
+    """GET /admin/menu/export handler."""
+    headers = event.get("headers") or {}
+    origin = headers.get("origin") or headers.get("Origin") or "*"
+
+    try:
+        params = event.get("queryStringParameters") or {}
+        output_format = params.get("format", "json").lower()
+        if output_format not in ("json", "csv"):
+            return response(400, {"error": "format must be json or csv"}, origin)
+
+        sections, drinks = get_menu_from_db()
+        document = build_menu_document(sections, drinks)
+
+        logger.info(
+            "Exported menu",
+            extra={"sections": len(sections), "drinks": len(drinks), "format": output_format},
+        )
+
+        if output_format == "csv":
+            filename = f"menu-{datetime.utcnow():%Y%m%d-%H%M%S}.csv"
+            return csv_response(200, flatten_menu(document), filename, origin)
+
+        return response(200, {"data": document}, origin)
+
+    except Exception:
+        logger.exception("Failed to export menu")
+        return response(500, {"error": "Internal server error"}, origin)
@@ -2,6 +2,7 @@
 
 import json
 import os
+import sys
 from contextlib import contextmanager
 
 import boto3
@@ -11,9 +12,17 @@ from psycopg2.extras import RealDictCursor
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+sys.path.insert(0, "/opt/python")
+from shared.response_utils import compact_json, parse_fields, project
+
 tracer = Tracer()
 logger = Logger()
 
+DRINK_FIELDS = (
+    "id", "section_id", "section_name", "name", "description", "ingredients",
+    "recipe", "image_url", "is_active", "created_at", "updated_at",
+)
+
 _db_config = None
 
 
@@ -76,7 +85,7 @@ def response(status_code: int, body: dict, origin: str = "*") -> dict:
             "Access-Control-Allow-Headers": "Content-Type,Authorization,X-Api-Key",
             "Access-Control-Allow-Methods": "GET,OPTIONS",
         },
-        "body": json.dumps(body),
+        "body": compact_json(body),
     }
 
 
@@ -129,10 +138,15 @@ def handler(event: dict, context: LambdaContext) -> dict:
         section_id = params.get("section_id")
         include_inactive = params.get("include_inactive", "true").lower() == "true"
 
+        try:
+            fields = parse_fields(params, DRINK_FIELDS)
+        except ValueError as e:
+            return response(400, {"error": str(e)}, origin)
+
         rows = get_all_drinks_from_db(section_id, include_inactive)
 
         drinks = [
-            {
+            project({
                 "id": row["id"],
                 "section_id": row["section_id"],
                 "section_name": row["section_name"],
@@ -148,7 +162,7 @@ def handler(event: dict, context: LambdaContext) -> dict:
                 "updated_at": (
                     row["updated_at"].isoformat() + "Z" if row["updated_at"] else None
                 ),
-            }
+            }, fields)
             for row in rows
         ]
 
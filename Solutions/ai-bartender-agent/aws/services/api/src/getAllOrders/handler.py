@@ -1,7 +1,7 @@
 """GET /admin/orders - Get all orders for admin queue."""
 
-import json
 import os
+import sys
 from contextlib import contextmanager
 
 import boto3
@@ -11,9 +11,17 @@ from psycopg2.extras import RealDictCursor
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+sys.path.insert(0, "/opt/python")
+from shared.response_utils import compact_json, parse_fields, project
+
 tracer = Tracer()
 logger = Logger()
 
+ORDER_FIELDS = (
+    "id", "drink", "drink.id", "drink.name", "drink.image_url", "user_session_id",
+    "user_key", "username", "status", "claimed_by", "created_at", "updated_at", "completed_at",
+)
+
 _db_config = None
 
 
@@ -76,7 +84,7 @@ def response(status_code: int, body: dict, origin: str = "*") -> dict:
             "Access-Control-Allow-Headers": "Content-Type,Authorization,X-Api-Key",
             "Access-Control-Allow-Methods": "GET,OPTIONS",
         },
-        "body": json.dumps(body),
+        "body": compact_json(body),
     }
 
 
@@ -126,7 +134,7 @@ def get_orders_from_db(pending_limit: int = 25):
             cur.execute(
                 """
                 SELECT o.id, o.drink_id, o.user_session_id, o.user_key, o.status,
-                       o.created_at, o.updated_at, o.completed_at,
+                       o.created_at, o.updated_at, o.completed_at, o.claimed_by,
                        d.name as drink_name, d.image_url as drink_image_url,
                        u.username
                 FROM cocktails.orders o
@@ -142,7 +150,7 @@ def get_orders_from_db(pending_limit: int = 25):
             cur.execute(
                 """
                 SELECT o.id, o.drink_id, o.user_session_id, o.user_key, o.status,
-                       o.created_at, o.updated_at, o.completed_at,
+                       o.created_at, o.updated_at, o.completed_at, o.claimed_by,
                        d.name as drink_name, d.image_url as drink_image_url,
                        u.username
                 FROM cocktails.orders o
@@ -174,10 +182,15 @@ def handler(event: dict, context: LambdaContext) -> dict:
         except ValueError:
             pending_limit = 25
 
+        try:
+            fields = parse_fields(params, ORDER_FIELDS)
+        except ValueError as e:
+            return response(400, {"error": str(e)})
+
         rows, counts, pending_returned = get_orders_from_db(pending_limit)
 
         orders = [
-            {
+            project({
                 "id": row["id"],
                 "drink": {
                     "id": row["drink_id"],
@@ -188,6 +201,7 @@ def handler(event: dict, context: LambdaContext) -> dict:
                 "user_key": str(row["user_key"]) if row["user_key"] else None,
                 "username": row["username"],
                 "status": row["status"],
+                "claimed_by": row["claimed_by"],
                 "created_at": (
                     row["created_at"].isoformat() + "Z" if row["created_at"] else None
                 ),
@@ -199,7 +213,7 @@ def handler(event: dict, context: LambdaContext) -> dict:
                     if row["completed_at"]
                     else None
                 ),
-            }
+            }, fields)
             for row in rows
         ]
 
@@ -96,7 +96,7 @@ def get_drink_from_db(drink_id: str):
             cur.execute(
                 """
                 SELECT id, section_id, name, description,
-                       ingredients, recipe, image_url, is_active, created_at
+                       ingredients, recipe, image_url, image_placeholder, is_active, created_at
                 FROM cocktails.drinks
                 WHERE id = %s
             """,
@@ -127,6 +127,7 @@ def handler(event: dict, context: LambdaContext) -> dict:
             "ingredients": parse_ingredients(row["ingredients"]),
             "recipe": json.loads(row["recipe"]) if row["recipe"] else None,
             "image_url": row["image_url"] or "",
+            "image_placeholder": row["image_placeholder"],
             "is_active": row["is_active"],
             "created_at": (
                 row["created_at"].isoformat() + "Z" if row["created_at"] else None
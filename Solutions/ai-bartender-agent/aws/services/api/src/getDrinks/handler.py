@@ -102,7 +102,7 @@ def get_drinks_from_db(section_id: str = None) -> list:
                 cur.execute(
                     """
                     SELECT id, section_id, name, description,
-                           ingredients, image_url, is_active, created_at
+                           ingredients, image_url, image_placeholder, is_active, created_at
                     FROM cocktails.drinks
                     WHERE section_id = %s AND is_active = true
                     ORDER BY name
@@ -113,7 +113,7 @@ def get_drinks_from_db(section_id: str = None) -> list:
                 cur.execute(
                     """
                     SELECT id, section_id, name, description,
-                           ingredients, image_url, is_active, created_at
+                           ingredients, image_url, image_placeholder, is_active, created_at
                     FROM cocktails.drinks
                     WHERE is_active = true
                     ORDER BY name
@@ -139,6 +139,7 @@ def handler(event: dict, context: LambdaContext) -> dict:
                 "description": row["description"] or "",
                 "ingredients": parse_ingredients(row["ingredients"]),
                 "image_url": row["image_url"] or "",
+                "image_placeholder": row["image_placeholder"],
             }
             for row in rows
         ]
@@ -1,8 +1,12 @@
 """GET /admin/registration-codes - List registration codes."""
 
+import base64
+import binascii
 import json
 import os
+import uuid
 from contextlib import contextmanager
+from datetime import datetime
 
 import boto3
 import psycopg2
@@ -14,6 +18,17 @@ from aws_lambda_powertools.utilities.typing import LambdaContext
 tracer = Tracer()
 logger = Logger()
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# is_used is set by register once use_count reaches max_uses (normalized by schema change 003),
+# so every status maps to plain predicates on is_used/expires_at that the status index can serve
+STATUS_CONDITIONS = {
+    "active": "is_used = false AND expires_at > CURRENT_TIMESTAMP",
+    "used": "is_used = true",
+    "expired": "is_used = false AND expires_at <= CURRENT_TIMESTAMP",
+}
+
 _db_config = None
 
 
@@ -78,12 +93,52 @@ def response(status_code: int, body: dict) -> dict:
     }
 
 
+def encode_cursor(row: dict) -> str:
+    """Encode the (created_at, code) keyset position of the last row on a page."""
+    position = {"created_at": row["created_at"].isoformat(), "code": str(row["code"])}
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str] | None:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        # code is cast to uuid in the query; a malformed one must be a 400, not a database error
+        return datetime.fromisoformat(position["created_at"]), str(uuid.UUID(position["code"]))
+    except (binascii.Error, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+@tracer.capture_method
+def get_status_counts(cur) -> dict:
+    """Count codes per status in one pass."""
+    cur.execute(
+        f"""
+        SELECT
+            COUNT(*) FILTER (WHERE {STATUS_CONDITIONS["active"]}) AS active,
+            COUNT(*) FILTER (WHERE {STATUS_CONDITIONS["used"]}) AS used,
+            COUNT(*) FILTER (WHERE {STATUS_CONDITIONS["expired"]}) AS expired,
+            COUNT(*) AS total
+        FROM cocktails.registration_codes
+        """
+    )
+    return dict(cur.fetchone())
+
+
 @tracer.capture_method
-def get_registration_codes(status: str | None = None) -> list[dict]:
-    """Get registration codes, optionally filtered by status (active/used/expired)."""
+def get_registration_codes(
+    status: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: tuple[datetime, str] | None = None,
+    include_counts: bool = True,
+) -> tuple[list[dict], str | None, dict | None]:
+    """Get one page of registration codes, newest first.
+
+    Pages are keyset-paginated on (created_at, code), so each page is an index range
+    scan no matter how deep the admin pages. Returns (rows, next_cursor, counts).
+    """
     with get_connection() as conn:
         with conn.cursor() as cur:
-            base_query = """
+            query = """
                 SELECT
                     code,
                     created_at,
@@ -101,32 +156,37 @@ def get_registration_codes(status: str | None = None) -> list[dict]:
             conditions = []
             params = []
 
-            if status == "active":
-                # Not fully used and not expired (use_count < max_uses)
-                conditions.append("COALESCE(use_count, CASE WHEN is_used THEN 1 ELSE 0 END) < COALESCE(max_uses, 1)")
-                conditions.append("expires_at > CURRENT_TIMESTAMP")
-            elif status == "used":
-                # Fully used (use_count >= max_uses)
-                conditions.append("COALESCE(use_count, CASE WHEN is_used THEN 1 ELSE 0 END) >= COALESCE(max_uses, 1)")
-            elif status == "expired":
-                # Not fully used but expired
-                conditions.append("COALESCE(use_count, CASE WHEN is_used THEN 1 ELSE 0 END) < COALESCE(max_uses, 1)")
-                conditions.append("expires_at <= CURRENT_TIMESTAMP")
+            if status:
+                conditions.append(STATUS_CONDITIONS[status])
+
+            if after:
+                after_created_at, after_code = after
+                conditions.append("(created_at < %s OR (created_at = %s AND code < %s::uuid))")
+                params.extend([after_created_at, after_created_at, after_code])
 
             if conditions:
-                base_query += " WHERE " + " AND ".join(conditions)
+                query += " WHERE " + " AND ".join(conditions)
 
-            base_query += " ORDER BY created_at DESC LIMIT 100"
+            # Fetch one extra row to know whether another page exists
+            query += " ORDER BY created_at DESC, code DESC LIMIT %s"
+            params.append(limit + 1)
 
-            cur.execute(base_query, params)
+            cur.execute(query, params)
             rows = cur.fetchall()
 
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = encode_cursor(rows[-1])
+
+            counts = get_status_counts(cur) if include_counts else None
+
             logger.info(
                 "Retrieved registration codes",
-                extra={"count": len(rows), "status_filter": status},
+                extra={"count": len(rows), "status_filter": status, "has_more": bool(next_cursor)},
             )
 
-            return rows
+            return rows, next_cursor, counts
 
 
 @logger.inject_lambda_context
@@ -150,7 +210,33 @@ def handler(event: dict, context: LambdaContext) -> dict:
                 },
             )
 
-        rows = get_registration_codes(status=status)
+        try:
+            limit = int(query_params.get("limit", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            limit = DEFAULT_PAGE_SIZE
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        after = None
+        if query_params.get("cursor"):
+            after = decode_cursor(query_params["cursor"])
+            if not after:
+                return response(
+                    400,
+                    {
+                        "success": False,
+                        "error": {"code": "INVALID_CURSOR", "message": "Invalid cursor"},
+                    },
+                )
+
+        # Counts only change the first page's summary; skip them while paging
+        include_counts = query_params.get("include_counts", "true" if not after else "false") == "true"
+
+        rows, next_cursor, counts = get_registration_codes(
+            status=status,
+            limit=limit,
+            after=after,
+            include_counts=include_counts,
+        )
 
         frontend_url = os.environ.get("FRONTEND_URL", "")
 
@@ -179,7 +265,11 @@ def handler(event: dict, context: LambdaContext) -> dict:
             }
             codes.append(code_data)
 
-        return response(200, {"success": True, "data": codes})
+        metadata = {"next_cursor": next_cursor, "has_more": next_cursor is not None}
+        if counts is not None:
+            metadata["counts"] = counts
+
+        return response(200, {"success": True, "data": codes, "metadata": metadata})
 
     except Exception as e:
         logger.exception("Failed to get registration codes")
@@ -0,0 +1,511 @@
+"""POST /admin/menu/import - Import a full menu document with batched upserts."""
+
+import json
+import os
+import sys
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+import boto3
+import psycopg2
+from psycopg2.extras import RealDictCursor, execute_values
+
+from aws_lambda_powertools import Logger, Tracer
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+sys.path.insert(0, "/opt/python")
+from shared.cache_utils import flush_api_cache
+
+tracer = Tracer()
+logger = Logger()
+
+EVENT_BUS_NAME = os.environ.get("DRINK_EVENT_BUS_NAME", "")
+
+# Aurora DSQL caps the rows one transaction may modify; write drinks in chunks well below it
+MAX_ROWS_PER_TRANSACTION = 1000
+MAX_DRINKS_PER_IMPORT = 5000
+
+
+def validate_recipe(recipe_data):
+    """Validate and normalize recipe JSON structure. Returns JSON string or None."""
+    if not recipe_data or recipe_data == "":
+        return None
+
+    try:
+        recipe = json.loads(recipe_data) if isinstance(recipe_data, str) else recipe_data
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in recipe: {e}")
+
+    if not isinstance(recipe, dict):
+        raise ValueError("Recipe must be a JSON object")
+
+    if "ingredients" in recipe:
+        if not isinstance(recipe["ingredients"], list):
+            raise ValueError("Recipe ingredients must be an array")
+        for idx, ing in enumerate(recipe["ingredients"]):
+            if not isinstance(ing, dict):
+                raise ValueError(f"Ingredient {idx} must be an object")
+            missing = {"name", "amount"} - set(ing.keys())
+            if missing:
+                raise ValueError(f"Ingredient {idx} missing: {missing}")
+            if "optional" in ing and not isinstance(ing["optional"], bool):
+                raise ValueError(f"Ingredient {idx} 'optional' must be boolean")
+
+    if "steps" in recipe:
+        if not isinstance(recipe["steps"], list):
+            raise ValueError("Recipe steps must be an array")
+        for idx, step in enumerate(recipe["steps"]):
+            if not isinstance(step, dict):
+                raise ValueError(f"Step {idx} must be an object")
+            missing = {"order", "instruction"} - set(step.keys())
+            if missing:
+                raise ValueError(f"Step {idx} missing: {missing}")
+            if not isinstance(step["order"], int):
+                raise ValueError(f"Step {idx} 'order' must be a number")
+
+    if "preparation_time" in recipe and not isinstance(recipe["preparation_time"], (int, float)):
+        raise ValueError("preparation_time must be a number")
+
+    return json.dumps(recipe)
+
+
+_db_config = None
+
+
+def get_db_config():
+    """Get database configuration from environment."""
+    global _db_config
+    if _db_config is None:
+        _db_config = {
+            "endpoint": os.environ.get("DSQL_CLUSTER_ENDPOINT", ""),
+            "region": os.environ.get("AWS_REGION", "eu-west-1"),
+            "role_arn": os.environ.get("DATABASE_WRITER_ROLE", ""),
+            "user": os.environ.get("DATABASE_USER", "admin"),
+        }
+    return _db_config
+
+
+@tracer.capture_method
+def get_auth_token(endpoint: str, region: str, role_arn: str) -> str:
+    """Generate AWS IAM authentication token for DSQL."""
+    if role_arn:
+        sts = boto3.client("sts", region_name=region)
+        creds = sts.assume_role(RoleArn=role_arn, RoleSessionName="dsql-session")[
+            "Credentials"
+        ]
+        dsql = boto3.client(
+            "dsql",
+            region_name=region,
+            aws_access_key_id=creds["AccessKeyId"],
+            aws_secret_access_key=creds["SecretAccessKey"],
+            aws_session_token=creds["SessionToken"],
+        )
+    else:
+        dsql = boto3.client("dsql", region_name=region)
+    return dsql.generate_db_connect_auth_token(Hostname=endpoint, Region=region)
+
+
+@contextmanager
+def get_connection():
+    """Get database connection with IAM authentication."""
+    config = get_db_config()
+    token = get_auth_token(config["endpoint"], config["region"], config["role_arn"])
+    conn = psycopg2.connect(
+        host=config["endpoint"],
+        port=5432,
+        database="postgres",
+        user=config["user"],
+        password=token,
+        sslmode="require",
+        cursor_factory=RealDictCursor,
+    )
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@tracer.capture_method
+def publish_menu_imported(summary: dict, inserted_ids: list[str]) -> bool:
+    """Publish one aggregated MenuImported event to EventBridge. Fire-and-forget."""
+    if not EVENT_BUS_NAME:
+        logger.warning("DRINK_EVENT_BUS_NAME not configured, skipping event publish")
+        return False
+
+    try:
+        events_client = boto3.client("events")
+
+        event_detail = {
+            "metadata": {
+                "event_type": "MENU_IMPORTED",
+                "version": "1.0",
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "correlation_id": str(uuid.uuid4()),
+            },
+            "data": {
+                **summary,
+                "inserted_drink_ids": inserted_ids,
+            },
+        }
+
+        resp = events_client.put_events(
+            Entries=[
+                {
+                    "Source": "ai-bartender.api",
+                    "DetailType": "MenuImported",
+                    "Detail": json.dumps(event_detail),
+                    "EventBusName": EVENT_BUS_NAME,
+                }
+            ]
+        )
+
+        if resp.get("FailedEntryCount", 0) > 0:
+            logger.error("Failed to publish MenuImported event", extra={"failed_entries": resp.get("Entries")})
+            return False
+
+        logger.info("Published MenuImported event", extra=summary)
+        return True
+
+    except Exception:
+        logger.exception("Error publishing MenuImported event")
+        return False
+
+
+def response(status_code: int, body: dict, origin: str = "*") -> dict:
+    return {
+        "statusCode": status_code,
+        "headers": {
+            "Content-Type": "application/json",
+            "Access-Control-Allow-Origin": origin,
+            "Access-Control-Allow-Headers": "Content-Type,Authorization,X-Api-Key",
+            "Access-Control-Allow-Methods": "POST,OPTIONS",
+        },
+        "body": json.dumps(body),
+    }
+
+
+def normalize_drink(drink: dict) -> dict:
+    """Normalize a drink from an export document or the seed drinks.json format.
+
+    Seed-format drinks list ingredients as {"item", "amount_cl"} objects plus a
+    "method" string; they are converted the same way seed_data.py does.
+    """
+    name = drink.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("Every drink needs a name")
+    name = name.strip()
+
+    ingredients = drink.get("ingredients", [])
+    if not isinstance(ingredients, list):
+        raise ValueError(f"{name}: ingredients must be a list")
+
+    recipe = drink.get("recipe")
+    if ingredients and all(isinstance(i, dict) and "item" in i for i in ingredients):
+        recipe = recipe or {
+            "ingredients": [
+                {
+                    "name": i["item"],
+                    "amount": (
+                        f"{i['amount_cl']} cl"
+                        if isinstance(i.get("amount_cl"), (int, float))
+                        else str(i.get("amount_cl", ""))
+                    ),
+                }
+                for i in ingredients
+            ],
+            "steps": [{"order": 1, "instruction": drink.get("method", "")}],
+        }
+        ingredients = [i["item"] for i in ingredients]
+    elif not all(isinstance(i, str) for i in ingredients):
+        raise ValueError(f"{name}: ingredients must be strings or {{item, amount_cl}} objects")
+
+    try:
+        validated_recipe = validate_recipe(recipe)
+    except ValueError as e:
+        raise ValueError(f"{name}: invalid recipe: {e}")
+
+    return {
+        "name": name,
+        "description": drink.get("description") or "",
+        "ingredients": json.dumps(ingredients),
+        "recipe": validated_recipe,
+        "image_url": drink.get("image_url") or "",
+        "is_active": bool(drink.get("is_active", True)),
+    }
+
+
+def parse_menu(body: dict) -> list[dict]:
+    """Validate a menu document and return its sections with normalized drinks."""
+    # Accepts the export response as is ({"data": {"menu": ...}}), the document, or bare sections
+    document = body.get("data", body) if isinstance(body.get("data"), dict) else body
+    menu = document.get("menu", document)
+    sections = menu.get("sections") if isinstance(menu, dict) else None
+    if not isinstance(sections, list) or not sections:
+        raise ValueError("menu.sections must be a non-empty list")
+
+    parsed = []
+    seen_drinks = set()
+    for section in sections:
+        name = section.get("name") if isinstance(section, dict) else None
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("Every section needs a name")
+        drinks = section.get("drinks", [])
+        if not isinstance(drinks, list):
+            raise ValueError(f"{name}: drinks must be a list")
+
+        normalized = []
+        for index, drink in enumerate(drinks):
+            if not isinstance(drink, dict):
+                raise ValueError(f"{name}: drink {index} must be an object")
+            normalized.append(normalize_drink(drink))
+        for drink in normalized:
+            if drink["name"] in seen_drinks:
+                raise ValueError(f"Drink name appears more than once: {drink['name']}")
+            seen_drinks.add(drink["name"])
+        parsed.append({"name": name.strip(), "drinks": normalized})
+
+    if len(seen_drinks) > MAX_DRINKS_PER_IMPORT:
+        raise ValueError(f"A menu may contain at most {MAX_DRINKS_PER_IMPORT} drinks")
+    return parsed
+
+
+def drink_changed(existing: dict, drink: dict, section_id: str) -> bool:
+    def normalized_json(value):
+        try:
+            return json.dumps(json.loads(value), sort_keys=True) if value else None
+        except json.JSONDecodeError:
+            return value
+
+    return (
+        str(existing["section_id"]) != section_id
+        or (existing["description"] or "") != drink["description"]
+        or normalized_json(existing["ingredients"]) != normalized_json(drink["ingredients"])
+        or normalized_json(existing["recipe"]) != normalized_json(drink["recipe"])
+        or (existing["image_url"] or "") != drink["image_url"]
+        or existing["is_active"] != drink["is_active"]
+    )
+
+
+class ImportInterrupted(Exception):
+    """A write failed after earlier transactions had committed; carries what was committed."""
+
+    def __init__(self, committed: dict, inserted_ids: list[str]):
+        super().__init__("Menu import interrupted")
+        self.committed = committed
+        self.inserted_ids = inserted_ids
+
+
+def chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+@tracer.capture_method
+def import_menu_in_db(sections: list[dict], deactivate_missing: bool, dry_run: bool):
+    """Upsert sections and drinks keyed by name. Returns (summary, inserted_drink_ids).
+
+    Existing rows are read once, drinks are classified in memory, and writes go out
+    as multi-row INSERTs and UPDATE ... FROM (VALUES ...) statements, one transaction
+    per chunk of MAX_ROWS_PER_TRANSACTION rows. The import is therefore not atomic: if
+    a chunk fails, ImportInterrupted reports the counts already committed. Running the
+    same import again completes it, since rows are matched by name.
+    """
+    now = datetime.utcnow()
+
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT id, name, display_order FROM cocktails.sections")
+            existing_sections = {row["name"]: row for row in cur.fetchall()}
+
+            cur.execute(
+                """
+                SELECT id, section_id, name, description, ingredients, recipe, image_url, is_active
+                FROM cocktails.drinks
+                """
+            )
+            existing_drinks = {row["name"]: row for row in cur.fetchall()}
+
+        next_order = max((s["display_order"] for s in existing_sections.values()), default=0) + 1
+        new_sections = []
+        section_ids = {}
+        for section in sections:
+            if section["name"] in existing_sections:
+                section_ids[section["name"]] = str(existing_sections[section["name"]]["id"])
+            else:
+                section_id = str(uuid.uuid4())
+                section_ids[section["name"]] = section_id
+                new_sections.append((section_id, section["name"], next_order, now, now))
+                next_order += 1
+
+        inserts, updates, unchanged = [], [], 0
+        for section in sections:
+            section_id = section_ids[section["name"]]
+            for drink in section["drinks"]:
+                existing = existing_drinks.get(drink["name"])
+                values = (
+                    section_id, drink["name"], drink["description"], drink["ingredients"],
+                    drink["recipe"], drink["image_url"], drink["is_active"], now,
+                )
+                if existing is None:
+                    inserts.append((str(uuid.uuid4()), *values, now))
+                elif drink_changed(existing, drink, section_id):
+                    updates.append((str(existing["id"]), *values))
+                else:
+                    unchanged += 1
+
+        imported_names = {d["name"] for s in sections for d in s["drinks"]}
+        deactivations = []
+        if deactivate_missing:
+            deactivations = [
+                (str(row["id"]), now)
+                for name, row in existing_drinks.items()
+                if name not in imported_names and row["is_active"]
+            ]
+
+        summary = {
+            "sections_inserted": len(new_sections),
+            "drinks_inserted": len(inserts),
+            "drinks_updated": len(updates),
+            "drinks_unchanged": unchanged,
+            "drinks_deactivated": len(deactivations),
+            "dry_run": dry_run,
+        }
+        if dry_run:
+            return summary, []
+
+        written = ("sections_inserted", "drinks_inserted", "drinks_updated", "drinks_deactivated")
+        committed = {**dict.fromkeys(written, 0), "drinks_unchanged": unchanged, "dry_run": False}
+        inserted_ids = []
+        try:
+            with conn.cursor() as cur:
+                if new_sections:
+                    execute_values(
+                        cur,
+                        """
+                        INSERT INTO cocktails.sections (id, name, display_order, created_at, updated_at)
+                        VALUES %s
+                        """,
+                        new_sections,
+                    )
+                    conn.commit()
+                    committed["sections_inserted"] = len(new_sections)
+
+                for chunk in chunks(inserts, MAX_ROWS_PER_TRANSACTION):
+                    execute_values(
+                        cur,
+                        """
+                        INSERT INTO cocktails.drinks
+                        (id, section_id, name, description, ingredients, recipe, image_url, is_active, updated_at, created_at)
+                        VALUES %s
+                        """,
+                        chunk,
+                        page_size=MAX_ROWS_PER_TRANSACTION,
+                    )
+                    conn.commit()
+                    committed["drinks_inserted"] += len(chunk)
+                    inserted_ids.extend(row[0] for row in chunk)
+
+                for chunk in chunks(updates, MAX_ROWS_PER_TRANSACTION):
+                    execute_values(
+                        cur,
+                        """
+                        UPDATE cocktails.drinks AS d
+                        SET section_id = v.section_id,
+                            description = v.description,
+                            ingredients = v.ingredients,
+                            recipe = v.recipe,
+                            image_url = v.image_url,
+                            is_active = v.is_active,
+                            updated_at = v.updated_at
+                        FROM (VALUES %s) AS v (id, section_id, name, description, ingredients, recipe, image_url, is_active, updated_at)
+                        WHERE d.id = v.id
+                        """,
+                        chunk,
+                        template="(%s::uuid, %s::uuid, %s, %s, %s, %s, %s, %s::boolean, %s::timestamp)",
+                        page_size=MAX_ROWS_PER_TRANSACTION,
+                    )
+                    conn.commit()
+                    committed["drinks_updated"] += len(chunk)
+
+                for chunk in chunks(deactivations, MAX_ROWS_PER_TRANSACTION):
+                    execute_values(
+                        cur,
+                        """
+                        UPDATE cocktails.drinks AS d
+                        SET is_active = false, updated_at = v.updated_at
+                        FROM (VALUES %s) AS v (id, updated_at)
+                        WHERE d.id = v.id
+                        """,
+                        chunk,
+                        template="(%s::uuid, %s::timestamp)",
+                        page_size=MAX_ROWS_PER_TRANSACTION,
+                    )
+                    conn.commit()
+                    committed["drinks_deactivated"] += len(chunk)
+        except psycopg2.Error as e:
+            conn.rollback()
+            if not any(committed[key] for key in written):
+                raise
+            raise ImportInterrupted(committed, inserted_ids) from e
+
+    return summary, [row[0] for row in inserts]
+
+
+@logger.inject_lambda_context
+@tracer.capture_lambda_handler
+def handler(event: dict, context: LambdaContext) -> dict:
+    """POST /admin/menu/import handler."""
+    headers = event.get("headers") or {}
+    origin = headers.get("origin") or headers.get("Origin") or "*"
+
+    try:
+        raw_body = event.get("body") or "{}"
+        body = json.loads(raw_body) if isinstance(raw_body, str) else raw_body
+
+        # Handle double-encoded JSON
+        if isinstance(body, str):
+            body = json.loads(body)
+
+        if not isinstance(body, dict):
+            return response(400, {"error": "Invalid request body format"}, origin)
+
+        params = event.get("queryStringParameters") or {}
+        dry_run = params.get("dry_run", "false").lower() == "true"
+        deactivate_missing = params.get("deactivate_missing", "false").lower() == "true"
+
+        try:
+            sections = parse_menu(body)
+        except ValueError as e:
+            return response(400, {"error": str(e)}, origin)
+
+        try:
+            summary, inserted_ids = import_menu_in_db(sections, deactivate_missing, dry_run)
+        except ImportInterrupted as e:
+            logger.exception("Menu import interrupted after partial commit", extra=e.committed)
+            # What was committed is live: flush and announce it like a completed import
+            flush_api_cache()
+            publish_menu_imported({**e.committed, "complete": False}, e.inserted_ids)
+            return response(
+                500,
+                {
+                    "error": "Menu import interrupted; run the same import again to complete it",
+                    "data": {**e.committed, "complete": False},
+                },
+                origin,
+            )
+
+        logger.info("Imported menu", extra=summary)
+
+        if not dry_run:
+            # One cache flush and one change event for the whole import
+            flush_api_cache()
+            publish_menu_imported({**summary, "complete": True}, inserted_ids)
+
+        return response(200, {"data": summary}, origin)
+
+    except json.JSONDecodeError:
+        return response(400, {"error": "Invalid JSON body"}, origin)
+    except Exception:
+        logger.exception("Failed to import menu")
+        return response(500, {"error": "Internal server error"}, origin)
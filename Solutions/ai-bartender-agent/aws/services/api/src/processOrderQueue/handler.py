@@ -0,0 +1,351 @@
+"""SQS consumer - Insert queued orders into DSQL in multi-row transactions."""
+
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import boto3
+import psycopg2
+from psycopg2.extras import RealDictCursor, execute_values
+
+from aws_lambda_powertools import Logger, Tracer
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+sys.path.insert(0, "/opt/python")
+from shared.event_publisher import (
+    CHANNEL_USER,
+    EVENT_ORDER_STATUS_CHANGED,
+    publish_event,
+    publish_order_created,
+)
+
+tracer = Tracer()
+logger = Logger()
+
+IDEMPOTENCY_TTL_HOURS = int(os.environ.get("IDEMPOTENCY_TTL_HOURS", "24"))
+
+REJECTION_MESSAGES = {
+    "drink_not_found": "Drink not found or inactive",
+    "active_order_exists": "You already have an active order",
+    "idempotency_key_reused": "Idempotency-Key was already used for a different drink",
+}
+
+_db_config = None
+
+
+def get_db_config():
+    global _db_config
+    if _db_config is None:
+        _db_config = {
+            "endpoint": os.environ.get("DSQL_CLUSTER_ENDPOINT", ""),
+            "region": os.environ.get("AWS_REGION", "eu-west-1"),
+            "role_arn": os.environ.get("DATABASE_WRITER_ROLE", ""),
+            "user": os.environ.get("DATABASE_USER", "admin"),
+        }
+    return _db_config
+
+
+@tracer.capture_method
+def get_auth_token(endpoint: str, region: str, role_arn: str) -> str:
+    if role_arn:
+        sts = boto3.client("sts", region_name=region)
+        creds = sts.assume_role(RoleArn=role_arn, RoleSessionName="dsql-session")[
+            "Credentials"
+        ]
+        dsql = boto3.client(
+            "dsql",
+            region_name=region,
+            aws_access_key_id=creds["AccessKeyId"],
+            aws_secret_access_key=creds["SecretAccessKey"],
+            aws_session_token=creds["SessionToken"],
+        )
+    else:
+        dsql = boto3.client("dsql", region_name=region)
+    return dsql.generate_db_connect_auth_token(Hostname=endpoint, Region=region)
+
+
+@contextmanager
+def get_connection():
+    config = get_db_config()
+    token = get_auth_token(config["endpoint"], config["region"], config["role_arn"])
+    conn = psycopg2.connect(
+        host=config["endpoint"],
+        port=5432,
+        database="postgres",
+        user=config["user"],
+        password=token,
+        sslmode="require",
+        cursor_factory=RealDictCursor,
+    )
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def parse_records(records: list[dict]) -> tuple[list[dict], list[str]]:
+    """Parse SQS records into queued orders. Returns (orders, malformed_message_ids)."""
+    orders = []
+    malformed = []
+    for record in records:
+        try:
+            message = json.loads(record["body"])
+            orders.append({
+                "message_id": record["messageId"],
+                "order_id": message["order_id"],
+                "drink_id": message["drink_id"],
+                "user_key": message["user_key"],
+                "idempotency_key": message.get("idempotency_key"),
+                "requested_at": datetime.fromisoformat(message["requested_at"].rstrip("Z")),
+            })
+        except (KeyError, TypeError, ValueError):
+            logger.error("Malformed order message", extra={"message_id": record.get("messageId")})
+            malformed.append(record.get("messageId"))
+    # Oldest request wins when one user has several orders in the same batch
+    orders.sort(key=lambda o: o["requested_at"])
+    return orders, malformed
+
+
+def format_order(order: dict, drink: dict) -> dict:
+    return {
+        "id": order["order_id"],
+        "drink": {
+            "id": order["drink_id"],
+            "name": drink["name"],
+            "image_url": drink["image_url"],
+        },
+        "user_session_id": order["user_key"],
+        "user_key": order["user_key"],
+        "status": "pending",
+        "created_at": order["requested_at"].isoformat() + "Z",
+    }
+
+
+def format_existing_order(row: dict) -> dict:
+    """API representation of an order that was already committed by an earlier message."""
+    return {
+        "id": str(row["id"]),
+        "drink": {
+            "id": str(row["drink_id"]),
+            "name": row["drink_name"],
+            "image_url": row["drink_image_url"],
+        },
+        "user_session_id": str(row["user_key"]),
+        "user_key": str(row["user_key"]),
+        "status": row["status"],
+        "created_at": row["created_at"].isoformat() + "Z" if row["created_at"] else None,
+    }
+
+
+@tracer.capture_method
+def insert_orders(conn, orders: list[dict]) -> tuple[list[dict], list[tuple[dict, str]], list[dict]]:
+    """Validate and insert a batch of queued orders in a single transaction.
+
+    Returns (created_orders, rejected, duplicates). rejected holds (order, reason) pairs.
+    duplicates are orders an earlier message already committed (SQS redelivery or an
+    idempotent retry); they are published again in case the earlier attempt crashed
+    before its events went out. Idempotency keys expire after IDEMPOTENCY_TTL_HOURS, as
+    in direct mode: a live key used for another drink is rejected, an expired one is free.
+    """
+    now = datetime.utcnow()
+    drink_ids = list({o["drink_id"] for o in orders})
+    user_keys = list({o["user_key"] for o in orders})
+    keyed = {(o["user_key"], o["idempotency_key"]) for o in orders if o["idempotency_key"]}
+
+    with conn.cursor() as cur:
+        records = {}
+        if keyed:
+            cur.execute(
+                """
+                SELECT user_key, idempotency_key, order_id, drink_id, expires_at
+                FROM cocktails.order_idempotency_keys
+                WHERE user_key = ANY(%s::uuid[]) AND idempotency_key = ANY(%s)
+                """,
+                [list({u for u, _ in keyed}), list({k for _, k in keyed})],
+            )
+            for row in cur.fetchall():
+                pair = (str(row["user_key"]), row["idempotency_key"])
+                if pair not in keyed:
+                    continue
+                if row["expires_at"] <= now:
+                    # Expired: the key may be used again, so the old record makes way
+                    cur.execute(
+                        """
+                        DELETE FROM cocktails.order_idempotency_keys
+                        WHERE user_key = %s AND idempotency_key = %s
+                        """,
+                        list(pair),
+                    )
+                    continue
+                records[pair] = {"order_id": str(row["order_id"]), "drink_id": str(row["drink_id"])}
+
+        order_ids = list({o["order_id"] for o in orders} | {r["order_id"] for r in records.values()})
+        cur.execute(
+            """
+            SELECT o.id, o.drink_id, o.user_key, o.status, o.created_at,
+                   d.name AS drink_name, d.image_url AS drink_image_url
+            FROM cocktails.orders o
+            LEFT JOIN cocktails.drinks d ON d.id = o.drink_id
+            WHERE o.id = ANY(%s::uuid[])
+            """,
+            [order_ids],
+        )
+        existing = {str(row["id"]): row for row in cur.fetchall()}
+
+        cur.execute(
+            """
+            SELECT id, name, image_url FROM cocktails.drinks
+            WHERE id = ANY(%s::uuid[]) AND is_active = true
+            """,
+            [drink_ids],
+        )
+        drinks = {str(row["id"]): row for row in cur.fetchall()}
+
+        cur.execute(
+            """
+            SELECT DISTINCT user_key FROM cocktails.orders
+            WHERE user_key = ANY(%s::uuid[]) AND status IN ('pending', 'in_progress')
+            """,
+            [user_keys],
+        )
+        users_with_active_order = {str(row["user_key"]) for row in cur.fetchall()}
+
+        created = []
+        rejected = []
+        duplicate_ids = []
+        for order in orders:
+            record = records.get((order["user_key"], order["idempotency_key"]))
+            if record and record["drink_id"] != order["drink_id"]:
+                rejected.append(({**order, "existing_order_id": record["order_id"]}, "idempotency_key_reused"))
+                continue
+            # A retry whose id differs (the TTL window turned over in between) resolves to the recorded order
+            order_id = record["order_id"] if record else order["order_id"]
+            if order_id in existing or any(o["id"] == order_id for o in created):
+                duplicate_ids.append(order_id)
+                continue
+            drink = drinks.get(order["drink_id"])
+            if not drink:
+                rejected.append((order, "drink_not_found"))
+                continue
+            if order["user_key"] in users_with_active_order:
+                rejected.append((order, "active_order_exists"))
+                continue
+            users_with_active_order.add(order["user_key"])
+            if order["idempotency_key"]:
+                records[(order["user_key"], order["idempotency_key"])] = {
+                    "order_id": order["order_id"], "drink_id": order["drink_id"],
+                }
+            created.append(format_order(order, drink))
+
+        if created:
+            # The first message with an id is the one inserted; later ones were retries or rejected
+            queued = {o["order_id"]: o for o in reversed(orders)}
+            # user_session_id uses user_key as placeholder (NOT NULL constraint in DSQL)
+            execute_values(
+                cur,
+                """
+                INSERT INTO cocktails.orders (id, drink_id, user_key, user_session_id, status, created_at, updated_at)
+                VALUES %s
+                """,
+                [
+                    (o["id"], o["drink"]["id"], o["user_key"], o["user_key"], "pending",
+                     queued[o["id"]]["requested_at"], now)
+                    for o in created
+                ],
+            )
+
+            idempotency_rows = [
+                (o["user_key"], queued[o["id"]]["idempotency_key"], o["id"], o["drink"]["id"], 201,
+                 json.dumps(o), now, now + timedelta(hours=IDEMPOTENCY_TTL_HOURS))
+                for o in created
+                if queued[o["id"]]["idempotency_key"]
+            ]
+            if idempotency_rows:
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO cocktails.order_idempotency_keys
+                    (user_key, idempotency_key, order_id, drink_id, status_code, response_body, created_at, expires_at)
+                    VALUES %s
+                    """,
+                    idempotency_rows,
+                )
+
+        conn.commit()
+
+    duplicates = [
+        format_existing_order(existing[order_id])
+        for order_id in dict.fromkeys(duplicate_ids)
+        if order_id in existing
+    ]
+    return created, rejected, duplicates
+
+
+def publish_results(created: list[dict], rejected: list[tuple[dict, str]], duplicates: list[dict]) -> None:
+    """Tell users the final state of their queued orders over the AppSync user channel."""
+    for order in created + duplicates:
+        try:
+            publish_order_created(order, order["user_key"])
+        except Exception:
+            logger.warning("Failed to publish order created event", extra={"order_id": order["id"]})
+
+    for order, reason in rejected:
+        payload = {
+            "id": order["order_id"],
+            "drink": {"id": order["drink_id"]},
+            "user_key": order["user_key"],
+            "status": "cancelled",
+            "previous_status": "queued",
+            "reason": {"code": reason.upper(), "message": REJECTION_MESSAGES[reason]},
+        }
+        if "existing_order_id" in order:
+            # The order the key was first used for; it is unchanged
+            payload["existing_order_id"] = order["existing_order_id"]
+        try:
+            publish_event(
+                CHANNEL_USER.format(user_key=order["user_key"]),
+                EVENT_ORDER_STATUS_CHANGED,
+                payload,
+            )
+        except Exception:
+            logger.warning("Failed to publish order rejected event", extra={"order_id": order["order_id"]})
+
+
+@logger.inject_lambda_context
+@tracer.capture_lambda_handler
+def handler(event: dict, context: LambdaContext) -> dict:
+    """Drain a batch of queued orders, reporting failed messages back to SQS for retry."""
+    orders, malformed = parse_records(event.get("Records", []))
+    # Malformed messages will never succeed; let them go to the DLQ via maxReceiveCount
+    failed_message_ids = list(malformed)
+
+    # One SQS batch (at most 100 messages, see BatchSize) writes at most two rows per
+    # order, well within DSQL's per-transaction row limit, so it is a single transaction
+    if orders:
+        try:
+            with get_connection() as conn:
+                try:
+                    created, rejected, duplicates = insert_orders(conn, orders)
+                except psycopg2.Error:
+                    # Optimistic concurrency conflict or other DB error: retry the batch later
+                    logger.exception("Failed to insert order batch", extra={"size": len(orders)})
+                    conn.rollback()
+                    failed_message_ids.extend(o["message_id"] for o in orders)
+                else:
+                    logger.info(
+                        "Processed queued orders",
+                        extra={
+                            "created": len(created),
+                            "rejected": len(rejected),
+                            "duplicates": len(duplicates),
+                            "batch": len(orders),
+                        },
+                    )
+                    publish_results(created, rejected, duplicates)
+        except Exception:
+            logger.exception("Failed to process order batch")
+            failed_message_ids = [o["message_id"] for o in orders] + malformed
+
+    return {"batchItemFailures": [{"itemIdentifier": mid} for mid in dict.fromkeys(failed_message_ids)]}
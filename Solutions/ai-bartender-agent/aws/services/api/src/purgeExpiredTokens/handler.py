@@ -0,0 +1,197 @@
+"""Scheduled job - Purge expired/revoked refresh tokens and expired idempotency keys in batches."""
+
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import boto3
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+from aws_lambda_powertools import Logger, Metrics, Tracer
+from aws_lambda_powertools.metrics import MetricUnit
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+tracer = Tracer()
+logger = Logger()
+metrics = Metrics()
+
+# Expired and revoked rows are kept this long so clients still get "expired"/"revoked"
+# instead of "not found" right after the fact
+PURGE_RETENTION_HOURS = int(os.environ.get("PURGE_RETENTION_HOURS", "24"))
+# Aurora DSQL caps the rows a single transaction may modify; one batch per transaction
+PURGE_BATCH_SIZE = 1000
+# Don't start another batch with less than this left before the Lambda timeout
+TIME_MARGIN_MS = 15000
+
+# Each target is scanned oldest first via the index on its timestamp column
+PURGE_TARGETS = (
+    {
+        "name": "expired_refresh_tokens",
+        "table": "cocktails.refresh_tokens",
+        "key": ("token_id",),
+        "column": "expires_at",
+        "metric": "ExpiredRefreshTokensPurged",
+    },
+    {
+        "name": "revoked_refresh_tokens",
+        "table": "cocktails.refresh_tokens",
+        "key": ("token_id",),
+        "column": "revoked_at",
+        "metric": "RevokedRefreshTokensPurged",
+    },
+    {
+        "name": "expired_idempotency_keys",
+        "table": "cocktails.order_idempotency_keys",
+        "key": ("user_key", "idempotency_key"),
+        "column": "expires_at",
+        "metric": "IdempotencyKeysPurged",
+    },
+)
+
+# Table sizes reported after each run
+SIZE_METRICS = {
+    "cocktails.refresh_tokens": "RefreshTokensRowCount",
+    "cocktails.order_idempotency_keys": "IdempotencyKeysRowCount",
+}
+
+_db_config = None
+
+
+def get_db_config():
+    global _db_config
+    if _db_config is None:
+        _db_config = {
+            "endpoint": os.environ.get("DSQL_CLUSTER_ENDPOINT", ""),
+            "region": os.environ.get("AWS_REGION", "eu-west-1"),
+            "role_arn": os.environ.get("DATABASE_WRITER_ROLE", ""),
+            "user": os.environ.get("DATABASE_USER", "admin"),
+        }
+    return _db_config
+
+
+@tracer.capture_method
+def get_auth_token(endpoint: str, region: str, role_arn: str) -> str:
+    if role_arn:
+        sts = boto3.client("sts", region_name=region)
+        creds = sts.assume_role(RoleArn=role_arn, RoleSessionName="dsql-session")[
+            "Credentials"
+        ]
+        dsql = boto3.client(
+            "dsql",
+            region_name=region,
+            aws_access_key_id=creds["AccessKeyId"],
+            aws_secret_access_key=creds["SecretAccessKey"],
+            aws_session_token=creds["SessionToken"],
+        )
+    else:
+        dsql = boto3.client("dsql", region_name=region)
+    return dsql.generate_db_connect_auth_token(Hostname=endpoint, Region=region)
+
+
+@contextmanager
+def get_connection():
+    config = get_db_config()
+    token = get_auth_token(config["endpoint"], config["region"], config["role_arn"])
+    conn = psycopg2.connect(
+        host=config["endpoint"],
+        port=5432,
+        database="postgres",
+        user=config["user"],
+        password=token,
+        sslmode="require",
+        cursor_factory=RealDictCursor,
+    )
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def purge_batch(conn, target: dict, cutoff: datetime) -> tuple[int, datetime | None]:
+    """Delete up to PURGE_BATCH_SIZE of the oldest rows before cutoff in one transaction.
+
+    Returns (rows deleted, newest timestamp deleted).
+    """
+    key = ", ".join(target["key"])
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            DELETE FROM {target["table"]}
+            WHERE ({key}) IN (
+                SELECT {key} FROM {target["table"]}
+                WHERE {target["column"]} < %s
+                ORDER BY {target["column"]}
+                LIMIT %s
+            )
+            RETURNING {target["column"]} AS purged_at
+            """,
+            [cutoff, PURGE_BATCH_SIZE],
+        )
+        rows = cur.fetchall()
+    conn.commit()
+    return len(rows), max((row["purged_at"] for row in rows), default=None)
+
+
+@tracer.capture_method
+def purge_target(conn, target: dict, cutoff: datetime, context: LambdaContext) -> dict:
+    """Purge one target batch by batch until done or the time budget runs out.
+
+    Every batch commits on its own, so an interrupted run loses nothing: the next
+    scheduled run continues from the oldest remaining row.
+    """
+    progress = {"deleted": 0, "batches": 0, "checkpoint": None, "complete": False}
+
+    while context.get_remaining_time_in_millis() > TIME_MARGIN_MS:
+        try:
+            deleted, newest = purge_batch(conn, target, cutoff)
+        except psycopg2.Error:
+            # Optimistic concurrency conflict or other DB error; the next run retries
+            logger.exception("Purge batch failed", extra={"target": target["name"]})
+            conn.rollback()
+            break
+
+        progress["deleted"] += deleted
+        progress["batches"] += 1
+        if newest is not None:
+            progress["checkpoint"] = newest.isoformat()
+        logger.info("Purge checkpoint", extra={"target": target["name"], **progress})
+
+        if deleted < PURGE_BATCH_SIZE:
+            progress["complete"] = True
+            break
+
+    metrics.add_metric(name=target["metric"], unit=MetricUnit.Count, value=progress["deleted"])
+    return progress
+
+
+@tracer.capture_method
+def record_table_sizes(conn) -> dict:
+    sizes = {}
+    with conn.cursor() as cur:
+        for table, metric in SIZE_METRICS.items():
+            cur.execute(f"SELECT COUNT(*) AS row_count FROM {table}")
+            sizes[table] = cur.fetchone()["row_count"]
+            metrics.add_metric(name=metric, unit=MetricUnit.Count, value=sizes[table])
+    conn.rollback()
+    return sizes
+
+
+@metrics.log_metrics
+@logger.inject_lambda_context
+@tracer.capture_lambda_handler
+def handler(event: dict, context: LambdaContext) -> dict:
+    """Run every purge target in order, then report table sizes."""
+    cutoff = datetime.utcnow() - timedelta(hours=PURGE_RETENTION_HOURS)
+    results = {}
+
+    with get_connection() as conn:
+        for target in PURGE_TARGETS:
+            results[target["name"]] = purge_target(conn, target, cutoff, context)
+            if not results[target["name"]]["complete"]:
+                logger.warning("Purge stopped before completion, next run continues", extra={"target": target["name"]})
+                break
+        sizes = record_table_sizes(conn)
+
+    logger.info("Purge finished", extra={"results": results, "table_sizes": sizes})
+    return {"cutoff": cutoff.isoformat(), "results": results, "table_sizes": sizes}
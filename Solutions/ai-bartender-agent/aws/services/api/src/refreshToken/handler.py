@@ -3,21 +3,39 @@
 import hashlib
 import json
 import os
+import sys
 import time
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 
 import boto3
+import jwt
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
 
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+sys.path.insert(0, "/opt/python")
+from shared import lifecycle
+
 tracer = Tracer()
 logger = Logger()
 
+JWT_KEYS_CACHE_SECONDS = int(os.environ.get("JWT_KEYS_CACHE_SECONDS", "300"))
+
 _db_config = None
+_clients = {}
+_signing_key = None
+_signing_key_loaded_at = 0.0
+
+
+def get_client(service: str):
+    """boto3 client, created once per container and again after a snapshot restore."""
+    if service not in _clients:
+        _clients[service] = boto3.client(service, region_name=os.environ.get("AWS_REGION", "eu-west-1"))
+    return _clients[service]
 
 
 def get_db_config():
@@ -37,7 +55,7 @@ def get_db_config():
 def get_auth_token(endpoint: str, region: str, role_arn: str) -> str:
     """Generate AWS IAM authentication token for DSQL."""
     if role_arn:
-        sts = boto3.client("sts", region_name=region)
+        sts = get_client("sts")
         creds = sts.assume_role(RoleArn=role_arn, RoleSessionName="dsql-session")[
             "Credentials"
         ]
@@ -49,7 +67,7 @@ def get_auth_token(endpoint: str, region: str, role_arn: str) -> str:
             aws_session_token=creds["SessionToken"],
         )
     else:
-        dsql = boto3.client("dsql", region_name=region)
+        dsql = get_client("dsql")
     return dsql.generate_db_connect_auth_token(Hostname=endpoint, Region=region)
 
 
@@ -85,27 +103,39 @@ def response(status_code: int, body: dict) -> dict:
     }
 
 
-def get_jwt_keys() -> tuple[str, str]:
-    """Get JWT signing keys from Secrets Manager."""
-    secret_name = os.environ.get("JWT_KEYS_SECRET_NAME", "ai-bartender/jwt-keys")
-    region = os.environ.get("AWS_REGION", "eu-west-1")
+def get_signing_key() -> dict:
+    """Get the active JWT signing key from Secrets Manager, cached per container.
+
+    The secret holds "algorithm" (RS256, ES256 or EdDSA) and "kid"; secrets created
+    before key rotation have neither and sign RS256 without a kid. The PEM is parsed
+    once and reused, and the cache expires so a rotated key is picked up.
+    """
+    global _signing_key, _signing_key_loaded_at
+
+    if _signing_key is not None and time.monotonic() - _signing_key_loaded_at < JWT_KEYS_CACHE_SECONDS:
+        return _signing_key
 
-    client = boto3.client("secretsmanager", region_name=region)
+    secret_name = os.environ.get("JWT_KEYS_SECRET_NAME", "ai-bartender/jwt-keys")
+    client = get_client("secretsmanager")
 
     try:
         response_data = client.get_secret_value(SecretId=secret_name)
         secret = json.loads(response_data["SecretString"])
-        return secret["private_key"], secret["public_key"]
+        _signing_key = {
+            "key": load_pem_private_key(secret["private_key"].encode(), password=None),
+            "algorithm": secret.get("algorithm", "RS256"),
+            "kid": secret.get("kid"),
+        }
+        _signing_key_loaded_at = time.monotonic()
+        return _signing_key
     except Exception as e:
         logger.error(f"Failed to retrieve JWT keys: {e}")
         raise
 
 
 def generate_access_token(user_key: str, username: str) -> str:
-    """Generate RS256 signed JWT access token (4 hours validity)."""
-    import jwt
-
-    private_key, _ = get_jwt_keys()
+    """Generate signed JWT access token (4 hours validity) with the active key's kid."""
+    signing_key = get_signing_key()
 
     now = int(time.time())
     payload = {
@@ -116,7 +146,8 @@ def generate_access_token(user_key: str, username: str) -> str:
         "exp": now + (4 * 60 * 60),  # 4 hours
     }
 
-    return jwt.encode(payload, private_key, algorithm="RS256")
+    headers = {"kid": signing_key["kid"]} if signing_key["kid"] else None
+    return jwt.encode(payload, signing_key["key"], algorithm=signing_key["algorithm"], headers=headers)
 
 
 @tracer.capture_method
@@ -192,6 +223,20 @@ def validate_and_refresh_token(refresh_token: str) -> dict | None:
             }
 
 
+@lifecycle.after_restore
+def refresh_after_restore():
+    """Drop clients and the signing key; their sockets and monotonic timestamp predate the snapshot."""
+    global _signing_key
+    _clients.clear()
+    _signing_key = None
+    get_signing_key()
+
+
+lifecycle.run_init("aws_clients", lambda: [get_client(service) for service in ("sts", "secretsmanager")])
+lifecycle.run_init("jwt_signing_key", get_signing_key)
+
+
+@lifecycle.track_invocation
 @tracer.capture_lambda_handler
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     """Handle token refresh. No authorizer - token validation done here."""
@@ -0,0 +1,237 @@
+"""PUT /admin/sections - Reorder and bulk-edit all sections in one statement."""
+
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+import boto3
+import psycopg2
+from psycopg2.extras import RealDictCursor, execute_values
+
+from aws_lambda_powertools import Logger, Tracer
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+import sys
+sys.path.insert(0, "/opt/python")
+from shared.cache_utils import flush_api_cache
+
+tracer = Tracer()
+logger = Logger()
+
+MAX_SECTION_NAME_LENGTH = 100
+
+_db_config = None
+
+
+def get_db_config():
+    global _db_config
+    if _db_config is None:
+        _db_config = {
+            "endpoint": os.environ.get("DSQL_CLUSTER_ENDPOINT", ""),
+            "region": os.environ.get("AWS_REGION", "eu-west-1"),
+            "role_arn": os.environ.get("DATABASE_WRITER_ROLE", ""),
+            "user": os.environ.get("DATABASE_USER", "admin"),
+        }
+    return _db_config
+
+
+@tracer.capture_method
+def get_auth_token(endpoint: str, region: str, role_arn: str) -> str:
+    if role_arn:
+        sts = boto3.client("sts", region_name=region)
+        creds = sts.assume_role(RoleArn=role_arn, RoleSessionName="dsql-session")[
+            "Credentials"
+        ]
+        dsql = boto3.client(
+            "dsql",
+            region_name=region,
+            aws_access_key_id=creds["AccessKeyId"],
+            aws_secret_access_key=creds["SecretAccessKey"],
+            aws_session_token=creds["SessionToken"],
+        )
+    else:
+        dsql = boto3.client("dsql", region_name=region)
+    return dsql.generate_db_connect_auth_token(Hostname=endpoint, Region=region)
+
+
+@contextmanager
+def get_connection():
+    config = get_db_config()
+    token = get_auth_token(config["endpoint"], config["region"], config["role_arn"])
+    conn = psycopg2.connect(
+        host=config["endpoint"],
+        port=5432,
+        database="postgres",
+        user=config["user"],
+        password=token,
+        sslmode="require",
+        cursor_factory=RealDictCursor,
+    )
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def response(status_code: int, body: dict, origin: str = "*") -> dict:
+    return {
+        "statusCode": status_code,
+        "headers": {
+            "Content-Type": "application/json",
+            "Access-Control-Allow-Origin": origin,
+            "Access-Control-Allow-Headers": "Content-Type,Authorization,X-Api-Key",
+            "Access-Control-Allow-Methods": "PUT,OPTIONS",
+        },
+        "body": json.dumps(body),
+    }
+
+
+def parse_body(event: dict) -> tuple[dict | None, str | None]:
+    """Parse request body handling string, dict, and double-encoded JSON."""
+    raw_body = event.get("body")
+
+    if raw_body is None:
+        return {}, None
+
+    if isinstance(raw_body, dict):
+        return raw_body, None
+
+    if not isinstance(raw_body, str):
+        return None, f"Unexpected body type: {type(raw_body)}"
+
+    try:
+        body = json.loads(raw_body)
+        # Handle double-encoded JSON (string containing JSON string)
+        if isinstance(body, str):
+            body = json.loads(body)
+        return body, None
+    except (json.JSONDecodeError, TypeError):
+        return None, "Invalid JSON in request body"
+
+
+def parse_sections(body: dict) -> tuple[list[dict] | None, str | None]:
+    """Normalize the request into an ordered list of {id, name} entries.
+
+    Accepts either {"section_ids": [...]} for a pure reorder or
+    {"sections": [{"id": ..., "name": ...}, ...]} to rename in the same request.
+    """
+    if "sections" in body:
+        entries = body["sections"]
+        if not isinstance(entries, list) or not all(isinstance(e, dict) and e.get("id") for e in entries):
+            return None, "sections must be a list of objects with an id"
+        sections = [{"id": str(e["id"]), "name": e.get("name")} for e in entries]
+    elif "section_ids" in body:
+        ids = body["section_ids"]
+        if not isinstance(ids, list) or not all(isinstance(i, str) and i for i in ids):
+            return None, "section_ids must be a list of section ids"
+        sections = [{"id": i, "name": None} for i in ids]
+    else:
+        return None, "section_ids or sections is required"
+
+    if not sections:
+        return None, "At least one section is required"
+    try:
+        for section in sections:
+            section["id"] = str(uuid.UUID(section["id"]))
+    except ValueError:
+        return None, "Section ids must be valid UUIDs"
+    if len({s["id"] for s in sections}) != len(sections):
+        return None, "Each section may only appear once"
+    for section in sections:
+        name = section["name"]
+        if name is not None and (not isinstance(name, str) or not name.strip() or len(name) > MAX_SECTION_NAME_LENGTH):
+            return None, f"Section names must be 1-{MAX_SECTION_NAME_LENGTH} characters"
+    return sections, None
+
+
+@tracer.capture_method
+def reorder_sections_in_db(sections: list[dict]):
+    """Rewrite display_order (and optional names) for every section in one UPDATE.
+
+    The list must name every section exactly once so display_order stays unique
+    without per-row duplicate checks. Returns (rows, error_code).
+    """
+    now = datetime.utcnow()
+
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM cocktails.sections")
+            existing_ids = {str(row["id"]) for row in cur.fetchall()}
+            if {s["id"] for s in sections} != existing_ids:
+                return None, "incomplete_order"
+
+            rows = execute_values(
+                cur,
+                """
+                UPDATE cocktails.sections AS s
+                SET display_order = v.display_order,
+                    name = COALESCE(v.name, s.name),
+                    updated_at = v.updated_at
+                FROM (VALUES %s) AS v (id, display_order, name, updated_at)
+                WHERE s.id = v.id
+                RETURNING s.id, s.name, s.display_order, s.created_at, s.updated_at
+                """,
+                [
+                    (section["id"], position, section["name"].strip() if section["name"] else None, now)
+                    for position, section in enumerate(sections, start=1)
+                ],
+                template="(%s::uuid, %s::integer, %s::varchar, %s::timestamp)",
+                page_size=len(sections),
+                fetch=True,
+            )
+            conn.commit()
+            return sorted(rows, key=lambda r: r["display_order"]), None
+
+
+@logger.inject_lambda_context
+@tracer.capture_lambda_handler
+def handler(event: dict, context: LambdaContext) -> dict:
+    """Handle PUT /admin/sections request."""
+    headers = event.get("headers") or {}
+    origin = headers.get("origin") or headers.get("Origin") or "*"
+
+    try:
+        body, parse_error = parse_body(event)
+        if parse_error:
+            return response(400, {"error": parse_error}, origin)
+
+        sections, validation_error = parse_sections(body)
+        if validation_error:
+            return response(400, {"error": validation_error}, origin)
+
+        rows, db_error = reorder_sections_in_db(sections)
+
+        if db_error == "incomplete_order":
+            return response(
+                409,
+                {"error": "The list must contain every existing section exactly once"},
+                origin,
+            )
+
+        result = [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "display_order": row["display_order"],
+                "created_at": (
+                    row["created_at"].isoformat() + "Z" if row["created_at"] else None
+                ),
+                "updated_at": (
+                    row["updated_at"].isoformat() + "Z" if row["updated_at"] else None
+                ),
+            }
+            for row in rows
+        ]
+
+        logger.info("Reordered sections", extra={"count": len(result)})
+
+        # One cache invalidation for the whole reorder
+        flush_api_cache()
+
+        return response(200, {"data": result}, origin)
+
+    except Exception:
+        logger.exception("Failed to reorder sections")
+        return response(500, {"error": "Internal server error"}, origin)
@@ -0,0 +1,166 @@
+"""Single-function router - Dispatch every API route to its handler from one warm Lambda.
+
+Only used by the router build (template-router.yaml, generated by build-router.py).
+The per-route handlers are packaged unchanged under routes/<name>/ (handler.py and
+its sibling modules) and loaded on first use. Their get_connection is swapped for a
+shared connection per database role, so routes reuse a warm DSQL session and IAM
+token while read-only routes keep using the reader role.
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import boto3
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extras import RealDictCursor
+
+from aws_lambda_powertools import Logger, Tracer
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+tracer = Tracer()
+logger = Logger()
+
+ROUTES_DIR = os.path.join(os.path.dirname(__file__), "routes")
+ROUTES_FILE = os.path.join(os.path.dirname(__file__), "routes.json")
+# Aurora DSQL closes connections after one hour; reconnect well before that
+CONNECTION_MAX_AGE_SECONDS = int(os.environ.get("CONNECTION_MAX_AGE_SECONDS", "3000"))
+
+# Database role -> (role ARN variable, user variable); routes.json names the role per route
+DATABASE_ROLES = {
+    "reader": ("DATABASE_READER_ROLE", "DATABASE_READER_USER"),
+    "writer": ("DATABASE_WRITER_ROLE", "DATABASE_WRITER_USER"),
+}
+
+_routes = None
+_handlers = {}
+# Per role: {"connection", "opened_at", "depth"}
+_connections = {}
+
+
+def get_routes() -> dict:
+    """Route table: "METHOD /resource" -> {"module": dir name, "handler": function name,
+    "database": "reader", "writer" or null}."""
+    global _routes
+    if _routes is None:
+        with open(ROUTES_FILE) as f:
+            _routes = json.load(f)
+    return _routes
+
+
+@tracer.capture_method
+def get_auth_token(endpoint: str, region: str, role_arn: str) -> str:
+    if role_arn:
+        sts = boto3.client("sts", region_name=region)
+        creds = sts.assume_role(RoleArn=role_arn, RoleSessionName="dsql-session")[
+            "Credentials"
+        ]
+        dsql = boto3.client(
+            "dsql",
+            region_name=region,
+            aws_access_key_id=creds["AccessKeyId"],
+            aws_secret_access_key=creds["SecretAccessKey"],
+            aws_session_token=creds["SessionToken"],
+        )
+    else:
+        dsql = boto3.client("dsql", region_name=region)
+    return dsql.generate_db_connect_auth_token(Hostname=endpoint, Region=region)
+
+
+def open_connection(role: str):
+    role_variable, user_variable = DATABASE_ROLES[role]
+    endpoint = os.environ.get("DSQL_CLUSTER_ENDPOINT", "")
+    region = os.environ.get("AWS_REGION", "eu-west-1")
+    token = get_auth_token(endpoint, region, os.environ.get(role_variable, ""))
+    return psycopg2.connect(
+        host=endpoint,
+        port=5432,
+        database="postgres",
+        user=os.environ.get(user_variable, "admin"),
+        password=token,
+        sslmode="require",
+        cursor_factory=RealDictCursor,
+    )
+
+
+@contextmanager
+def get_shared_connection(role: str):
+    """Drop-in replacement for the handlers' get_connection that keeps the role's connection open.
+
+    Any transaction a handler leaves open (reads without commit, or an error) is
+    rolled back when the outermost block exits, so the next request starts clean.
+    """
+    state = _connections.setdefault(role, {"connection": None, "opened_at": 0.0, "depth": 0})
+
+    if state["depth"] == 0:
+        conn = state["connection"]
+        expired = time.monotonic() - state["opened_at"] > CONNECTION_MAX_AGE_SECONDS
+        if conn is None or conn.closed or expired:
+            if conn is not None and not conn.closed:
+                conn.close()
+            state["connection"] = open_connection(role)
+            state["opened_at"] = time.monotonic()
+            logger.info("Opened shared database connection", extra={"database_role": role})
+
+    conn = state["connection"]
+    state["depth"] += 1
+    try:
+        yield conn
+    finally:
+        state["depth"] -= 1
+        if state["depth"] == 0 and not conn.closed:
+            try:
+                if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                logger.warning("Discarding broken shared connection", extra={"database_role": role})
+                conn.close()
+
+
+def load_handler(module_name: str, function_name: str, database: str | None):
+    """Import a route's handler module once and point it at its role's shared connection.
+
+    The route folder is on sys.path while the module runs, so its sibling imports
+    (from event_publisher import ...) resolve as they do in the route's own function.
+    Siblings are imported afresh per route, since two routes may ship different
+    modules under the same name.
+    """
+    key = (module_name, function_name)
+    if key not in _handlers:
+        route_dir = os.path.join(ROUTES_DIR, module_name)
+        for file_name in os.listdir(route_dir):
+            if file_name.endswith(".py") and file_name != "handler.py":
+                sys.modules.pop(file_name[:-3], None)
+        spec = importlib.util.spec_from_file_location(f"routes.{module_name}", os.path.join(route_dir, "handler.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.path.insert(0, route_dir)
+        try:
+            spec.loader.exec_module(module)
+        finally:
+            sys.path.remove(route_dir)
+        if database and hasattr(module, "get_connection"):
+            module.get_connection = lambda: get_shared_connection(database)
+        _handlers[key] = getattr(module, function_name)
+    return _handlers[key]
+
+
+@tracer.capture_lambda_handler
+def handler(event: dict, context: LambdaContext) -> dict:
+    """Route an API Gateway REST proxy event by httpMethod and resource template."""
+    route_key = f"{event.get('httpMethod')} {event.get('resource')}"
+    route = get_routes().get(route_key)
+
+    if not route:
+        logger.warning("No handler for route", extra={"route": route_key})
+        return {
+            "statusCode": 404,
+            "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+            "body": json.dumps({"error": "Not found"}),
+        }
+
+    tracer.put_annotation(key="route", value=route_key)
+    return load_handler(route["module"], route["handler"], route.get("database"))(event, context)
@@ -0,0 +1,242 @@
+"""GET /drinks/search - Ingredient and text search served from an in-memory inverted index."""
+
+import json
+import os
+import re
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+import boto3
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+from aws_lambda_powertools import Logger, Tracer
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+tracer = Tracer()
+logger = Logger()
+
+# How often a warm container asks the database whether the menu changed
+INDEX_VERSION_CHECK_SECONDS = int(os.environ.get("INDEX_VERSION_CHECK_SECONDS", "30"))
+MAX_QUERY_TERMS = 10
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+_db_config = None
+_index = None
+
+
+def get_db_config():
+    """Get database configuration from environment."""
+    global _db_config
+    if _db_config is None:
+        _db_config = {
+            "endpoint": os.environ.get("DSQL_CLUSTER_ENDPOINT", ""),
+            "region": os.environ.get("AWS_REGION", "eu-west-1"),
+            "role_arn": os.environ.get("DATABASE_READER_ROLE", ""),
+            "user": os.environ.get("DATABASE_USER", "admin"),
+        }
+    return _db_config
+
+
+@tracer.capture_method
+def get_auth_token(endpoint: str, region: str, role_arn: str) -> str:
+    """Generate AWS IAM authentication token for DSQL."""
+    if role_arn:
+        sts = boto3.client("sts", region_name=region)
+        creds = sts.assume_role(RoleArn=role_arn, RoleSessionName="dsql-session")[
+            "Credentials"
+        ]
+        dsql = boto3.client(
+            "dsql",
+            region_name=region,
+            aws_access_key_id=creds["AccessKeyId"],
+            aws_secret_access_key=creds["SecretAccessKey"],
+            aws_session_token=creds["SessionToken"],
+        )
+    else:
+        dsql = boto3.client("dsql", region_name=region)
+    return dsql.generate_db_connect_auth_token(Hostname=endpoint, Region=region)
+
+
+@contextmanager
+def get_connection():
+    """Get database connection with IAM authentication."""
+    config = get_db_config()
+    token = get_auth_token(config["endpoint"], config["region"], config["role_arn"])
+    conn = psycopg2.connect(
+        host=config["endpoint"],
+        port=5432,
+        database="postgres",
+        user=config["user"],
+        password=token,
+        sslmode="require",
+        cursor_factory=RealDictCursor,
+    )
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def response(status_code: int, body: dict, headers: dict = None) -> dict:
+    return {
+        "statusCode": status_code,
+        "headers": {
+            "Content-Type": "application/json",
+            "Access-Control-Allow-Origin": "*",
+            "Cache-Control": "no-store",
+            **(headers or {}),
+        },
+        "body": json.dumps(body),
+    }
+
+
+def parse_ingredients(ingredients):
+    """Parse ingredients from JSON string or return as-is if already a list."""
+    if isinstance(ingredients, str):
+        try:
+            return json.loads(ingredients)
+        except json.JSONDecodeError:
+            return []
+    return ingredients if isinstance(ingredients, list) else []
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+def normalize_ingredient(value: str) -> str:
+    return " ".join(tokenize(value))
+
+
+class DrinkIndex:
+    """Inverted index over active drinks for one menu version.
+
+    Ingredients are matched on whole words or the full ingredient name, so "gin"
+    finds "Gin" but not "Ginger beer". Name and description words are kept in a
+    sorted list so prefix queries are a binary search instead of a scan.
+    """
+
+    def __init__(self, version: tuple, rows: list):
+        self.version = version
+        self.checked_at = 0.0
+        self.drinks = {}
+        self.by_ingredient = {}
+        self.by_token = {}
+
+        for row in rows:
+            drink_id = str(row["id"])
+            ingredients = parse_ingredients(row["ingredients"])
+            self.drinks[drink_id] = {
+                "id": drink_id,
+                "section_id": str(row["section_id"]),
+                "name": row["name"],
+                "description": row["description"] or "",
+                "ingredients": ingredients,
+                "image_url": row["image_url"] or "",
+            }
+
+            for ingredient in ingredients:
+                if not isinstance(ingredient, str):
+                    continue
+                for key in {normalize_ingredient(ingredient), *tokenize(ingredient)}:
+                    self.by_ingredient.setdefault(key, set()).add(drink_id)
+
+            for token in tokenize(row["name"]) + tokenize(row["description"]):
+                self.by_token.setdefault(token, set()).add(drink_id)
+
+        self.sorted_tokens = sorted(self.by_token)
+
+    def match_ingredient(self, ingredient: str) -> set:
+        return self.by_ingredient.get(normalize_ingredient(ingredient), set())
+
+    def match_prefix(self, prefix: str) -> set:
+        matches = set()
+        start = bisect_left(self.sorted_tokens, prefix)
+        for token in self.sorted_tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            matches |= self.by_token[token]
+        return matches
+
+    def search(self, ingredients: list[str], terms: list[str]) -> list[dict]:
+        """Return drinks containing every ingredient and matching every text prefix."""
+        candidates = None
+        for matches in [self.match_ingredient(i) for i in ingredients] + [self.match_prefix(t) for t in terms]:
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+
+        return sorted((self.drinks[d] for d in candidates), key=lambda d: d["name"])
+
+
+@tracer.capture_method
+def get_menu_version(cur) -> tuple:
+    """Cheap change marker: any insert, update or delete of a drink moves it."""
+    cur.execute(
+        """
+        SELECT COUNT(*) AS drink_count, MAX(updated_at) AS last_updated
+        FROM cocktails.drinks
+        """
+    )
+    row = cur.fetchone()
+    return row["drink_count"], row["last_updated"].isoformat() if row["last_updated"] else None
+
+
+@tracer.capture_method
+def get_index() -> DrinkIndex:
+    """Return the container's index, rebuilding it only when the menu version changed."""
+    global _index
+
+    if _index is not None and time.monotonic() - _index.checked_at < INDEX_VERSION_CHECK_SECONDS:
+        return _index
+
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            version = get_menu_version(cur)
+            if _index is None or _index.version != version:
+                cur.execute(
+                    """
+                    SELECT id, section_id, name, description, ingredients, image_url
+                    FROM cocktails.drinks
+                    WHERE is_active = true
+                    """
+                )
+                _index = DrinkIndex(version, cur.fetchall())
+                logger.info(
+                    "Built drink search index",
+                    extra={"drinks": len(_index.drinks), "menu_version": list(version)},
+                )
+
+    _index.checked_at = time.monotonic()
+    return _index
+
+
+@logger.inject_lambda_context
+@tracer.capture_lambda_handler
+def handler(event: dict, context: LambdaContext) -> dict:
+    try:
+        params = event.get("queryStringParameters") or {}
+        ingredients = [i for i in (params.get("ingredients") or "").split(",") if normalize_ingredient(i)]
+        terms = tokenize(params.get("q"))
+
+        if not ingredients and not terms:
+            return response(400, {"error": "Provide ingredients and/or q"})
+        if len(ingredients) + len(terms) > MAX_QUERY_TERMS:
+            return response(400, {"error": f"At most {MAX_QUERY_TERMS} search terms are allowed"})
+
+        index = get_index()
+        started = time.perf_counter()
+        drinks = index.search(ingredients, terms)
+        lookup_ms = (time.perf_counter() - started) * 1000
+
+        logger.info(
+            "Searched drinks",
+            extra={"count": len(drinks), "ingredients": ingredients, "terms": terms, "lookup_ms": round(lookup_ms, 3)},
+        )
+        return response(200, {"data": drinks, "metadata": {"menu_version": index.version[1]}})
+
+    except Exception:
+        logger.exception("Failed to search drinks")
+        return response(500, {"error": "Internal server error"})
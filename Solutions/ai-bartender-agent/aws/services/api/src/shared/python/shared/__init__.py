@@ -8,6 +8,9 @@ from .event_publisher import (
     EVENT_ORDER_COMPLETED,
 )
 from .cache_utils import flush_api_cache
+from .response_utils import compact_json, parse_fields, project
+from .lifecycle import after_restore, before_snapshot, run_init, track_invocation
+from .log_policy import install as install_log_policy, log_payload, sanitize, start_invocation
 
 __all__ = [
     "publish_order_created",
@@ -16,4 +19,15 @@ __all__ = [
     "EVENT_ORDER_STATUS_CHANGED",
     "EVENT_ORDER_COMPLETED",
     "flush_api_cache",
+    "compact_json",
+    "parse_fields",
+    "project",
+    "after_restore",
+    "before_snapshot",
+    "run_init",
+    "track_invocation",
+    "install_log_policy",
+    "log_payload",
+    "sanitize",
+    "start_invocation",
 ]
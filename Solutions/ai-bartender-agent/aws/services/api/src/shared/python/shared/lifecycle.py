@@ -0,0 +1,98 @@
+"""Init lifecycle: timed init steps at module load, snapshot-restore hooks, init vs invoke timing.
+
+Handlers do their expensive setup (clients, keys) in run_init() while the module
+loads, and register after_restore() hooks for anything that must not outlive a
+SnapStart snapshot: credentials, tokens, sockets and monotonic timestamps.
+"""
+
+import functools
+import time
+
+from aws_lambda_powertools import Logger
+
+try:
+    # Bundled with the Lambda Python runtime; only fires when SnapStart is enabled
+    from snapshot_restore_py import register_after_restore, register_before_snapshot
+except ImportError:
+    register_after_restore = register_before_snapshot = None
+
+logger = Logger()
+
+_init_started = time.perf_counter()
+_init_steps: dict[str, float] = {}
+_state = {"phase": "cold", "init_ms": None, "restore_ms": None}
+
+
+def run_init(name: str, fn) -> bool:
+    """Run an init step now and time it. Never raises: a failed step is logged and
+    left to the handler's lazy path on first use. Returns True on success."""
+    start = time.perf_counter()
+    try:
+        fn()
+        return True
+    except Exception:
+        logger.exception("Init step failed, falling back to lazy init", extra={"step": name})
+        return False
+    finally:
+        _init_steps[name] = round((time.perf_counter() - start) * 1000, 1)
+
+
+def before_snapshot(fn):
+    """Register fn to run before the snapshot is taken. Usable as a decorator."""
+    if register_before_snapshot is not None:
+        register_before_snapshot(fn)
+    return fn
+
+
+def after_restore(fn):
+    """Register fn to run after a snapshot restore, before the first invoke. Usable as a decorator.
+
+    Like run_init, a failing hook is logged rather than failing the restore.
+    """
+    if register_after_restore is not None:
+
+        def hook():
+            start = time.perf_counter()
+            try:
+                fn()
+            except Exception:
+                logger.exception("Restore hook failed, falling back to lazy init", extra={"hook": fn.__name__})
+            finally:
+                _state["restore_ms"] = (_state["restore_ms"] or 0) + (time.perf_counter() - start) * 1000
+                _state["phase"] = "restored"
+
+        register_after_restore(hook)
+    return fn
+
+
+@before_snapshot
+def _freeze_init_time():
+    _state["init_ms"] = (time.perf_counter() - _init_started) * 1000
+
+
+def track_invocation(handler):
+    """Handler decorator logging init/restore time on the first invoke and invoke time on every one."""
+
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        phase = _state["phase"]
+        timing = {"phase": phase}
+        if phase == "cold":
+            _state["init_ms"] = (time.perf_counter() - _init_started) * 1000
+            # CPU time so far covers the imports that ran before this module loaded
+            timing["init_cpu_ms"] = round(time.process_time() * 1000, 1)
+        if phase != "warm":
+            timing["init_ms"] = round(_state["init_ms"] or 0, 1)
+            timing["init_steps"] = dict(_init_steps)
+        if phase == "restored":
+            timing["restore_ms"] = round(_state["restore_ms"], 1)
+
+        start = time.perf_counter()
+        try:
+            return handler(event, context)
+        finally:
+            timing["invoke_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            logger.info("Invocation timing", extra=timing)
+            _state["phase"] = "warm"
+
+    return wrapper
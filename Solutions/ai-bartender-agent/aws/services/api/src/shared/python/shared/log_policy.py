@@ -0,0 +1,135 @@
+"""Logging policy: redact secrets, bound field sizes, sample payload logs, cap bytes per invocation."""
+
+import json
+import logging
+import os
+import random
+
+REDACTED = "[REDACTED]"
+
+# Matched case-insensitively against dict keys at any depth
+SENSITIVE_KEYS = {
+    "authorization",
+    "authorizationtoken",
+    "token",
+    "access_token",
+    "refresh_token",
+    "id_token",
+    "password",
+    "secret",
+    "private_key",
+    "cookie",
+    "set-cookie",
+    "x-api-key",
+    "x-registration-code",
+    "registration_code",
+}
+
+MAX_FIELD_CHARS = int(os.environ.get("LOG_MAX_FIELD_CHARS", "1024"))
+MAX_COLLECTION_ITEMS = int(os.environ.get("LOG_MAX_COLLECTION_ITEMS", "20"))
+MAX_DEPTH = 6
+# Share of invocations that log full (sanitized) payloads at INFO; DEBUG level logs them always
+PAYLOAD_SAMPLE_RATE = float(os.environ.get("LOG_PAYLOAD_SAMPLE_RATE", "0.05"))
+# INFO/DEBUG bytes allowed per invocation; warnings and errors are never dropped
+INVOCATION_BYTE_BUDGET = int(os.environ.get("LOG_INVOCATION_BYTE_BUDGET", "16384"))
+
+# Attributes every LogRecord has; anything else was passed via extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_state = {"remaining": INVOCATION_BYTE_BUDGET, "dropped": 0, "sampled": False}
+
+
+def _truncate(text: str) -> str:
+    if len(text) <= MAX_FIELD_CHARS:
+        return text
+    return f"{text[:MAX_FIELD_CHARS]}...[{len(text)} chars]"
+
+
+def sanitize(value, depth: int = 0):
+    """Copy of value with sensitive keys redacted and long strings/collections truncated."""
+    if isinstance(value, dict):
+        if depth >= MAX_DEPTH:
+            return f"[dict with {len(value)} keys]"
+        result = {}
+        for i, (key, item) in enumerate(value.items()):
+            if i == MAX_COLLECTION_ITEMS:
+                result["..."] = f"[{len(value) - i} more keys]"
+                break
+            if str(key).lower() in SENSITIVE_KEYS:
+                result[key] = REDACTED
+            else:
+                result[key] = sanitize(item, depth + 1)
+        return result
+    if isinstance(value, (list, tuple)):
+        if depth >= MAX_DEPTH:
+            return f"[list with {len(value)} items]"
+        items = [sanitize(item, depth + 1) for item in value[:MAX_COLLECTION_ITEMS]]
+        if len(value) > MAX_COLLECTION_ITEMS:
+            items.append(f"[{len(value) - MAX_COLLECTION_ITEMS} more items]")
+        return items
+    if isinstance(value, (bytes, bytearray)):
+        return f"[{len(value)} bytes]"
+    if isinstance(value, str):
+        return _truncate(value)
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return _truncate(str(value))
+
+
+def start_invocation() -> None:
+    """Reset the byte budget and roll the payload sampling dice. Call first in the handler."""
+    _state["remaining"] = INVOCATION_BYTE_BUDGET
+    _state["dropped"] = 0
+    _state["sampled"] = random.random() < PAYLOAD_SAMPLE_RATE
+
+
+class LogPolicyFilter(logging.Filter):
+    """Sanitizes extra fields of every record and enforces the per-invocation byte budget."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.msg, str):
+            record.msg = _truncate(record.msg)
+        size = len(str(record.msg))
+        for key, value in list(vars(record).items()):
+            if key in _RECORD_ATTRS:
+                continue
+            value = REDACTED if key.lower() in SENSITIVE_KEYS else sanitize(value)
+            setattr(record, key, value)
+            size += len(key) + len(json.dumps(value, default=str))
+
+        if record.levelno >= logging.WARNING:
+            return True
+        if not _state["dropped"] and size <= _state["remaining"]:
+            _state["remaining"] -= size
+            return True
+
+        _state["dropped"] += 1
+        if _state["dropped"] == 1:
+            # One marker per invocation so a quiet log isn't mistaken for a quiet function
+            for key in [key for key in vars(record) if key not in _RECORD_ATTRS]:
+                delattr(record, key)
+            record.msg = "Log byte budget exhausted, dropping INFO/DEBUG logs for this invocation"
+            record.args = ()
+            record.levelno, record.levelname = logging.WARNING, "WARNING"
+            record.log_budget_bytes = INVOCATION_BYTE_BUDGET
+            return True
+        return False
+
+
+def install(logger) -> None:
+    """Attach the policy filter to a Powertools (or stdlib) logger once."""
+    target = getattr(logger, "_logger", logger)
+    if not any(isinstance(f, LogPolicyFilter) for f in target.filters):
+        target.addFilter(LogPolicyFilter())
+
+
+def log_payload(logger, message: str, payload, **extra) -> None:
+    """Log a full request/event payload, sanitized, for sampled invocations only.
+
+    Always logged when the logger is at DEBUG; otherwise at INFO for the
+    LOG_PAYLOAD_SAMPLE_RATE share of invocations picked by start_invocation().
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(message, extra={"payload": payload, **extra})
+    elif _state["sampled"]:
+        logger.info(message, extra={"payload": payload, "payload_sampled": True, **extra})
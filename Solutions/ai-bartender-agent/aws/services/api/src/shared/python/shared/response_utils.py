@@ -0,0 +1,41 @@
+"""Response helpers for large list payloads: field projection and compact JSON."""
+
+import json
+
+
+def parse_fields(params: dict, allowed: tuple[str, ...]) -> list[str] | None:
+    """Parse ?fields=a,b,drink.name into a field list, or None to return everything.
+
+    Nested fields use dot notation. Raises ValueError for fields the endpoint doesn't return.
+    """
+    raw = (params or {}).get("fields")
+    if not raw:
+        return None
+
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return fields
+
+
+def project(item: dict, fields: list[str] | None) -> dict:
+    """Keep only the requested fields of a formatted item, preserving nesting."""
+    if fields is None:
+        return item
+
+    projected = {}
+    for field in fields:
+        source, target = item, projected
+        *parents, leaf = field.split(".")
+        for parent in parents:
+            source = source.get(parent) or {}
+            target = target.setdefault(parent, {})
+        if leaf in source:
+            target[leaf] = source[leaf]
+    return projected
+
+
+def compact_json(body: dict) -> str:
+    """Serialize without the whitespace json.dumps adds by default."""
+    return json.dumps(body, separators=(",", ":"), default=str)
@@ -2,36 +2,83 @@
 
 import json
 import os
+import sys
+import time
 
 import boto3
 import jwt
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
 
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+sys.path.insert(0, "/opt/python")
+from shared import lifecycle
+
 tracer = Tracer()
 logger = Logger()
 
-_jwt_public_key = None
+JWT_KEYS_CACHE_SECONDS = int(os.environ.get("JWT_KEYS_CACHE_SECONDS", "300"))
+# Tokens with an unknown kid trigger a reload, but no more often than this
+JWT_KEYS_MIN_RELOAD_SECONDS = 30
 
+_secrets_client = None
+_verification_keys = None
+_verification_keys_loaded_at = 0.0
 
-@tracer.capture_method
-def get_jwt_public_key() -> str:
-    """Get JWT public key from Secrets Manager with caching."""
-    global _jwt_public_key
 
-    if _jwt_public_key is not None:
-        return _jwt_public_key
+def get_secrets_client():
+    """Secrets Manager client, created once per container and again after a snapshot restore."""
+    global _secrets_client
+    if _secrets_client is None:
+        _secrets_client = boto3.client("secretsmanager", region_name=os.environ.get("AWS_REGION", "eu-west-1"))
+    return _secrets_client
 
-    secret_name = os.environ.get("JWT_KEYS_SECRET_NAME", "ai-bartender/jwt-keys")
-    region = os.environ.get("AWS_REGION", "eu-west-1")
 
-    client = boto3.client("secretsmanager", region_name=region)
-    response = client.get_secret_value(SecretId=secret_name)
+def load_verification_keys() -> dict:
+    """Load the active key and any previous_keys from Secrets Manager, keyed by kid.
+
+    Secrets created before key rotation have no kid; their key is stored under None
+    so tokens without a kid header keep verifying until the key is retired.
+    """
+    secret_name = os.environ.get("JWT_KEYS_SECRET_NAME", "ai-bartender/jwt-keys")
+    response = get_secrets_client().get_secret_value(SecretId=secret_name)
     secret = json.loads(response["SecretString"])
-    _jwt_public_key = secret["public_key"]
-    logger.info("JWT public key loaded from Secrets Manager")
-    return _jwt_public_key
+
+    keys = {}
+    for entry in [secret, *secret.get("previous_keys", [])]:
+        keys[entry.get("kid")] = {
+            "key": load_pem_public_key(entry["public_key"].encode()),
+            "algorithm": entry.get("algorithm", "RS256"),
+        }
+
+    logger.info("JWT verification keys loaded from Secrets Manager", extra={"kids": list(keys)})
+    return keys
+
+
+@tracer.capture_method
+def get_verification_key(kid: str | None) -> dict:
+    """Get the public key and algorithm for a token's kid, with caching."""
+    global _verification_keys, _verification_keys_loaded_at
+
+    age = time.monotonic() - _verification_keys_loaded_at
+    stale = _verification_keys is None or age >= JWT_KEYS_CACHE_SECONDS
+    unknown_kid = _verification_keys is not None and kid not in _verification_keys
+
+    if stale or (unknown_kid and age >= JWT_KEYS_MIN_RELOAD_SECONDS):
+        _verification_keys = load_verification_keys()
+        _verification_keys_loaded_at = time.monotonic()
+
+    if kid not in _verification_keys:
+        raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+    return _verification_keys[kid]
+
+
+def preload_verification_keys():
+    """Load keys ahead of the first request (init phase, and again after a restore)."""
+    global _verification_keys, _verification_keys_loaded_at
+    _verification_keys = load_verification_keys()
+    _verification_keys_loaded_at = time.monotonic()
 
 
 @tracer.capture_method
@@ -53,12 +100,14 @@ def extract_bearer_token(event: dict) -> str:
 @tracer.capture_method
 def validate_jwt_token(token: str) -> dict:
     """Validate JWT token and return claims."""
-    public_key = get_jwt_public_key()
+    kid = jwt.get_unverified_header(token).get("kid")
+    verification_key = get_verification_key(kid)
 
+    # Only accept the algorithm registered for this kid, never the one the header claims
     payload = jwt.decode(
         token,
-        public_key,
-        algorithms=["RS256"],
+        verification_key["key"],
+        algorithms=[verification_key["algorithm"]],
         options={
             "verify_exp": True,
             "verify_iat": True,
@@ -96,6 +145,19 @@ def generate_policy(principal_id: str, effect: str, resource: str, context: dict
     return policy
 
 
+@lifecycle.after_restore
+def refresh_after_restore():
+    """Drop the client and cached keys; their socket and monotonic timestamp predate the snapshot."""
+    global _secrets_client, _verification_keys
+    _secrets_client = None
+    _verification_keys = None
+    preload_verification_keys()
+
+
+lifecycle.run_init("jwt_verification_keys", preload_verification_keys)
+
+
+@lifecycle.track_invocation
 @logger.inject_lambda_context
 @tracer.capture_lambda_handler
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
@@ -0,0 +1,686 @@
+#!/usr/bin/env python3
+"""
+Replay recorded chat transcripts through chat-sync and chat-streaming, offline
+
+Imports both real handlers with Bedrock, the AgentCore Gateway and AgentCore
+Memory swapped for local stand-ins, then replays the conversations in
+replay-transcripts.json:
+
+    model    ReplayModel streams each recorded reply one word per token, with a fixed
+             time to first token and per-token latency, after making the recorded tool calls
+    tools    LocalMCPClient serves getDrinks, findDrinks and getSections from the seed
+             menu with the MCP tools' index (agentcore/src/mcp-tools/menu_index.py)
+    memory   ReplaySessionManager keeps sessions as files in a temporary directory
+
+The stand-ins' latency is known exactly, so whatever a turn takes beyond it is
+framework overhead: request handling, agent construction and session load, the
+Strands event loop, SSE framing, logging and metrics. The handlers' own turn
+metrics (the EMF lines they print) split it up.
+
+    chat-sync       every conversation through handler(), one request at a time like
+                    a Lambda instance
+    chat-streaming  the FastAPI app driven over ASGI in this process (no uvicorn or
+                    Lambda Web Adapter), first one stream at a time, then with
+                    concurrent streams doubling until the p95 overhead per turn
+                    exceeds --overhead-budget-ms or a stream fails
+
+The response cache is disabled, so every turn runs the agent.
+
+Needs the chat functions' dependencies (src/*/requirements.txt) but no AWS
+credentials or network access.
+
+Usage:
+    python3 benchmark-chat-replay.py [--first-token-ms 300] [--token-ms 15] [--tool-ms 40]
+                                     [--max-streams 256] [--overhead-budget-ms 250]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from types import SimpleNamespace
+
+import strands.tools.mcp
+from strands.models import Model
+from strands.session.file_session_manager import FileSessionManager
+from strands.tools.tools import PythonAgentTool
+from bedrock_agentcore.memory.integrations.strands import session_manager as agentcore_session_manager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SHARED_DIR = os.path.join(HERE, "src", "shared")
+sys.path.insert(0, os.path.join(HERE, "..", "agentcore", "src", "mcp-tools"))
+
+from menu_index import MenuIndex, compact_drink  # noqa: E402
+
+DEFAULT_TRANSCRIPTS = os.path.join(HERE, "replay-transcripts.json")
+DEFAULT_MENU = os.path.join(HERE, "..", "..", "..", "database", "seed-data", "drinks.json")
+# The model stand-in emits one word (with its trailing space) per token
+TOKEN_PATTERN = re.compile(r"\S+\s*")
+# Gateway tool names carry a target prefix ("<target>___getDrinks")
+TOOL_TARGET = "replay-drinks-tools-target"
+FALLBACK_REPLY = "Sorry, I don't have a recorded answer for that."
+EMF_DECODER = json.JSONDecoder()
+
+# Set before the handlers are imported; they read their configuration at module load
+HANDLER_ENV = {
+    "AGENTCORE_GATEWAY_URL": "http://localhost/replay-gateway",
+    "AGENTCORE_MEMORY_ID": "replay-memory",
+    "AWS_REGION": "eu-west-1",
+    "POWERTOOLS_METRICS_NAMESPACE": "ai-bartender-replay",
+    "POWERTOOLS_SERVICE_NAME": "chat-replay",
+    "POWERTOOLS_TRACE_DISABLED": "true",
+    # A cached opening answer would skip the agent and hide its overhead
+    "RESPONSE_CACHE_MAX_ENTRIES": "0",
+    # The ramp measures what one process can sustain, which is what CHAT_MAX_STREAMS should be set from
+    "CHAT_MAX_STREAMS": "0",
+    "CHAT_MAX_STREAMS_PER_ACTOR": "0",
+    "CHAT_MAX_STREAMS_PER_IP": "0",
+}
+
+TOOL_DESCRIPTIONS = {
+    "getDrinks": ("The whole menu, or one section by id", {"section_id": {"type": "string"}}),
+    "findDrinks": (
+        "Menu drinks matching ingredients, section and flavors, minus excluded ones",
+        {
+            "ingredients": {"type": "array", "items": {"type": "string"}},
+            "section": {"type": "string"},
+            "flavors": {"type": "array", "items": {"type": "string"}},
+            "exclude": {"type": "array", "items": {"type": "string"}},
+            "limit": {"type": "integer"},
+        },
+    ),
+    "getSections": ("Menu sections with the number of drinks in each", {}),
+}
+
+
+def load_menu(path: str) -> list[dict]:
+    """Seed menu (drinks.json) in the shape the MCP tools load from the database."""
+    with open(path, encoding="utf-8") as f:
+        menu = json.load(f)["menu"]
+    return [
+        {
+            "id": f"{section['name']}/{drink['name']}",
+            "section_id": section["name"],
+            "section_name": section["name"],
+            "name": drink["name"],
+            "description": drink.get("description", ""),
+            "ingredients": [ingredient["item"] for ingredient in drink["ingredients"]],
+        }
+        for section in menu["sections"]
+        for drink in section["drinks"]
+    ]
+
+
+def load_transcripts(path: str) -> list[dict]:
+    """Conversations: {"actor_id", "turns": [{"message", "tools": [{"name", "input"}], "response"}]}."""
+    with open(path, encoding="utf-8") as f:
+        conversations = json.load(f)["conversations"]
+    for conversation in conversations:
+        for turn in conversation["turns"]:
+            turn.setdefault("tools", [])
+    return conversations
+
+
+def replay_script(conversations: list[dict]) -> dict:
+    """Recorded turns keyed by the guest messages up to and including the turn's own."""
+    script = {}
+    for conversation in conversations:
+        messages = ()
+        for turn in conversation["turns"]:
+            messages += (turn["message"],)
+            script[messages] = turn
+    return script
+
+
+def count_tokens(text: str) -> int:
+    return len(TOKEN_PATTERN.findall(text))
+
+
+class ReplayModel(Model):
+    """Deterministic stand-in for BedrockModel that replays recorded turns.
+
+    The turn is looked up by the guest messages in the conversation so far. Each
+    recorded tool call is made in its own model call, then the reply is streamed.
+    Tokens are paced against absolute deadlines, so sleep overshoot does not add
+    up over a long reply.
+    """
+
+    def __init__(self, script: dict, first_token_ms: float, token_ms: float):
+        self.script = script
+        self.config = {"model_id": "replay", "first_token_ms": first_token_ms, "token_ms": token_ms}
+
+    def update_config(self, **model_config) -> None:
+        self.config.update(model_config)
+
+    def get_config(self) -> dict:
+        return self.config
+
+    def call_ms(self, output_tokens: int) -> float:
+        """Stand-in latency of one model call: time to first token, then one token per token_ms."""
+        return self.config["first_token_ms"] + max(output_tokens - 1, 0) * self.config["token_ms"]
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        raise NotImplementedError("ReplayModel does not support structured output")
+        yield  # pragma: no cover
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        start = time.perf_counter()
+        guest = tuple(
+            block["text"] for message in messages if message["role"] == "user"
+            for block in message["content"] if "text" in block
+        )
+        turn = self.script.get(guest) or {"tools": [], "response": FALLBACK_REPLY}
+
+        # Tool calls already made since the guest's last message
+        calls = 0
+        for message in reversed(messages):
+            if message["role"] == "user" and any("text" in block for block in message["content"]):
+                break
+            calls += message["role"] == "assistant" and any("toolUse" in block for block in message["content"])
+
+        yield {"messageStart": {"role": "assistant"}}
+        if calls < len(turn["tools"]):
+            tool = turn["tools"][calls]
+            arguments = json.dumps(tool["input"])
+            await self._pace(start, 0)
+            yield {"contentBlockStart": {"start": {"toolUse": {
+                "toolUseId": f"tooluse_{uuid.uuid4().hex[:12]}", "name": f"{TOOL_TARGET}___{tool['name']}",
+            }}}}
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": arguments}}}}
+            yield {"contentBlockStop": {}}
+            stop_reason, output_tokens = "tool_use", count_tokens(arguments)
+        else:
+            tokens = TOKEN_PATTERN.findall(turn["response"])
+            for position, token in enumerate(tokens):
+                await self._pace(start, position)
+                yield {"contentBlockDelta": {"delta": {"text": token}}}
+            yield {"contentBlockStop": {}}
+            stop_reason, output_tokens = "end_turn", len(tokens)
+        yield {"messageStop": {"stopReason": stop_reason}}
+
+        # Rough input size (4 characters per token) so token metrics grow with the history
+        input_tokens = (len(json.dumps(messages)) + len(system_prompt or "") + len(json.dumps(tool_specs or []))) // 4
+        yield {"metadata": {
+            "usage": {"inputTokens": input_tokens, "outputTokens": output_tokens, "totalTokens": input_tokens + output_tokens},
+            "metrics": {"latencyMs": round((time.perf_counter() - start) * 1000)},
+        }}
+
+    async def _pace(self, start: float, position: int) -> None:
+        delay = start + self.call_ms(position + 1) / 1000 - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def build_tools(index: MenuIndex, tool_ms: float) -> tuple[list, dict]:
+    """Agent tools named like the gateway's, plus the plain functions behind them."""
+    functions = {
+        "getDrinks": lambda arguments: {
+            "drinks": [
+                compact_drink(d) for d in index.drinks
+                if not arguments.get("section_id") or d["section_id"] == arguments["section_id"]
+            ],
+            "count": len(index.drinks),
+        },
+        "findDrinks": lambda arguments: index.find(**arguments),
+        "getSections": lambda arguments: index.list_sections(),
+    }
+
+    def make_tool(name: str, function) -> PythonAgentTool:
+        async def call(tool_use, **_):
+            # MCP tool calls are awaited, so the stand-in must not hold a worker thread either
+            await asyncio.sleep(tool_ms / 1000)
+            return {
+                "toolUseId": tool_use["toolUseId"],
+                "status": "success",
+                "content": [{"text": json.dumps(function(tool_use.get("input") or {}))}],
+            }
+
+        description, properties = TOOL_DESCRIPTIONS[name]
+        full_name = f"{TOOL_TARGET}___{name}"
+        tool = PythonAgentTool(full_name, {
+            "name": full_name,
+            "description": description,
+            "inputSchema": {"json": {"type": "object", "properties": properties}},
+        }, call)
+        # The handlers read the gateway name from MCPAgentTool.mcp_tool
+        tool.mcp_tool = SimpleNamespace(name=full_name)
+        return tool
+
+    return [make_tool(name, function) for name, function in functions.items()], functions
+
+
+class LocalMCPClient:
+    """Stand-in for Strands' MCPClient with the gateway's tools served in process."""
+
+    tools: list = []
+    functions: dict = {}
+
+    def __init__(self, transport_callable=None, *args, **kwargs):
+        pass
+
+    def start(self):
+        return self
+
+    def stop(self, exc_type=None, exc_val=None, exc_tb=None) -> None:
+        pass
+
+    __enter__ = start
+    __exit__ = stop
+
+    def list_tools_sync(self, *args, **kwargs) -> list:
+        return list(self.tools)
+
+    def call_tool_sync(self, tool_use_id: str, name: str, arguments: dict | None = None, *args, **kwargs) -> dict:
+        result = self.functions[name.split("___")[-1]](arguments or {})
+        return {"toolUseId": tool_use_id, "status": "success", "content": [{"text": json.dumps(result)}]}
+
+
+class ReplaySessionManager(FileSessionManager):
+    """Stand-in for AgentCoreMemorySessionManager: the same Strands session hooks, with
+    sessions kept as files. Counts appended messages per session, standing in for the
+    newest event id the chat-sync agent pool compares."""
+
+    storage_dir: str | None = None
+    events: dict = defaultdict(int)
+
+    def __init__(self, agentcore_memory_config, region_name=None, **kwargs):
+        self.replay_key = (agentcore_memory_config.session_id, agentcore_memory_config.actor_id)
+        super().__init__(session_id=agentcore_memory_config.session_id, storage_dir=self.storage_dir)
+
+    def append_message(self, message, agent, **kwargs) -> None:
+        super().append_message(message, agent, **kwargs)
+        self.events[self.replay_key] += 1
+
+    def close(self) -> None:
+        pass
+
+
+def latest_event_id(session_id: str, actor_id: str) -> str | None:
+    """Replacement for chat-sync's ListEvents call."""
+    count = ReplaySessionManager.events.get((session_id, actor_id))
+    return str(count) if count else None
+
+
+class MetricsCapture(io.TextIOBase):
+    """stdout replacement keeping the handlers' per-turn EMF records, by session, and
+    dropping the rest of their output (logs still get formatted and written, as in Lambda)."""
+
+    def __init__(self):
+        self.turns = defaultdict(list)
+        self._buffer = ""
+        self._lock = threading.Lock()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            self._buffer += text
+            *lines, self._buffer = self._buffer.split("\n")
+            for line in lines:
+                # Strands prints streamed text without newlines, so reply text may surround a record
+                start = line.find('{"_aws"')
+                if start < 0 or '"TurnLatency"' not in line:
+                    continue
+                try:
+                    record, _ = EMF_DECODER.raw_decode(line, start)
+                except ValueError:
+                    continue
+                # Powertools writes each metric's values as a list
+                record = {k: v[0] if isinstance(v, list) and len(v) == 1 else v for k, v in record.items()}
+                self.turns[record.get("session_id")].append(record)
+        return len(text)
+
+    def turn(self, session_id: str, position: int) -> dict:
+        with self._lock:
+            records = self.turns.get(session_id, [])
+            return records[position] if position < len(records) else {}
+
+
+def install_stand_ins() -> None:
+    """Swap the AWS-backed classes the handlers import for the local stand-ins."""
+    os.environ.update(HANDLER_ENV)
+    strands.tools.mcp.MCPClient = LocalMCPClient
+    agentcore_session_manager.AgentCoreMemorySessionManager = ReplaySessionManager
+
+
+def load_handler(name: str):
+    """Import src/<name>/handler.py as a module of its own (both files are called handler.py).
+
+    The modules both functions import (context_policy, chat_common) come from src/shared,
+    which the build copies next to each handler.
+    """
+    function_dir = os.path.join(HERE, "src", name)
+    spec = importlib.util.spec_from_file_location(
+        f"{name.replace('-', '_')}_handler", os.path.join(function_dir, "handler.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    sys.path[:0] = [function_dir, SHARED_DIR]
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(function_dir)
+        sys.path.remove(SHARED_DIR)
+    return module
+
+
+def stand_in_ms(turn: dict, model: ReplayModel, tool_ms: float) -> tuple[float, float]:
+    """Stand-in time of a turn: (whole turn, until the first reply token)."""
+    # A tool call is one model call whose arguments arrive with the first token, then the tool
+    tools = len(turn["tools"]) * (model.call_ms(1) + tool_ms)
+    return tools + model.call_ms(count_tokens(turn["response"])), tools + model.call_ms(1)
+
+
+def lambda_context() -> SimpleNamespace:
+    return SimpleNamespace(
+        function_name="chat-sync-replay",
+        function_version="$LATEST",
+        memory_limit_in_mb=512,
+        invoked_function_arn="arn:aws:lambda:eu-west-1:000000000000:function:chat-sync-replay",
+        aws_request_id=str(uuid.uuid4()),
+        get_remaining_time_in_millis=lambda: 120000,
+    )
+
+
+def turn_result(turn: dict, reply: str, wall_ms: float, metrics: dict, model: ReplayModel, tool_ms: float) -> dict:
+    total, first = stand_in_ms(turn, model, tool_ms)
+    return {
+        "wall": wall_ms,
+        "overhead": wall_ms - total,
+        "build": metrics.get("MemoryLoadTime"),
+        "request": wall_ms - metrics["TurnLatency"] if "TurnLatency" in metrics else None,
+        "loop": (
+            metrics["TurnLatency"] - metrics["MemoryLoadTime"] - total if "TurnLatency" in metrics else None
+        ),
+        "first_token": first,
+        "matches": reply.strip() == turn["response"].strip(),
+    }
+
+
+def replay_sync(module, conversations: list[dict], capture: MetricsCapture, model: ReplayModel, tool_ms: float) -> list[dict]:
+    results = []
+    for conversation in conversations:
+        session_id = None
+        for position, turn in enumerate(conversation["turns"]):
+            body = {"message": turn["message"], "actor_id": conversation["actor_id"]}
+            if session_id:
+                body["session_id"] = session_id
+            start = time.perf_counter()
+            reply = module.handler({"body": json.dumps(body)}, lambda_context())
+            wall_ms = (time.perf_counter() - start) * 1000
+            payload = json.loads(reply["body"])
+            if reply["statusCode"] != 200:
+                raise RuntimeError(f"chat-sync returned {reply['statusCode']}: {payload}")
+            session_id = payload["session_id"]
+            results.append(turn_result(
+                turn, payload["response"], wall_ms, capture.turn(session_id, position), model, tool_ms
+            ))
+    return results
+
+
+async def post_chat(app, body: dict) -> dict:
+    """POST /chat over ASGI. Returns the reassembled reply, session id, errors and client timings."""
+    payload = json.dumps(body).encode()
+    request_sent = False
+    finished = asyncio.Event()
+    status, chunks, first_chunk = None, [], None
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status, first_chunk
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and message.get("body"):
+            if first_chunk is None and b'"chunk"' in message["body"]:
+                first_chunk = time.perf_counter()
+            chunks.append(message["body"])
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/chat",
+        "raw_path": b"/chat",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8080),
+    }
+    start = time.perf_counter()
+    try:
+        await app(scope, receive, send)
+    finally:
+        finished.set()
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    reply, session_id, error = [], None, None if status == 200 else f"HTTP {status}"
+    for frame in b"".join(chunks).decode().split("\n\n"):
+        data = "\n".join(line[6:] for line in frame.split("\n") if line.startswith("data: "))
+        if not data:
+            continue
+        event = json.loads(data)
+        if "chunk" in event:
+            reply.append(event["chunk"])
+        elif event.get("done"):
+            session_id = event["sessionId"]
+        elif "error" in event:
+            error = event["error"]
+    return {
+        "reply": "".join(reply),
+        "session_id": session_id,
+        "error": error,
+        "wall": wall_ms,
+        "first_token": (first_chunk - start) * 1000 if first_chunk else None,
+    }
+
+
+async def replay_streams(app, conversations, first, turns, capture, model, tool_ms, delay=0.0) -> list[dict]:
+    """One guest: conversations from position first onwards (wrapping around), until turns are done."""
+    await asyncio.sleep(delay)
+    results = []
+    position = first
+    while len(results) < turns:
+        conversation = conversations[position % len(conversations)]
+        position += 1
+        session_id = None
+        for index, turn in enumerate(conversation["turns"][: turns - len(results)]):
+            body = {"message": turn["message"], "actor_id": conversation["actor_id"]}
+            if session_id:
+                body["session_id"] = session_id
+            response = await post_chat(app, body)
+            if response["error"]:
+                results.append({"error": response["error"]})
+                break
+            session_id = response["session_id"]
+            result = turn_result(
+                turn, response["reply"], response["wall"], capture.turn(session_id, index), model, tool_ms
+            )
+            result["ttft_overhead"] = (
+                response["first_token"] - result["first_token"] if response["first_token"] is not None else None
+            )
+            results.append(result)
+    return results
+
+
+async def framing_ms(module, conversations: list[dict], repeats: int = 20) -> float:
+    """Mean time per turn spent coalescing and framing the reply (no model latency)."""
+    replies = [turn["response"] for conversation in conversations for turn in conversation["turns"]]
+
+    async def events(text):
+        for token in TOKEN_PATTERN.findall(text):
+            yield {"data": token}
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text in replies:
+            chars = 0
+            async for chunk in module.coalesce_text(events(text), module.SSE_COALESCE_MS, module.SSE_COALESCE_CHARS):
+                chars += len(chunk)
+                module.chunk_frame(chunk, "json")
+            module.done_frame("session", chars, "json")
+    return (time.perf_counter() - start) * 1000 / (repeats * len(replies))
+
+
+async def replay_streaming(module, conversations, capture, model, args) -> tuple[list, float, list]:
+    turns_per_stream = max(len(c["turns"]) for c in conversations) * 2
+    mean_turn_ms = sum(
+        stand_in_ms(turn, model, args.tool_ms)[0] for c in conversations for turn in c["turns"]
+    ) / sum(len(c["turns"]) for c in conversations)
+
+    async with module.app.router.lifespan_context(module.app):
+        # Warm up imports and first-call paths, then one stream at a time
+        await replay_streams(module.app, conversations, 0, len(conversations[0]["turns"]), capture, model, args.tool_ms)
+        single = []
+        for position, conversation in enumerate(conversations):
+            single += await replay_streams(
+                module.app, conversations, position, len(conversation["turns"]), capture, model, args.tool_ms
+            )
+        framing = await framing_ms(module, conversations)
+
+        levels = []
+        streams = 1
+        while streams <= args.max_streams:
+            cpu, start = time.process_time(), time.perf_counter()
+            # Starts spread over one average turn, like guests arriving independently
+            batches = await asyncio.gather(*(
+                replay_streams(
+                    module.app, conversations, i, turns_per_stream, capture, model, args.tool_ms,
+                    delay=mean_turn_ms / 1000 * i / streams,
+                )
+                for i in range(streams)
+            ))
+            elapsed = time.perf_counter() - start
+            results = [result for batch in batches for result in batch]
+            completed = [result for result in results if "error" not in result]
+            level = {
+                "streams": streams,
+                "turns_per_second": len(completed) / elapsed,
+                "overhead_p50": percentile([r["overhead"] for r in completed], 50),
+                "overhead_p95": percentile([r["overhead"] for r in completed], 95),
+                "ttft_p95": percentile([r["ttft_overhead"] for r in completed if r["ttft_overhead"] is not None], 95),
+                "cpu": (time.process_time() - cpu) / elapsed,
+                "errors": len(results) - len(completed),
+            }
+            level["sustainable"] = not level["errors"] and level["overhead_p95"] <= args.overhead_budget_ms
+            levels.append(level)
+            if not level["sustainable"]:
+                break
+            streams *= 2
+    return single, framing, levels
+
+
+def percentile(values: list, q: float) -> float | None:
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, round(q / 100 * len(values) + 0.5) - 1))]
+
+
+def print_breakdown(title: str, results: list[dict], rows: list[tuple[str, str]]) -> None:
+    print(title)
+    print(f"  {'':<40} {'p50 ms':>8} {'p95 ms':>8}")
+    for label, key in rows:
+        values = [r[key] for r in results]
+        p50, p95 = percentile(values, 50), percentile(values, 95)
+        if p50 is not None:
+            print(f"  {label:<40} {p50:>8.1f} {p95:>8.1f}")
+    matching = sum(r["matches"] for r in results)
+    print(f"  Replies matching the transcript: {matching}/{len(results)}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay chat transcripts through both chat handlers offline")
+    parser.add_argument("--transcripts", default=DEFAULT_TRANSCRIPTS, help="Conversations to replay (JSON)")
+    parser.add_argument("--menu", default=DEFAULT_MENU, help="Menu the tool stand-in serves (seed-data format)")
+    parser.add_argument("--first-token-ms", type=float, default=300, help="Model stand-in time to first token")
+    parser.add_argument("--token-ms", type=float, default=15, help="Model stand-in time per output token")
+    parser.add_argument("--tool-ms", type=float, default=40, help="Tool stand-in latency per call")
+    parser.add_argument("--max-streams", type=int, default=256, help="Stop the concurrency ramp here")
+    parser.add_argument(
+        "--overhead-budget-ms", type=float, default=250,
+        help="p95 overhead per turn a concurrency level may add and still count as sustainable",
+    )
+    args = parser.parse_args()
+
+    conversations = load_transcripts(args.transcripts)
+    LocalMCPClient.tools, LocalMCPClient.functions = build_tools(MenuIndex(load_menu(args.menu)), args.tool_ms)
+    model = ReplayModel(replay_script(conversations), args.first_token_ms, args.token_ms)
+    install_stand_ins()
+
+    capture = MetricsCapture()
+    with tempfile.TemporaryDirectory() as sessions, contextlib.redirect_stdout(capture):
+        ReplaySessionManager.storage_dir = sessions
+        chat_sync = load_handler("chat-sync")
+        chat_sync.BEDROCK_MODEL = model
+        chat_sync.latest_event_id = latest_event_id
+        chat_streaming = load_handler("chat-streaming")
+        chat_streaming._create_model = lambda: model
+
+        replay_sync(chat_sync, conversations[:1], capture, model, args.tool_ms)  # warm-up
+        sync_results = replay_sync(chat_sync, conversations, capture, model, args.tool_ms)
+        stream_results, framing, levels = asyncio.run(
+            replay_streaming(chat_streaming, conversations, capture, model, args)
+        )
+
+    turns = sum(len(c["turns"]) for c in conversations)
+    tool_calls = sum(len(t["tools"]) for c in conversations for t in c["turns"])
+    print(
+        f"Stand-ins: model {args.first_token_ms:g} ms to first token + {args.token_ms:g} ms/token, "
+        f"tools {args.tool_ms:g} ms/call; {len(conversations)} conversations, {turns} turns, {tool_calls} tool calls\n"
+    )
+    overhead_rows = [
+        ("Overhead per turn", "overhead"),
+        ("  Agent + session build (MemoryLoadTime)", "build"),
+        ("  Agent loop, framing, metrics", "loop"),
+        ("  Request handling outside TurnLatency", "request"),
+    ]
+    print_breakdown("chat-sync: handler(), one request at a time", sync_results, overhead_rows)
+    print_breakdown(
+        "chat-streaming: POST /chat over ASGI, one stream at a time",
+        stream_results,
+        overhead_rows + [("TTFT overhead", "ttft_overhead")],
+    )
+    print(f"  SSE coalescing + framing per turn: {framing:.2f} ms (part of the agent loop above)\n")
+
+    print("chat-streaming: concurrent streams in one process")
+    print(f"  {'Streams':>7} {'Turns/s':>8} {'Overhead p50':>13} {'Overhead p95':>13} {'TTFT ovh p95':>13} {'CPU':>6} {'Errors':>7}")
+    for level in levels:
+        print(
+            f"  {level['streams']:>7} {level['turns_per_second']:>8.1f} {level['overhead_p50']:>13.1f} "
+            f"{level['overhead_p95']:>13.1f} {level['ttft_p95'] or 0:>13.1f} {level['cpu']:>6.0%} {level['errors']:>7}"
+        )
+    sustainable = [level["streams"] for level in levels if level["sustainable"]]
+    limit = "reached" if levels and not levels[-1]["sustainable"] else f"not reached by {args.max_streams}"
+    print(
+        f"\nMax sustainable concurrent streams per process: {max(sustainable, default=0)} "
+        f"(p95 overhead <= {args.overhead_budget_ms:g} ms; limit {limit})"
+    )
+
+
+if __name__ == "__main__":
+    main()
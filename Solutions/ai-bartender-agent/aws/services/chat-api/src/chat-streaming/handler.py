@@ -1,26 +1,64 @@
 """AI Bartender streaming chat endpoint (FastAPI + Lambda Web Adapter).
 
 Uses Strands Agents with AgentCore Memory and MCP tools via AgentCore Gateway.
-MCP client and tools are initialized at cold start via singleton pattern.
+The MCP client and tool list are created once in the FastAPI lifespan, shared
+behind a lock, re-listed on a TTL and reconnected when the gateway session drops.
+
+SSE protocol: text is streamed as coalesced chunk frames and never repeated; the
+final done frame only carries the total length, so the client reassembles the
+reply and the server holds at most one coalescing window per stream.
+
+Answers to the opening message of a conversation are cached per menu version
+and streamed straight from the cache on a hit.
+
+Only the last turns are sent verbatim; older turns are folded into a running
+summary in the background (see context_policy). A summary that is ready at the
+done frame is saved to memory; one still being written is taken over by the
+session's next request on this container.
+
+Every model turn emits EMF metrics for time to first token, memory load, model,
+tool and token usage.
+
+Streams are admitted by AdmissionController: a cap per process, per actor and
+per source IP, a bounded FIFO wait for a free slot, and 429 when a request can't be admitted.
+Lambda runs one request per execution environment, so the per-actor and per-IP counts
+are kept in DynamoDB (StreamLeases) when CHAT_STREAM_LEASES_TABLE is set.
 """
 
+import asyncio
+import functools
 import json
 import os
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+import boto3
+from botocore.exceptions import BotoCoreError, ClientError
 
 from fastapi import FastAPI, Request
 from fastapi.responses import StreamingResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
 
 from strands import Agent
+from strands.hooks import AfterToolCallEvent, HookProvider, HookRegistry
 from strands.models.bedrock import BedrockModel
 from strands.tools.mcp import MCPClient
+from strands.types.exceptions import MCPClientInitializationError
 from mcp_proxy_for_aws.client import aws_iam_streamablehttp_client
 from bedrock_agentcore.memory.integrations.strands.config import AgentCoreMemoryConfig
 from bedrock_agentcore.memory.integrations.strands.session_manager import (
     AgentCoreMemorySessionManager,
 )
 
+from chat_common import ResponseCache, summarize_history, turn_metrics, usage_snapshot
+from context_policy import ContextPolicy
+
 DEFAULT_REGION = "eu-west-1"
 DEFAULT_PORT = 8080
 BEDROCK_MODEL_ID = "global.amazon.nova-2-lite-v1:0"
@@ -30,6 +68,64 @@ MEMORY_ID = os.environ.get("AGENTCORE_MEMORY_ID")
 GATEWAY_URL = os.environ.get("AGENTCORE_GATEWAY_URL")
 REGION = os.environ.get("AWS_REGION", DEFAULT_REGION)
 
+# Chunks are batched until this much time has passed or this much text is buffered
+SSE_COALESCE_MS = int(os.environ.get("SSE_COALESCE_MS", "50"))
+SSE_COALESCE_CHARS = int(os.environ.get("SSE_COALESCE_CHARS", "256"))
+# "json": data: {"chunk": "..."}; "compact": chunk text as raw data lines, named done/error events
+STREAM_FORMATS = ("json", "compact")
+
+# Re-list MCP tools this often; the call doubles as a gateway session health check
+MCP_TOOLS_TTL_SECONDS = int(os.environ.get("MCP_TOOLS_TTL_SECONDS", "300"))
+# After a failed refresh/reconnect, keep serving the last tools this long before retrying
+MCP_RETRY_BACKOFF_SECONDS = 10
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "200"))
+RESPONSE_CACHE_TTL_SECONDS = int(os.environ.get("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+# Minimum cosine similarity for serving the answer to a differently worded question
+RESPONSE_CACHE_SIMILARITY = float(os.environ.get("RESPONSE_CACHE_SIMILARITY", "0.92"))
+# Bedrock embedding model for similarity matching; empty matches normalized text only
+RESPONSE_CACHE_EMBEDDING_MODEL_ID = os.environ.get("RESPONSE_CACHE_EMBEDDING_MODEL_ID", "")
+# How often the menu version (getMenuVersion tool) is re-read
+MENU_VERSION_CHECK_SECONDS = int(os.environ.get("MENU_VERSION_CHECK_SECONDS", "60"))
+# Gateway tool the response cache reads the menu version from; it is not given to the agent
+MENU_VERSION_TOOL_NAME = "getMenuVersion"
+
+# Guest turns sent verbatim; older ones are summarized. 0 keeps the whole history
+CONTEXT_WINDOW_TURNS = int(os.environ.get("CONTEXT_WINDOW_TURNS", "6"))
+# Maximum estimated tokens of history (summary included) carried into a turn
+CONTEXT_TOKEN_BUDGET = int(os.environ.get("CONTEXT_TOKEN_BUDGET", "4000"))
+CONTEXT_SUMMARY_MODEL_ID = os.environ.get("CONTEXT_SUMMARY_MODEL_ID", BEDROCK_MODEL_ID)
+CONTEXT_SUMMARY_MAX_TOKENS = 300
+# Summaries still being written when a stream ends, kept for the session's next request
+CONTEXT_PENDING_SUMMARIES = 64
+
+# Admission control for /chat (see AdmissionController); 0 disables a limit
+CHAT_MAX_STREAMS = int(os.environ.get("CHAT_MAX_STREAMS", "16"))
+# Streams running or waiting per actor_id (per session_id for anonymous guests)
+CHAT_MAX_STREAMS_PER_ACTOR = int(os.environ.get("CHAT_MAX_STREAMS_PER_ACTOR", "2"))
+# Streams running or waiting per source IP; guests on the bar's Wi-Fi share one address
+CHAT_MAX_STREAMS_PER_IP = int(os.environ.get("CHAT_MAX_STREAMS_PER_IP", "8"))
+CHAT_QUEUE_MAX_WAITING = int(os.environ.get("CHAT_QUEUE_MAX_WAITING", "32"))
+CHAT_QUEUE_WAIT_SECONDS = float(os.environ.get("CHAT_QUEUE_WAIT_SECONDS", "5"))
+CHAT_RETRY_AFTER_SECONDS = 2
+# DynamoDB table holding the per-actor and per-IP counts of all environments; empty
+# counts this process only. A lease outlives the function timeout, then stops counting
+CHAT_STREAM_LEASES_TABLE = os.environ.get("CHAT_STREAM_LEASES_TABLE", "")
+CHAT_STREAM_LEASE_SECONDS = int(os.environ.get("CHAT_STREAM_LEASE_SECONDS", "150"))
+
+METRICS_NAMESPACE = os.environ.get("POWERTOOLS_METRICS_NAMESPACE", "ai-bartender")
+METRICS_SERVICE = os.environ.get("POWERTOOLS_SERVICE_NAME", "chat-streaming")
+# CloudWatch unit per metric name; anything not listed is a Count
+METRIC_UNITS = {
+    "TurnLatency": "Milliseconds",
+    "TimeToFirstToken": "Milliseconds",
+    "MemoryLoadTime": "Milliseconds",
+    "ModelLatency": "Milliseconds",
+    "ToolLatency": "Milliseconds",
+    "OutputTokensPerSecond": "Count/Second",
+    "QueueWaitTime": "Milliseconds",
+}
+
 
 def _load_system_prompt() -> str:
     """Load the bartender system prompt from file."""
@@ -44,34 +140,500 @@ def _load_system_prompt() -> str:
         return "You are a friendly bartender. Help the guest find a drink. Use getDrinks to see the menu."
 
 
+def _load_summary_prompt() -> str:
+    """Load the prompt that folds older turns into the conversation summary."""
+    prompt_path = os.path.join(
+        os.path.dirname(__file__), "prompts", "conversation-summary-prompt.txt"
+    )
+    try:
+        with open(prompt_path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        print("Summary prompt file not found, using default")
+        return "Update the summary of this bar conversation with the new part. Reply with the summary only."
+
+
 SYSTEM_PROMPT = _load_system_prompt()
+SUMMARY_PROMPT = _load_summary_prompt()
+
+class MCPToolProvider(HookProvider):
+    """Process-wide MCP client and tool list.
+
+    All creation and refresh happens under one lock, so concurrent first requests
+    never create or enter two clients. If re-listing fails, the client is replaced
+    with a new connection. The tools belong to the client, so while no client is
+    connected there are none to serve.
+
+    Agents take the provider as a hook: Strands turns a failed tool call into an
+    error result, so only the AfterToolCallEvent sees that the gateway session is gone.
+    """
+
+    def __init__(self, gateway_url: str | None, ttl_seconds: int):
+        self._gateway_url = gateway_url
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._client = None
+        self._tools = None
+        self._expires_at = 0.0
+        self._retry_at = 0.0
+        self._reconnect = False
+        self.ready = False
+
+    @property
+    def healthy(self) -> bool:
+        return not self._gateway_url or (self._client is not None and self._tools is not None)
+
+    def start(self) -> None:
+        """Connect and list tools at startup. Failures leave the provider degraded, not down."""
+        with self._lock:
+            if self._gateway_url:
+                self._refresh()
+            self.ready = True
+        print(f"MCP tools ready: healthy={self.healthy}, count={len(self._tools or [])}")
+
+    def get_tools(self) -> list | None:
+        """Current tool list, refreshed (and reconnected) under the lock when the TTL has passed."""
+        if not self._gateway_url:
+            return None
+        now = time.monotonic()
+        if now < self._expires_at or now < self._retry_at:
+            return self._tools if self._client is not None else None
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._expires_at and now >= self._retry_at:
+                self._refresh()
+        return self._tools if self._client is not None else None
+
+    def call_tool(self, name: str, arguments: dict) -> dict:
+        """Call a gateway tool directly, outside an agent, on the shared session."""
+        client = self._client
+        if client is None:
+            raise MCPClientInitializationError("MCP client is not connected")
+        return client.call_tool_sync(tool_use_id=f"direct-{uuid.uuid4()}", name=name, arguments=arguments)
+
+    def invalidate(self) -> None:
+        """Mark the gateway session as dropped; the next request reconnects."""
+        self._reconnect = True
+        self._expires_at = self._retry_at = 0.0
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_client()
+
+    def register_hooks(self, registry: HookRegistry, **kwargs) -> None:
+        registry.add_callback(AfterToolCallEvent, self._on_after_tool_call)
+
+    def _on_after_tool_call(self, event: AfterToolCallEvent) -> None:
+        if event.exception is not None and _is_mcp_session_lost(event.exception):
+            print(f"MCP session lost during tool call: {event.exception}")
+            self.invalidate()
+
+    def _refresh(self) -> None:
+        # Re-list on the current session first; on failure reconnect once and retry
+        for reconnect in (self._reconnect or self._client is None, True):
+            try:
+                if reconnect:
+                    self._connect()
+                tools = self._client.list_tools_sync()
+            except Exception as e:
+                print(f"MCP tool refresh failed (reconnect={reconnect}): {e}")
+                if reconnect:
+                    break
+                continue
+            self._tools = tools
+            self._reconnect = False
+            self._expires_at = time.monotonic() + self._ttl_seconds
+            return
+        self._reconnect = True
+        self._retry_at = time.monotonic() + MCP_RETRY_BACKOFF_SECONDS
+
+    def _connect(self) -> None:
+        self._close_client()
+        client = MCPClient(
+            lambda: aws_iam_streamablehttp_client(self._gateway_url, AGENTCORE_SERVICE_NAME)
+        )
+        client.start()
+        self._client = client
+        print("MCP client connected")
 
-app = FastAPI()
+    def _close_client(self) -> None:
+        if self._client is not None:
+            try:
+                self._client.stop(None, None, None)
+            except Exception as e:
+                print(f"Failed to stop MCP client: {e}")
+            self._client = None
+        self._tools = None
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["POST", "OPTIONS"],
-    allow_headers=["Content-Type", "X-Api-Key", "x-api-key"],
+
+MCP_TOOLS = MCPToolProvider(GATEWAY_URL, MCP_TOOLS_TTL_SECONDS)
+
+
+class StreamLeases:
+    """Per-actor and per-IP stream counts shared by every chat-streaming environment.
+
+    Each limited key is an item whose leases map holds the expiry of every stream
+    counted against it. A lease is added by a conditional update that only succeeds
+    while the map is below the limit, so concurrent environments can't overshoot it.
+    A stream that never releases (crash, timeout) stops counting once its lease
+    expires: expired leases are pruned when they would cause a rejection, and the
+    table's TTL deletes idle items. Calls block, so run them in a thread.
+    """
+
+    # Expired leases removed per prune, which keeps the update expression small
+    PRUNE_BATCH = 20
+
+    def __init__(self, table_name: str, lease_seconds: int):
+        self.table_name = table_name
+        self.lease_seconds = lease_seconds
+        self._client = boto3.client("dynamodb", region_name=REGION)
+
+    def acquire(self, key: str, limit: int, lease: str) -> bool:
+        """Count a stream against key unless limit live leases are held. Returns False when
+        full. Fails open: if DynamoDB can't be reached the stream is not limited by key."""
+        try:
+            for _ in range(3):
+                now = int(time.time())
+                expiry = {"N": str(now + self.lease_seconds)}
+                try:
+                    self._client.update_item(
+                        TableName=self.table_name,
+                        Key={"pk": {"S": key}},
+                        UpdateExpression="SET leases.#lease = :expiry, expires_at = :expiry",
+                        ConditionExpression="size(leases) < :limit",
+                        ExpressionAttributeNames={"#lease": lease},
+                        ExpressionAttributeValues={":expiry": expiry, ":limit": {"N": str(limit)}},
+                        ReturnValuesOnConditionCheckFailure="ALL_OLD",
+                    )
+                    return True
+                except self._client.exceptions.ConditionalCheckFailedException as e:
+                    item = e.response.get("Item")
+                if not item or "leases" not in item:
+                    # First stream for this key; a concurrent first stream makes this fail and retry
+                    try:
+                        self._client.put_item(
+                            TableName=self.table_name,
+                            Item={"pk": {"S": key}, "leases": {"M": {lease: expiry}}, "expires_at": expiry},
+                            ConditionExpression="attribute_not_exists(leases)",
+                        )
+                        return True
+                    except self._client.exceptions.ConditionalCheckFailedException:
+                        continue
+                expired = {
+                    name: value for name, value in item["leases"]["M"].items() if int(value["N"]) <= now
+                }
+                if not expired:
+                    return False
+                self._prune(key, dict(list(expired.items())[:self.PRUNE_BATCH]))
+            return False
+        except (BotoCoreError, ClientError) as e:
+            print(f"Stream lease not acquired, admitting without the shared limit: key={key}, error={e}")
+            return True
+
+    def release(self, key: str, lease: str) -> None:
+        try:
+            self._client.update_item(
+                TableName=self.table_name,
+                Key={"pk": {"S": key}},
+                UpdateExpression="REMOVE leases.#lease",
+                ConditionExpression="attribute_exists(leases)",
+                ExpressionAttributeNames={"#lease": lease},
+            )
+        except self._client.exceptions.ConditionalCheckFailedException:
+            pass
+        except (BotoCoreError, ClientError) as e:
+            # The lease stops counting when it expires
+            print(f"Stream lease not released: key={key}, error={e}")
+
+    def _prune(self, key: str, expired: dict) -> None:
+        """Remove expired leases, unless another environment renewed or removed one meanwhile."""
+        names = {f"#l{i}": name for i, name in enumerate(expired)}
+        values = {f":v{i}": value for i, value in enumerate(expired.values())}
+        try:
+            self._client.update_item(
+                TableName=self.table_name,
+                Key={"pk": {"S": key}},
+                UpdateExpression="REMOVE " + ", ".join(f"leases.{name}" for name in names),
+                ConditionExpression=" AND ".join(f"leases.#l{i} = :v{i}" for i in range(len(names))),
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
+        except self._client.exceptions.ConditionalCheckFailedException:
+            pass
+
+
+@dataclass
+class Admission:
+    """A stream's slot; release() is idempotent, so both the stream and its cleanup task may call it."""
+    controller: "AdmissionController"
+    keys: tuple[str, ...]
+    wait_ms: float
+    queue_depth: int
+    # (key, lease id) pairs held in the shared StreamLeases
+    leases: tuple[tuple[str, str], ...] = ()
+    released: bool = False
+
+    async def release(self) -> None:
+        # Awaited before the response ends: Lambda may freeze the environment right after
+        if not self.released:
+            self.released = True
+            self.controller._release(self.keys)
+            await self.controller._return_leases(self.leases)
+
+
+class AdmissionController:
+    """Caps the /chat streams of this process so one busy guest can't starve the others.
+
+    At most max_streams run at once. Each actor has at most max_per_actor streams
+    running or waiting, and each source IP at most max_per_ip: actor and session ids
+    come from the request body, so the IP is the limit a client can't rotate. Requests
+    beyond max_streams wait for a slot in arrival order, at most max_waiting of them
+    and for at most wait_seconds. A request over a limit, arriving at a full queue or
+    waiting too long is rejected (429). A limit of 0 disables it. All state lives on
+    the event loop, so no lock is needed.
+
+    Lambda sends one request at a time to an execution environment, so in a deployed
+    function the process counts never exceed one stream: max_streams, max_waiting and
+    wait_seconds only act when the app serves several requests at once (run locally or
+    in a container). With leases set, the per-actor and per-IP limits are counted in the
+    shared StreamLeases instead, across all environments.
+    """
+
+    def __init__(
+        self, max_streams: int, max_per_actor: int, max_per_ip: int, max_waiting: int, wait_seconds: float,
+        leases: StreamLeases | None = None,
+    ):
+        self.max_per_actor = max_per_actor
+        self.max_per_ip = max_per_ip
+        self.max_waiting = max_waiting
+        self.wait_seconds = wait_seconds
+        self.leases = leases
+        self._slots = asyncio.Semaphore(max_streams) if max_streams else None
+        # Streams running or waiting per "actor:<id>" and "ip:<address>"
+        self._holders: dict[str, int] = {}
+        self.active = 0
+        self.waiting = 0
+        self.stats = {
+            "admitted": 0, "queued": 0, "actor_limit": 0, "ip_limit": 0, "queue_full": 0, "wait_timeout": 0
+        }
+
+    async def admit(self, actor: str, source_ip: str) -> tuple[Admission | None, str]:
+        """Wait for a slot for an actor's request from source_ip. Returns (admission,
+        "admitted" or "queued"), or (None, reason) when the request is rejected."""
+        queue_depth = self.waiting
+        keys = (f"actor:{actor}", f"ip:{source_ip}")
+        limits = [
+            (key, limit, reason)
+            for key, limit, reason in zip(keys, (self.max_per_actor, self.max_per_ip), ("actor_limit", "ip_limit"))
+            if limit
+        ]
+        if self.leases is None:
+            for key, limit, reason in limits:
+                if self._holders.get(key, 0) >= limit:
+                    return self._reject(reason)
+        full = self._slots is not None and self._slots.locked()
+        if full and self.max_waiting and self.waiting >= self.max_waiting:
+            return self._reject("queue_full")
+
+        leases = ()
+        if self.leases is not None and limits:
+            leases = tuple((key, uuid.uuid4().hex) for key, _, _ in limits)
+            granted = await asyncio.gather(*(
+                asyncio.to_thread(self.leases.acquire, key, limit, lease)
+                for (key, limit, _), (_, lease) in zip(limits, leases)
+            ))
+            if not all(granted):
+                await self._return_leases(tuple(held for held, ok in zip(leases, granted) if ok))
+                return self._reject(next(reason for (_, _, reason), ok in zip(limits, granted) if not ok))
+
+        for key in keys:
+            self._holders[key] = self._holders.get(key, 0) + 1
+        start = time.perf_counter()
+        if self._slots is not None and not full:
+            # A free slot is taken without suspending, so the next request sees it as taken
+            await self._slots.acquire()
+        elif self._slots is not None:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.wait_seconds or None)
+            except asyncio.TimeoutError:
+                self._leave(keys)
+                await self._return_leases(leases)
+                return self._reject("wait_timeout")
+            except BaseException:
+                # The request was cancelled while waiting
+                self._leave(keys)
+                await self._return_leases(leases)
+                raise
+            finally:
+                self.waiting -= 1
+
+        self.active += 1
+        outcome = "queued" if full else "admitted"
+        self.stats[outcome] += 1
+        wait_ms = (time.perf_counter() - start) * 1000
+        admission = Admission(controller=self, keys=keys, wait_ms=wait_ms, queue_depth=queue_depth, leases=leases)
+        return admission, outcome
+
+    def report(self) -> dict:
+        return {**self.stats, "active": self.active, "waiting": self.waiting}
+
+    def _reject(self, reason: str) -> tuple[None, str]:
+        self.stats[reason] += 1
+        return None, reason
+
+    def _release(self, keys: tuple[str, ...]) -> None:
+        self.active -= 1
+        if self._slots is not None:
+            self._slots.release()
+        self._leave(keys)
+
+    def _leave(self, keys: tuple[str, ...]) -> None:
+        for key in keys:
+            count = self._holders.pop(key) - 1
+            if count:
+                self._holders[key] = count
+
+    async def _return_leases(self, leases: tuple[tuple[str, str], ...]) -> None:
+        if leases:
+            await asyncio.gather(*(asyncio.to_thread(self.leases.release, key, lease) for key, lease in leases))
+
+
+ADMISSION = AdmissionController(
+    CHAT_MAX_STREAMS,
+    CHAT_MAX_STREAMS_PER_ACTOR,
+    CHAT_MAX_STREAMS_PER_IP,
+    CHAT_QUEUE_MAX_WAITING,
+    CHAT_QUEUE_WAIT_SECONDS,
+    StreamLeases(CHAT_STREAM_LEASES_TABLE, CHAT_STREAM_LEASE_SECONDS) if CHAT_STREAM_LEASES_TABLE else None,
+)
+
+
+def source_ip(request: Request) -> str:
+    """The client address API Gateway saw, from the request context Lambda Web Adapter
+    forwards. X-Forwarded-For isn't used: its first entries are whatever the client sent."""
+    try:
+        context = json.loads(request.headers.get("x-amzn-request-context") or "{}")
+        address = context["identity"]["sourceIp"]
+    except (ValueError, KeyError, TypeError):
+        # Run locally without the adapter: the peer is the client
+        address = request.client.host if request.client else None
+    return address or "unknown"
+
+
+def _is_mcp_session_lost(error: Exception) -> bool:
+    """True for the errors Strands raises once the gateway session behind a tool call is gone."""
+    return isinstance(error, MCPClientInitializationError) or (
+        isinstance(error, RuntimeError) and "MCP server was closed" in str(error)
+    )
+
+
+RESPONSE_CACHE = ResponseCache(
+    RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_SIMILARITY, MENU_VERSION_CHECK_SECONDS
+)
+BEDROCK_RUNTIME = (
+    boto3.client("bedrock-runtime", region_name=REGION)
+    if RESPONSE_CACHE_EMBEDDING_MODEL_ID or CONTEXT_WINDOW_TURNS
+    else None
 )
+SUMMARY_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="context-summary")
 
-_mcp_client = None
-_tools = None
 
+def is_menu_version_tool(tool) -> bool:
+    # Gateway tool names carry a target prefix ("<target>___getMenuVersion")
+    return tool.mcp_tool.name.split("___")[-1] == MENU_VERSION_TOOL_NAME
 
-def _get_mcp_client_and_tools() -> list | None:
-    """Get or create MCP client and tools (singleton pattern)."""
-    global _mcp_client, _tools
 
-    if _mcp_client is None and GATEWAY_URL:
-        _mcp_client = MCPClient(
-            lambda: aws_iam_streamablehttp_client(GATEWAY_URL, AGENTCORE_SERVICE_NAME)
+def fetch_menu_version() -> str | None:
+    """Version of the menu the MCP tools serve; None if the gateway doesn't offer getMenuVersion."""
+    tool = next((t for t in MCP_TOOLS.get_tools() or [] if is_menu_version_tool(t)), None)
+    if tool is None:
+        return None
+    result = MCP_TOOLS.call_tool(tool.mcp_tool.name, {})
+    if result["status"] != "success":
+        raise RuntimeError(f"{MENU_VERSION_TOOL_NAME} failed")
+    payload = "".join(block.get("text", "") for block in result["content"])
+    return json.loads(payload)["version"]
+
+
+def embed_message(text: str) -> list[float] | None:
+    """Normalized embedding of a message, or None if the embedding call fails."""
+    try:
+        result = BEDROCK_RUNTIME.invoke_model(
+            modelId=RESPONSE_CACHE_EMBEDDING_MODEL_ID,
+            body=json.dumps({"inputText": text, "dimensions": 256, "normalize": True}),
         )
-        _mcp_client.__enter__()
-        _tools = _mcp_client.list_tools_sync()
-        print(f"Cold start: MCP tools loaded, count={len(_tools)}")
+        return json.loads(result["body"].read())["embedding"]
+    except Exception as e:
+        print(f"Message embedding failed, matching exact text only: {e}")
+        return None
 
-    return _tools
+
+def lookup_cached_response(message: str) -> tuple[str | None, str, list[float] | None]:
+    """Response cache lookup for an opening message; match is "bypass" if the cache is
+    disabled or the menu version is unknown."""
+    if RESPONSE_CACHE.max_entries <= 0:
+        return None, "bypass", None
+    try:
+        if RESPONSE_CACHE.check_menu_version(fetch_menu_version) is None:
+            return None, "bypass", None
+    except Exception as e:
+        print(f"Menu version check failed, bypassing response cache: {e}")
+        return None, "bypass", None
+    return RESPONSE_CACHE.get(message, embed_message if RESPONSE_CACHE_EMBEDDING_MODEL_ID else None)
+
+
+def record_cached_turn(session_id: str, actor_id: str, message: str, answer: str) -> None:
+    """Write a cache-served exchange to AgentCore Memory so the conversation can continue from it."""
+    session_manager = _create_session_manager(session_id, actor_id)
+    if not session_manager:
+        return
+    try:
+        agent = Agent(model=_create_model(), system_prompt=SYSTEM_PROMPT, session_manager=session_manager)
+        for role, text in (("user", message), ("assistant", answer)):
+            turn = {"role": role, "content": [{"text": text}]}
+            agent.messages.append(turn)
+            session_manager.append_message(turn, agent)
+    finally:
+        session_manager.close()
+
+
+def emit_metrics(values: dict, **properties) -> None:
+    """Write metrics as a CloudWatch Embedded Metric Format log line.
+
+    properties (e.g. session_id) are logged alongside but are not dimensions.
+    """
+    print(json.dumps({
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [["service"]],
+                "Metrics": [{"Name": name, "Unit": METRIC_UNITS.get(name, "Count")} for name in values],
+            }],
+        },
+        "service": METRICS_SERVICE,
+        **properties,
+        **values,
+    }))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect to the MCP gateway before the first request is accepted."""
+    await asyncio.to_thread(MCP_TOOLS.start)
+    yield
+    await asyncio.to_thread(MCP_TOOLS.close)
+
+
+app = FastAPI(lifespan=lifespan)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["POST", "OPTIONS"],
+    allow_headers=["Content-Type", "X-Api-Key", "x-api-key"],
+)
 
 
 def _create_model() -> BedrockModel:
@@ -99,9 +661,169 @@ def _create_session_manager(session_id: str, actor_id: str) -> AgentCoreMemorySe
     )
 
 
+def _create_conversation_manager() -> ContextPolicy | None:
+    """The agent's context policy; None keeps Strands' default sliding window."""
+    if not CONTEXT_WINDOW_TURNS:
+        return None
+    summarize = functools.partial(
+        summarize_history, BEDROCK_RUNTIME, CONTEXT_SUMMARY_MODEL_ID, SUMMARY_PROMPT, CONTEXT_SUMMARY_MAX_TOKENS
+    )
+    return ContextPolicy(CONTEXT_WINDOW_TURNS, CONTEXT_TOKEN_BUDGET, summarize, SUMMARY_EXECUTOR)
+
+
+# Policies whose summary was still being written after the done frame, by (session_id, actor_id)
+PENDING_SUMMARIES: OrderedDict[tuple[str, str], ContextPolicy] = OrderedDict()
+
+
+def park_summary(session_id: str, actor_id: str, agent: Agent) -> bool:
+    """After the done frame: take up a summary that has already finished and return True
+    if the session should be synced. One still being written is kept for the session's
+    next request on this container (see adopt_summary) instead of holding the stream open."""
+    policy = agent.conversation_manager
+    if not isinstance(policy, ContextPolicy):
+        return False
+    if policy.take_finished_summary(agent):
+        return True
+    if policy.summary_pending:
+        PENDING_SUMMARIES[(session_id, actor_id)] = policy
+        PENDING_SUMMARIES.move_to_end((session_id, actor_id))
+        while len(PENDING_SUMMARIES) > CONTEXT_PENDING_SUMMARIES:
+            PENDING_SUMMARIES.popitem(last=False)
+    return False
+
+
+def adopt_summary(session_id: str, actor_id: str, agent: Agent) -> None:
+    """Hand a summary the session's previous request left running to its new agent, which
+    takes it up at the start of the turn, as chat-sync's pooled agents do."""
+    previous = PENDING_SUMMARIES.pop((session_id, actor_id), None)
+    policy = agent.conversation_manager
+    if previous is not None and isinstance(policy, ContextPolicy) and policy.adopt(previous):
+        print(f"Took over a pending conversation summary: session_id={session_id}")
+
+
+def _sse_frame(data: str, event: str | None = None) -> str:
+    """One SSE frame. Newlines in data become extra data: lines, which the client rejoins."""
+    lines = data.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    frame = "".join(f"data: {line}\n" for line in lines)
+    return f"event: {event}\n{frame}\n" if event else f"{frame}\n"
+
+
+def _compact_json(payload: dict) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def chunk_frame(text: str, stream_format: str) -> str:
+    if stream_format == "compact":
+        return _sse_frame(text)
+    return _sse_frame(_compact_json({"chunk": text}))
+
+
+def normalize_newlines(text: str) -> str:
+    """The text as the client reassembles it: _sse_frame turns \r\n and \r into \n."""
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def utf16_length(text: str) -> int:
+    """Length of text as JavaScript counts it (UTF-16 code units), so the client can compare
+    the done frame's chars with the reply it reassembled, emoji included."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def done_frame(session_id: str, chars: int, stream_format: str) -> str:
+    payload = {"sessionId": session_id, "chars": chars}
+    if stream_format == "compact":
+        return _sse_frame(_compact_json(payload), event="done")
+    return _sse_frame(_compact_json({"done": True, **payload}))
+
+
+def error_frame(error: str, session_id: str, stream_format: str) -> str:
+    payload = {"error": error, "sessionId": session_id}
+    if stream_format == "compact":
+        return _sse_frame(_compact_json(payload), event="error")
+    return _sse_frame(_compact_json(payload))
+
+
+async def coalesce_text(events, window_ms: int, max_chars: int):
+    """Yield the agent's text deltas batched per time window or size, whichever comes first.
+
+    The first delta is yielded straight away, so coalescing never delays the first
+    token. Text is yielded with line endings normalized (see normalize_newlines); a
+    \r at the end of a delta waits for the next one in case it starts with \n.
+
+    The agent stream is drained by one producer task through a one-slot queue, so
+    the window can close while the model is still thinking (or a tool is running)
+    without cancelling the stream. A single task also keeps the stream's tracing
+    context intact: Strands attaches and detaches it across events.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=1)
+    end = object()
+
+    async def produce():
+        pending = ""
+        try:
+            async for event in events:
+                text = event.get("data") if isinstance(event, dict) else None
+                if not text:
+                    continue
+                text = pending + text
+                pending = "\r" if text.endswith("\r") else ""
+                text = normalize_newlines(text[:-1] if pending else text)
+                if text:
+                    await queue.put(text)
+        except Exception as e:
+            await queue.put(e)
+            return
+        if pending:
+            await queue.put("\n")
+        await queue.put(end)
+
+    producer = asyncio.create_task(produce())
+    parts, size, deadline = [], 0, None
+    first = True
+    try:
+        while True:
+            if deadline is None:
+                item = await queue.get()
+            else:
+                try:
+                    item = await asyncio.wait_for(queue.get(), max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    yield "".join(parts)
+                    parts, size, deadline = [], 0, None
+                    continue
+
+            if item is end:
+                break
+            if isinstance(item, Exception):
+                # Text the model produced before the error still reaches the client
+                if parts:
+                    yield "".join(parts)
+                raise item
+
+            if first:
+                first = False
+                yield item
+                continue
+
+            parts.append(item)
+            size += len(item)
+            if deadline is None:
+                deadline = loop.time() + window_ms / 1000
+            if size >= max_chars:
+                yield "".join(parts)
+                parts, size, deadline = [], 0, None
+
+        if parts:
+            yield "".join(parts)
+    finally:
+        producer.cancel()
+
+
 @app.post("/chat")
 async def chat(request: Request):
     """Streaming chat endpoint."""
+    received = time.perf_counter()
     try:
         body = await request.json()
     except Exception:
@@ -117,44 +839,132 @@ async def chat(request: Request):
             content={"error": "Message is required"},
         )
 
+    stream_format = body.get("stream_format") or "json"
+    if stream_format not in STREAM_FORMATS:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"stream_format must be one of: {', '.join(STREAM_FORMATS)}"},
+        )
+
+    # Only a conversation's opening message is independent of history
+    new_conversation = not body.get("session_id")
     session_id = body.get("session_id") or str(uuid.uuid4())
     actor_id = body.get("actor_id") or "anonymous"
 
     print(f"Processing message: session_id={session_id}, actor_id={actor_id}, message_length={len(message)}")
 
+    # Anonymous guests all share one actor_id, so they are limited per session instead;
+    # the source IP limit covers guests who start a new session for every request
+    admission, outcome = await ADMISSION.admit(
+        session_id if actor_id == "anonymous" else actor_id, source_ip(request)
+    )
+    if admission is None:
+        emit_metrics({"AdmissionRejected": 1, "QueueDepth": ADMISSION.waiting}, reason=outcome)
+        print(f"Chat request rejected: session_id={session_id}, reason={outcome}, admission={json.dumps(ADMISSION.report())}")
+        return JSONResponse(
+            status_code=429,
+            content={"error": "The bartender is busy, please try again in a moment"},
+            headers={"Retry-After": str(CHAT_RETRY_AFTER_SECONDS)},
+        )
+    emit_metrics({
+        "QueueDepth": admission.queue_depth,
+        "QueueWaitTime": round(admission.wait_ms, 1),
+        "ActiveStreams": ADMISSION.active,
+    })
+
     async def stream_response():
         """Generator that yields SSE chunks."""
         try:
-            tools = _get_mcp_client_and_tools()
+            cached, cache_match, vector = (
+                await asyncio.to_thread(lookup_cached_response, message)
+                if new_conversation
+                else (None, "bypass", None)
+            )
+            if cache_match != "bypass":
+                emit_metrics({"ResponseCacheHits" if cached is not None else "ResponseCacheMisses": 1})
+
+            if cached is not None:
+                cached = normalize_newlines(cached)
+                for start in range(0, len(cached), SSE_COALESCE_CHARS):
+                    yield chunk_frame(cached[start:start + SSE_COALESCE_CHARS], stream_format)
+                yield done_frame(session_id, utf16_length(cached), stream_format)
+                print(
+                    f"Chat response served from cache: session_id={session_id}, match={cache_match}, "
+                    f"response_length={len(cached)}, cache={json.dumps(RESPONSE_CACHE.report())}"
+                )
+                try:
+                    await asyncio.to_thread(record_cached_turn, session_id, actor_id, message, cached)
+                except Exception as e:
+                    print(f"Failed to record cached turn in memory: session_id={session_id}, error={e}")
+                return
+
+            tools = await asyncio.to_thread(MCP_TOOLS.get_tools)
             model = _create_model()
+            start = time.perf_counter()
             session_manager = _create_session_manager(session_id, actor_id)
 
             agent_kwargs = {
                 "model": model,
                 "system_prompt": SYSTEM_PROMPT,
+                "conversation_manager": _create_conversation_manager(),
             }
             if tools:
-                agent_kwargs["tools"] = tools
+                agent_kwargs["tools"] = [t for t in tools if not is_menu_version_tool(t)]
+                agent_kwargs["hooks"] = [MCP_TOOLS]
             if session_manager:
                 agent_kwargs["session_manager"] = session_manager
 
             agent = Agent(**agent_kwargs)
-
-            full_response = ""
-            async for event in agent.stream_async(message):
-                if isinstance(event, dict) and event.get("data"):
-                    chunk = event["data"]
-                    full_response += chunk
-                    yield f"data: {json.dumps({'chunk': chunk, 'sessionId': session_id})}\n\n"
-
-            yield f"data: {json.dumps({'done': True, 'sessionId': session_id, 'response': full_response})}\n\n"
-
-            print(f"Chat response streamed: session_id={session_id}, response_length={len(full_response)}")
+            if session_manager:
+                adopt_summary(session_id, actor_id, agent)
+            memory_load_ms = (time.perf_counter() - start) * 1000
+            before = usage_snapshot(agent)
+
+            chars = frames = 0
+            first_token_ms = None
+            # The full reply is only kept when it is going into the response cache
+            parts = [] if cache_match == "miss" else None
+            async for text in coalesce_text(agent.stream_async(message), SSE_COALESCE_MS, SSE_COALESCE_CHARS):
+                chars += utf16_length(text)
+                frames += 1
+                if parts is not None:
+                    parts.append(text)
+                if first_token_ms is None:
+                    first_token_ms = (time.perf_counter() - received) * 1000
+                yield chunk_frame(text, stream_format)
+
+            yield done_frame(session_id, chars, stream_format)
+            turn = {
+                "TurnLatency": round((time.perf_counter() - received) * 1000, 1),
+                "MemoryLoadTime": round(memory_load_ms, 1),
+                **turn_metrics(before, usage_snapshot(agent)),
+            }
+            if first_token_ms is not None:
+                turn["TimeToFirstToken"] = round(first_token_ms, 1)
+            if isinstance(agent.conversation_manager, ContextPolicy):
+                turn.update(agent.conversation_manager.turn_prompt)
+            emit_metrics(turn, session_id=session_id)
+            if parts:
+                RESPONSE_CACHE.put(message, "".join(parts).strip(), vector)
+
+            print(f"Chat response streamed: session_id={session_id}, response_length={chars}, frames={frames}")
+            if session_manager and park_summary(session_id, actor_id, agent):
+                # The reply is complete; saving the summary doesn't need a stream slot
+                await admission.release()
+                try:
+                    await asyncio.to_thread(session_manager.sync_agent, agent)
+                except Exception as e:
+                    print(f"Failed to save conversation summary: session_id={session_id}, error={e}")
 
         except Exception as e:
             print(f"Error streaming response: {e}")
-            yield f"data: {json.dumps({'error': str(e), 'sessionId': session_id})}\n\n"
+            if _is_mcp_session_lost(e):
+                MCP_TOOLS.invalidate()
+            yield error_frame(str(e), session_id, stream_format)
+        finally:
+            await admission.release()
 
+    # The background task releases the slot if the client left before the stream started
     return StreamingResponse(
         stream_response(),
         media_type="text/event-stream",
@@ -163,13 +973,20 @@ async def chat(request: Request):
             "Connection": "keep-alive",
             "X-Session-Id": session_id,
         },
+        background=BackgroundTask(admission.release),
     )
 
 
 @app.get("/health")
 async def health():
-    """Health check endpoint."""
-    return {"status": "healthy"}
+    """Readiness check for Lambda Web Adapter: 503 until startup has finished.
+
+    A gateway that is down at startup reports "degraded" rather than failing the
+    readiness check, so chat still works without tools and reconnects later.
+    """
+    if not MCP_TOOLS.ready:
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "healthy" if MCP_TOOLS.healthy else "degraded", "mcp_ready": MCP_TOOLS.healthy}
 
 
 if __name__ == "__main__":
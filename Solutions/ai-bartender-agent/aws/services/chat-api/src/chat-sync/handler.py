@@ -2,13 +2,26 @@
 
 Uses Strands Agents with AgentCore Memory and MCP tools via AgentCore Gateway.
 MCP client, tools, model, and system prompt are initialized at cold start.
+Agents are pooled per (session_id, actor_id) so follow-up messages on a warm
+container skip reloading the conversation from AgentCore Memory.
+Answers to the opening message of a conversation are cached per menu version.
+Only the last turns are sent verbatim; older turns are folded into a running
+summary in the background (see context_policy).
+Every model turn emits EMF metrics for memory load, model, tool and token usage.
 """
 
+import functools
 import json
 import os
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
-from aws_lambda_powertools import Logger, Tracer
+import boto3
+from aws_lambda_powertools import Logger, Metrics, Tracer
+from aws_lambda_powertools.metrics import MetricUnit
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
 from strands import Agent
@@ -20,13 +33,56 @@ from bedrock_agentcore.memory.integrations.strands.session_manager import (
     AgentCoreMemorySessionManager,
 )
 
+from chat_common import ResponseCache, summarize_history, turn_metrics, usage_snapshot
+from context_policy import ContextPolicy
+
 tracer = Tracer()
 logger = Logger()
+metrics = Metrics()
 
 MEMORY_ID = os.environ.get("AGENTCORE_MEMORY_ID")
 GATEWAY_URL = os.environ.get("AGENTCORE_GATEWAY_URL")
 REGION = os.environ.get("AWS_REGION", "eu-west-1")
 
+AGENT_POOL_MAX_AGENTS = int(os.environ.get("AGENT_POOL_MAX_AGENTS", "20"))
+AGENT_POOL_IDLE_SECONDS = int(os.environ.get("AGENT_POOL_IDLE_SECONDS", "900"))
+# Memory cap: total conversation messages held by all pooled agents
+AGENT_POOL_MAX_MESSAGES = int(os.environ.get("AGENT_POOL_MAX_MESSAGES", "1000"))
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "200"))
+RESPONSE_CACHE_TTL_SECONDS = int(os.environ.get("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+# Minimum cosine similarity for serving the answer to a differently worded question
+RESPONSE_CACHE_SIMILARITY = float(os.environ.get("RESPONSE_CACHE_SIMILARITY", "0.92"))
+# Bedrock embedding model for similarity matching; empty matches normalized text only
+RESPONSE_CACHE_EMBEDDING_MODEL_ID = os.environ.get("RESPONSE_CACHE_EMBEDDING_MODEL_ID", "")
+# How often the menu version (getMenuVersion tool) is re-read
+MENU_VERSION_CHECK_SECONDS = int(os.environ.get("MENU_VERSION_CHECK_SECONDS", "60"))
+# Gateway tool the response cache reads the menu version from; it is not given to the agent
+MENU_VERSION_TOOL_NAME = "getMenuVersion"
+
+# Guest turns sent verbatim; older ones are summarized. 0 keeps the whole history
+CONTEXT_WINDOW_TURNS = int(os.environ.get("CONTEXT_WINDOW_TURNS", "6"))
+# Maximum estimated tokens of history (summary included) carried into a turn
+CONTEXT_TOKEN_BUDGET = int(os.environ.get("CONTEXT_TOKEN_BUDGET", "4000"))
+CONTEXT_SUMMARY_MODEL_ID = os.environ.get("CONTEXT_SUMMARY_MODEL_ID", "global.amazon.nova-2-lite-v1:0")
+CONTEXT_SUMMARY_MAX_TOKENS = 300
+
+# Per-turn metrics (see turn_metrics); the model is not streamed here, so there is no time to first token
+TURN_METRIC_UNITS = {
+    "TurnLatency": MetricUnit.Milliseconds,
+    "MemoryLoadTime": MetricUnit.Milliseconds,
+    "ModelLatency": MetricUnit.Milliseconds,
+    "ModelCalls": MetricUnit.Count,
+    "ToolRoundTrips": MetricUnit.Count,
+    "ToolLatency": MetricUnit.Milliseconds,
+    "InputTokens": MetricUnit.Count,
+    "OutputTokens": MetricUnit.Count,
+    "OutputTokensPerSecond": MetricUnit.CountPerSecond,
+    "PromptMessages": MetricUnit.Count,
+    "PromptTokens": MetricUnit.Count,
+    "SummaryTokens": MetricUnit.Count,
+}
+
 
 def _load_system_prompt() -> str:
     """Load the bartender system prompt from file."""
@@ -51,7 +107,21 @@ def _create_bedrock_model() -> BedrockModel:
     )
 
 
+def _load_summary_prompt() -> str:
+    """Load the prompt that folds older turns into the conversation summary."""
+    prompt_path = os.path.join(
+        os.path.dirname(__file__), "prompts", "conversation-summary-prompt.txt"
+    )
+    try:
+        with open(prompt_path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        logger.warning("Summary prompt file not found, using default")
+        return "Update the summary of this bar conversation with the new part. Reply with the summary only."
+
+
 SYSTEM_PROMPT = _load_system_prompt()
+SUMMARY_PROMPT = _load_summary_prompt()
 BEDROCK_MODEL = _create_bedrock_model()
 
 def _create_mcp_client() -> MCPClient:
@@ -68,6 +138,18 @@ MCP_CLIENT = _create_mcp_client()
 MCP_CLIENT.__enter__()
 TOOLS = MCP_CLIENT.list_tools_sync()
 logger.info("Cold start: MCP tools loaded", extra={"tool_count": len(TOOLS)})
+# AgentCore data plane client for the pool's version check (see latest_event_id)
+AGENTCORE_CLIENT = boto3.client("bedrock-agentcore", region_name=REGION)
+# Gateway tool names carry a target prefix ("<target>___getMenuVersion")
+MENU_VERSION_TOOL = next((t for t in TOOLS if t.mcp_tool.name.split("___")[-1] == MENU_VERSION_TOOL_NAME), None)
+AGENT_TOOLS = [t for t in TOOLS if t is not MENU_VERSION_TOOL]
+BEDROCK_RUNTIME = (
+    boto3.client("bedrock-runtime", region_name=REGION)
+    if RESPONSE_CACHE_EMBEDDING_MODEL_ID or CONTEXT_WINDOW_TURNS
+    else None
+)
+# Summaries are written in the background; a frozen container resumes them on its next request
+SUMMARY_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="context-summary")
 
 
 def response(status_code: int, body: dict) -> dict:
@@ -84,8 +166,38 @@ def response(status_code: int, body: dict) -> dict:
     }
 
 
+class PoolSessionManager(AgentCoreMemorySessionManager):
+    """Session manager that remembers the id of the newest event it wrote.
+
+    Message events are tracked through create_message, whose return value is the
+    created event. Writes that come back without an id, such as the agent state
+    events create_agent writes when the agent is created or synced, only mark the
+    newest event as unknown and the pool looks it up instead.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_event_id: str | None = None
+        self.untracked_write = False
+
+    def create_message(self, *args, **kwargs):
+        event = super().create_message(*args, **kwargs)
+        # Blob-sized messages return the raw CreateEvent response ({"event": {...}}),
+        # buffered ones an empty dict
+        event_id = (event or {}).get("eventId") or (event or {}).get("event", {}).get("eventId")
+        if event_id:
+            self.last_event_id = event_id
+        else:
+            self.untracked_write = True
+        return event
+
+    def create_agent(self, *args, **kwargs) -> None:
+        super().create_agent(*args, **kwargs)
+        self.untracked_write = True
+
+
 @tracer.capture_method
-def create_session_manager(session_id: str, actor_id: str) -> AgentCoreMemorySessionManager:
+def create_session_manager(session_id: str, actor_id: str) -> PoolSessionManager:
     """Create AgentCore Memory session manager for this request."""
     if not MEMORY_ID:
         raise ValueError("AGENTCORE_MEMORY_ID environment variable not set")
@@ -96,12 +208,22 @@ def create_session_manager(session_id: str, actor_id: str) -> AgentCoreMemorySes
         actor_id=actor_id,
     )
 
-    return AgentCoreMemorySessionManager(
+    return PoolSessionManager(
         agentcore_memory_config=config,
         region_name=REGION,
     )
 
 
+def create_conversation_manager() -> ContextPolicy | None:
+    """The agent's context policy; None keeps Strands' default sliding window."""
+    if not CONTEXT_WINDOW_TURNS:
+        return None
+    summarize = functools.partial(
+        summarize_history, BEDROCK_RUNTIME, CONTEXT_SUMMARY_MODEL_ID, SUMMARY_PROMPT, CONTEXT_SUMMARY_MAX_TOKENS
+    )
+    return ContextPolicy(CONTEXT_WINDOW_TURNS, CONTEXT_TOKEN_BUDGET, summarize, SUMMARY_EXECUTOR)
+
+
 @tracer.capture_method
 def create_agent(session_manager: AgentCoreMemorySessionManager) -> Agent:
     """Create the Strands bartender agent with pre-initialized model/tools and per-request session."""
@@ -109,24 +231,220 @@ def create_agent(session_manager: AgentCoreMemorySessionManager) -> Agent:
         model=BEDROCK_MODEL,
         system_prompt=SYSTEM_PROMPT,
         session_manager=session_manager,
-        tools=TOOLS,
+        tools=AGENT_TOOLS,
+        conversation_manager=create_conversation_manager(),
+    )
+
+
+def latest_event_id(session_id: str, actor_id: str) -> str | None:
+    """Id of the newest event in the session (ListEvents returns newest first).
+
+    Calls the API directly: MemoryClient.list_events always asks for pages of 100 events.
+    """
+    result = AGENTCORE_CLIENT.list_events(
+        memoryId=MEMORY_ID,
+        actorId=actor_id,
+        sessionId=session_id,
+        maxResults=1,
+        includePayloads=False,
+    )
+    events = result.get("events", [])
+    return events[0]["eventId"] if events else None
+
+
+@dataclass
+class PooledAgent:
+    agent: Agent
+    session_manager: PoolSessionManager
+    last_event_id: str | None = None
+    last_used: float = 0.0
+
+
+class AgentPool:
+    """LRU pool of live agents keyed by (session_id, actor_id).
+
+    A pooled agent is only reused if the newest event in AgentCore Memory is still
+    the one it wrote last. If the session continued on another container, the
+    agent's history is stale and a fresh agent is built from memory instead.
+    Lambda runs one request per container at a time, so no locking is needed.
+    """
+
+    def __init__(self, max_agents: int, idle_seconds: int, max_messages: int):
+        self.max_agents = max_agents
+        self.idle_seconds = idle_seconds
+        self.max_messages = max_messages
+        self._entries: OrderedDict[tuple[str, str], PooledAgent] = OrderedDict()
+        self._build_ms = None  # moving average of building a fresh agent
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0, "saved_ms": 0.0}
+
+    def acquire(self, session_id: str, actor_id: str) -> tuple[PooledAgent, bool]:
+        """Check out an agent for the session. Returns (entry, reused)."""
+        self._evict_idle()
+        entry = self._entries.pop((session_id, actor_id), None)
+
+        if entry is not None:
+            start = time.perf_counter()
+            try:
+                current = latest_event_id(session_id, actor_id)
+            except Exception:
+                logger.warning("Agent pool version check failed", extra={"session_id": session_id})
+                current = None
+            check_ms = (time.perf_counter() - start) * 1000
+
+            if current is not None and current == entry.last_event_id:
+                self.stats["hits"] += 1
+                self.stats["saved_ms"] += max((self._build_ms or 0) - check_ms, 0)
+                return entry, True
+            self.stats["stale"] += 1
+            self._close(entry)
+
+        self.stats["misses"] += 1
+        start = time.perf_counter()
+        session_manager = create_session_manager(session_id, actor_id)
+        entry = PooledAgent(agent=create_agent(session_manager), session_manager=session_manager)
+        build_ms = (time.perf_counter() - start) * 1000
+        self._build_ms = build_ms if self._build_ms is None else 0.8 * self._build_ms + 0.2 * build_ms
+        return entry, False
+
+    def release(self, session_id: str, actor_id: str, entry: PooledAgent) -> None:
+        """Return an agent after a successful turn, remembering the session's newest event."""
+        session_manager = entry.session_manager
+        if session_manager.untracked_write:
+            try:
+                session_manager.last_event_id = latest_event_id(session_id, actor_id)
+            except Exception:
+                logger.warning("Agent pool version check failed, not pooling", extra={"session_id": session_id})
+                self._close(entry)
+                return
+            session_manager.untracked_write = False
+        entry.last_event_id = session_manager.last_event_id
+        if entry.last_event_id is None:
+            self._close(entry)
+            return
+
+        entry.last_used = time.monotonic()
+        self._entries[(session_id, actor_id)] = entry
+        while len(self._entries) > self.max_agents or (
+            len(self._entries) > 1 and self._message_count() > self.max_messages
+        ):
+            self._evict(next(iter(self._entries)))
+
+    def discard(self, entry: PooledAgent) -> None:
+        """Drop an agent whose turn failed; its in-memory state may be half-updated."""
+        self._close(entry)
+
+    def report(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "saved_ms": round(self.stats["saved_ms"]),
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            "size": len(self._entries),
+            "messages": self._message_count(),
+        }
+
+    def _message_count(self) -> int:
+        return sum(len(entry.agent.messages) for entry in self._entries.values())
+
+    def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_seconds
+        for key in [key for key, entry in self._entries.items() if entry.last_used < cutoff]:
+            self._evict(key)
+
+    def _evict(self, key: tuple[str, str]) -> None:
+        self.stats["evictions"] += 1
+        self._close(self._entries.pop(key))
+
+    @staticmethod
+    def _close(entry: PooledAgent) -> None:
+        try:
+            entry.session_manager.close()
+        except Exception:
+            logger.warning("Failed to close pooled session manager")
+
+
+AGENT_POOL = AgentPool(AGENT_POOL_MAX_AGENTS, AGENT_POOL_IDLE_SECONDS, AGENT_POOL_MAX_MESSAGES)
+
+
+RESPONSE_CACHE = ResponseCache(
+    RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_SIMILARITY, MENU_VERSION_CHECK_SECONDS
+)
+
+
+@tracer.capture_method
+def fetch_menu_version() -> str | None:
+    """Version of the menu the MCP tools serve; None if the gateway doesn't offer getMenuVersion."""
+    if MENU_VERSION_TOOL is None:
+        return None
+    result = MCP_CLIENT.call_tool_sync(
+        tool_use_id=f"menu-version-{uuid.uuid4()}", name=MENU_VERSION_TOOL.mcp_tool.name, arguments={}
     )
+    if result["status"] != "success":
+        raise RuntimeError(f"{MENU_VERSION_TOOL_NAME} failed")
+    payload = "".join(block.get("text", "") for block in result["content"])
+    return json.loads(payload)["version"]
+
+
+@tracer.capture_method
+def embed_message(text: str) -> list[float] | None:
+    """Normalized embedding of a message, or None if the embedding call fails."""
+    try:
+        result = BEDROCK_RUNTIME.invoke_model(
+            modelId=RESPONSE_CACHE_EMBEDDING_MODEL_ID,
+            body=json.dumps({"inputText": text, "dimensions": 256, "normalize": True}),
+        )
+        return json.loads(result["body"].read())["embedding"]
+    except Exception:
+        logger.warning("Message embedding failed, matching exact text only", exc_info=True)
+        return None
+
+
+def lookup_cached_response(message: str) -> tuple[str | None, str, list[float] | None]:
+    """Response cache lookup for an opening message; match is "bypass" if the cache is
+    disabled or the menu version is unknown."""
+    if RESPONSE_CACHE.max_entries <= 0:
+        return None, "bypass", None
+    try:
+        if RESPONSE_CACHE.check_menu_version(fetch_menu_version) is None:
+            return None, "bypass", None
+    except Exception:
+        logger.warning("Menu version check failed, bypassing response cache", exc_info=True)
+        return None, "bypass", None
+    return RESPONSE_CACHE.get(message, embed_message if RESPONSE_CACHE_EMBEDDING_MODEL_ID else None)
+
+
+@tracer.capture_method
+def record_cached_turn(session_id: str, actor_id: str, message: str, answer: str) -> None:
+    """Write a cache-served exchange to AgentCore Memory so the conversation can continue from it.
+
+    The session is written through its own session manager, not the agent pool: a cache
+    hit builds no agent, so it doesn't count towards the pool's hits, misses or build time.
+    """
+    session_manager = create_session_manager(session_id, actor_id)
+    try:
+        agent = Agent(model=BEDROCK_MODEL, system_prompt=SYSTEM_PROMPT, session_manager=session_manager)
+        for role, text in (("user", message), ("assistant", answer)):
+            turn = {"role": role, "content": [{"text": text}]}
+            agent.messages.append(turn)
+            session_manager.append_message(turn, agent)
+    finally:
+        session_manager.close()
 
 
 @tracer.capture_method
 def process_message(agent: Agent, message: str) -> str:
     """Process a user message through the agent and return the response text."""
     result = agent(message)
-
-    if hasattr(result, "message"):
-        return str(result.message)
-    return str(result)
+    # AgentResult renders its text blocks; result.message is the raw message dict
+    return str(result).strip()
 
 
+@metrics.log_metrics
 @logger.inject_lambda_context
 @tracer.capture_lambda_handler
 def handler(event: dict, context: LambdaContext) -> dict:
     """Lambda handler for POST /chat/message."""
+    received = time.perf_counter()
     try:
         body = json.loads(event.get("body", "{}"))
 
@@ -134,6 +452,8 @@ def handler(event: dict, context: LambdaContext) -> dict:
         if not message:
             return response(400, {"error": "Message is required"})
 
+        # Only a conversation's opening message is independent of history
+        new_conversation = not body.get("session_id")
         session_id = body.get("session_id") or str(uuid.uuid4())
         actor_id = body.get("actor_id") or "anonymous"
 
@@ -146,15 +466,60 @@ def handler(event: dict, context: LambdaContext) -> dict:
             },
         )
 
-        session_manager = create_session_manager(session_id, actor_id)
-        agent = create_agent(session_manager)
-        agent_response = process_message(agent, message)
+        cached, cache_match, vector = (
+            lookup_cached_response(message) if new_conversation else (None, "bypass", None)
+        )
+        reused = False
+        turn = None
+        if cached is not None:
+            agent_response = cached
+            try:
+                record_cached_turn(session_id, actor_id, message, cached)
+            except Exception:
+                logger.warning("Failed to record cached turn in memory", extra={"session_id": session_id})
+        else:
+            start = time.perf_counter()
+            entry, reused = AGENT_POOL.acquire(session_id, actor_id)
+            memory_load_ms = (time.perf_counter() - start) * 1000
+            before = usage_snapshot(entry.agent)
+            try:
+                agent_response = process_message(entry.agent, message)
+            except Exception:
+                AGENT_POOL.discard(entry)
+                raise
+            after = usage_snapshot(entry.agent)
+            AGENT_POOL.release(session_id, actor_id, entry)
+            turn = {
+                "TurnLatency": round((time.perf_counter() - received) * 1000, 1),
+                "MemoryLoadTime": round(memory_load_ms, 1),
+                **turn_metrics(before, after),
+            }
+            if isinstance(entry.agent.conversation_manager, ContextPolicy):
+                turn.update(entry.agent.conversation_manager.turn_prompt)
+            if cache_match == "miss" and agent_response:
+                RESPONSE_CACHE.put(message, agent_response, vector)
+
+        if cache_match != "bypass":
+            metrics.add_metric(
+                name="ResponseCacheHits" if cached is not None else "ResponseCacheMisses",
+                unit=MetricUnit.Count,
+                value=1,
+            )
+        if turn:
+            for name, value in turn.items():
+                metrics.add_metric(name=name, unit=TURN_METRIC_UNITS[name], value=value)
+            metrics.add_metadata(key="session_id", value=session_id)
 
         logger.info(
             "Chat response generated",
             extra={
                 "session_id": session_id,
                 "response_length": len(agent_response),
+                "response_cache": cache_match,
+                "response_cache_stats": RESPONSE_CACHE.report(),
+                "turn_metrics": turn,
+                "agent_reused": reused,
+                "agent_pool": AGENT_POOL.report(),
             },
         )
 
@@ -0,0 +1,178 @@
+"""Pieces shared by the chat-sync and chat-streaming functions.
+
+Each function's build copies this module (and context_policy) next to its handler,
+see src/Makefile. Nothing here reads the environment: the handlers pass in their
+settings and clients.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from strands import Agent
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_message(message: str) -> str:
+    """Case-, punctuation- and whitespace-insensitive form of a guest message."""
+    return " ".join(re.findall(r"\w+", message.casefold()))
+
+
+@dataclass
+class CachedResponse:
+    text: str
+    vector: list[float] | None
+    stored_at: float
+
+
+class ResponseCache:
+    """Answers to opening messages, keyed by normalized message and menu version.
+
+    Only the first message of a new conversation is cached, because later turns
+    depend on the history. The menu version comes from the MCP tools' getMenuVersion,
+    which moves whenever a drink or section changes, and the cache is emptied as soon
+    as it does. With an embedding function, an exact miss falls back to the most
+    similar cached question.
+    chat-streaming looks answers up from worker threads for concurrent streams, hence the lock.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, similarity: float, check_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity = similarity
+        self.check_seconds = check_seconds
+        self.menu_version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.stats = {"hits": 0, "similar_hits": 0, "misses": 0, "invalidations": 0}
+
+    def check_menu_version(self, fetch) -> str | None:
+        """Re-read the menu version at most every check_seconds; a new version empties the cache.
+
+        Returns None when the version is unknown, in which case the cache must not be used.
+        """
+        if self.menu_version is not None and time.monotonic() - self._checked_at < self.check_seconds:
+            return self.menu_version
+        # Fetched under the lock, so concurrent first requests read the version once
+        with self._lock:
+            if self.menu_version is not None and time.monotonic() - self._checked_at < self.check_seconds:
+                return self.menu_version
+            version = fetch()
+            if version != self.menu_version:
+                if self._entries:
+                    self.stats["invalidations"] += 1
+                self._entries.clear()
+                self.menu_version = version
+            self._checked_at = time.monotonic()
+        return version
+
+    def get(self, message: str, embed=None) -> tuple[str | None, str, list[float] | None]:
+        """Look up a cached answer. Returns (answer, match, vector).
+
+        match is "exact", "similar" or "miss"; vector is the message embedding (if
+        computed) to pass back to put() after a miss.
+        """
+        key = normalize_message(message)
+        with self._lock:
+            entry = self._live(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry.text, "exact", None
+
+        vector = embed(key) if embed else None
+        with self._lock:
+            if vector is not None:
+                best, score = None, self.similarity
+                for candidate in list(self._entries):
+                    entry = self._live(candidate)
+                    if entry is not None and entry.vector is not None:
+                        similarity = sum(a * b for a, b in zip(vector, entry.vector))
+                        if similarity >= score:
+                            best, score = entry, similarity
+                if best is not None:
+                    self.stats["hits"] += 1
+                    self.stats["similar_hits"] += 1
+                    return best.text, "similar", vector
+
+            self.stats["misses"] += 1
+            return None, "miss", vector
+
+    def put(self, message: str, text: str, vector: list[float] | None = None) -> None:
+        key = normalize_message(message)
+        with self._lock:
+            self._entries[key] = CachedResponse(text=text, vector=vector, stored_at=time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def report(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            "size": len(self._entries),
+            "menu_version": self.menu_version,
+        }
+
+    def _live(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry.stored_at >= self.ttl_seconds:
+            del self._entries[key]
+            return None
+        return entry
+
+
+def summarize_history(
+    bedrock_runtime, model_id: str, prompt: str, max_tokens: int, summary: str | None, transcript: str
+) -> str | None:
+    """Fold a transcript of older turns into the conversation summary. The handlers bind
+    everything up to summary with functools.partial and hand it to ContextPolicy."""
+    text = f"Summary so far:\n{summary}\n\n" if summary else ""
+    try:
+        result = bedrock_runtime.converse(
+            modelId=model_id,
+            system=[{"text": prompt}],
+            messages=[{"role": "user", "content": [{"text": f"{text}Conversation to add:\n{transcript}"}]}],
+            inferenceConfig={"maxTokens": max_tokens, "temperature": 0},
+        )
+    except Exception as e:
+        logger.warning(f"Conversation summary failed, keeping older turns verbatim: {e}")
+        return None
+    content = result["output"]["message"]["content"]
+    return "".join(block.get("text", "") for block in content).strip() or None
+
+
+def usage_snapshot(agent: Agent) -> dict:
+    """The agent's cumulative event loop counters. A turn's usage is the difference between
+    two snapshots, which also holds for pooled agents that keep counting across turns."""
+    loop_metrics = agent.event_loop_metrics
+    return {
+        "model_ms": loop_metrics.accumulated_metrics.get("latencyMs", 0),
+        "model_calls": loop_metrics.cycle_count,
+        "input_tokens": loop_metrics.accumulated_usage.get("inputTokens", 0),
+        "output_tokens": loop_metrics.accumulated_usage.get("outputTokens", 0),
+        "tool_calls": sum(tool.call_count for tool in loop_metrics.tool_metrics.values()),
+        "tool_seconds": sum(tool.total_time for tool in loop_metrics.tool_metrics.values()),
+    }
+
+
+def turn_metrics(before: dict, after: dict) -> dict:
+    """Per-turn model, tool and token metric values from two usage snapshots."""
+    delta = {key: after[key] - before[key] for key in after}
+    return {
+        "ModelLatency": delta["model_ms"],
+        "ModelCalls": delta["model_calls"],
+        "ToolRoundTrips": delta["tool_calls"],
+        "ToolLatency": round(delta["tool_seconds"] * 1000, 1),
+        "InputTokens": delta["input_tokens"],
+        "OutputTokens": delta["output_tokens"],
+        "OutputTokensPerSecond": (
+            round(delta["output_tokens"] / (delta["model_ms"] / 1000), 1) if delta["model_ms"] else 0
+        ),
+    }
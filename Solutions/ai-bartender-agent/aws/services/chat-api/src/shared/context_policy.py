@@ -0,0 +1,215 @@
+"""Context policy for the bartender agent: recent turns verbatim, older turns summarized.
+
+A turn starts at a guest message (a user message with text; tool results are user
+messages too), so cutting the history at a turn never separates a tool call from
+its result.
+
+The last ``window_turns`` turns are sent to the model verbatim. Turns that fall out
+of the window are folded into a running summary in a background thread. They stay
+in the history until the refreshed summary is ready and are then replaced by it,
+so nothing disappears while the summary is being written. ``token_budget`` caps the
+estimated size of the history carried into a turn: when it is exceeded the oldest
+turns are dropped straight away and folded into the next summary.
+
+The summary and the number of messages it replaces are part of the conversation
+manager state, which the session manager stores in AgentCore Memory, so a new
+container restores the summary and gives the model only the messages after it.
+The session manager still reads every event of the session to get there.
+"""
+
+import json
+from concurrent.futures import Executor, Future
+from typing import Any, Callable
+
+from strands.agent.conversation_manager import ConversationManager
+from strands.hooks import BeforeInvocationEvent, HookRegistry
+from strands.types.content import Message, Messages
+from strands.types.exceptions import ContextWindowOverflowException
+
+# Rough size estimate; English text averages about 4 characters per token
+CHARS_PER_TOKEN = 4
+SUMMARY_HEADING = "Summary of our conversation so far:"
+SUMMARY_ACK = "Thanks, I'll keep that in mind."
+
+
+def is_guest_message(message: Message) -> bool:
+    """True for a message that starts a turn."""
+    return message["role"] == "user" and any("text" in block for block in message["content"])
+
+
+def estimate_tokens(messages: Messages) -> int:
+    """Approximate token count of messages, including tool calls and results."""
+    return len(json.dumps(messages, ensure_ascii=False, default=str)) // CHARS_PER_TOKEN
+
+
+def render_transcript(messages: Messages) -> str:
+    """Guest and bartender text, one line per message. Tool calls and results are left
+    out; the bartender's replies already say what was found."""
+    lines = []
+    for message in messages:
+        text = " ".join(block["text"] for block in message["content"] if "text" in block).strip()
+        if text:
+            lines.append(f"{'Guest' if message['role'] == 'user' else 'Bartender'}: {text}")
+    return "\n".join(lines)
+
+
+class ContextPolicy(ConversationManager):
+    """Keeps the last turns verbatim and replaces older ones with a running summary.
+
+    Args:
+        window_turns: Guest turns kept verbatim (at least 1).
+        token_budget: Maximum estimated tokens of history carried into a turn, summary included.
+        summarize: Called in the background with the previous summary (or None) and a
+            transcript of the turns to fold in. Returns the new summary, or None on failure.
+        executor: Runs summarize off the request path.
+    """
+
+    def __init__(
+        self,
+        window_turns: int,
+        token_budget: int,
+        summarize: Callable[[str | None, str], str | None],
+        executor: Executor,
+    ):
+        super().__init__()
+        self.window_turns = max(window_turns, 1)
+        self.token_budget = token_budget
+        self._summarize = summarize
+        self._executor = executor
+        self._summary: str | None = None
+        # Session messages [0, _summarized) are covered by the summary
+        self._summarized = 0
+        # Dropped for the budget before being summarized: session messages [_summarized, removed_message_count)
+        self._unsummarized: Messages = []
+        self._job: Future | None = None
+        self.turn_prompt: dict = {}
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        super().register_hooks(registry, **kwargs)
+        registry.add_callback(BeforeInvocationEvent, self._on_before_invocation)
+
+    def get_state(self) -> dict[str, Any]:
+        return {**super().get_state(), "summary": self._summary, "summarized_message_count": self._summarized}
+
+    def restore_from_session(self, state: dict[str, Any]) -> Messages | None:
+        if state.get("__name__") != self.__class__.__name__:
+            # Started under Strands' default sliding window: keep its offset, there is no summary yet
+            self.removed_message_count = self._summarized = state.get("removed_message_count", 0)
+            return None
+        super().restore_from_session(state)
+        self._summary = state.get("summary")
+        self._summarized = state.get("summarized_message_count", 0)
+        return self._summary_messages()
+
+    def apply_management(self, agent: Any, **kwargs: Any) -> None:
+        """End of a turn: take up a finished summary, enforce the budget, and start
+        summarizing whatever has fallen out of the window."""
+        self._take_summary(agent)
+        self._enforce_budget(agent)
+        self._start_summary(agent)
+
+    def reduce_context(self, agent: Any, e: Exception | None = None, **kwargs: Any) -> None:
+        """The model rejected the prompt as too long: drop the oldest turn."""
+        cuts = [i for i in self._turn_starts(agent) if i > 0]
+        if not cuts:
+            raise ContextWindowOverflowException("Current turn alone exceeds the model's context window") from e
+        self._drop(agent, cuts[0])
+
+    @property
+    def summary_pending(self) -> bool:
+        return self._job is not None
+
+    def take_finished_summary(self, agent: Any) -> bool:
+        """Take up a summary that has already finished, without waiting for a running one.
+        Returns True if the agent's history changed (and the session should be synced)."""
+        return self._take_summary(agent)
+
+    def adopt(self, other: "ContextPolicy") -> bool:
+        """Take over the summary another agent of the same session left running, so a fresh
+        agent can pick it up. Only done if both start from the same saved state; otherwise
+        this policy folds the turns again itself."""
+        if other._job is None or self._job is not None:
+            return False
+        if (other.removed_message_count, other._summarized) != (self.removed_message_count, self._summarized):
+            return False
+        self._job, self._unsummarized = other._job, list(other._unsummarized)
+        return True
+
+    def _on_before_invocation(self, event: BeforeInvocationEvent) -> None:
+        self._take_summary(event.agent)
+        self._enforce_budget(event.agent)
+        prompt = event.agent.messages + list(getattr(event, "messages", None) or [])
+        self.turn_prompt = {
+            "PromptMessages": len(prompt),
+            "PromptTokens": estimate_tokens(prompt),
+            "SummaryTokens": len(self._summary or "") // CHARS_PER_TOKEN,
+        }
+
+    def _summary_messages(self) -> Messages:
+        if self._summary is None:
+            return []
+        return [
+            {"role": "user", "content": [{"text": f"{SUMMARY_HEADING}\n{self._summary}"}]},
+            {"role": "assistant", "content": [{"text": SUMMARY_ACK}]},
+        ]
+
+    def _body(self, agent: Any) -> Messages:
+        """The agent's messages after the summary: session messages from removed_message_count on."""
+        return agent.messages[len(self._summary_messages()):]
+
+    def _turn_starts(self, agent: Any) -> list[int]:
+        return [i for i, message in enumerate(self._body(agent)) if is_guest_message(message)]
+
+    def _drop(self, agent: Any, count: int) -> None:
+        body = self._body(agent)
+        self._unsummarized.extend(body[:count])
+        self.removed_message_count += count
+        agent.messages[:] = self._summary_messages() + body[count:]
+
+    def _enforce_budget(self, agent: Any) -> None:
+        """Drop the oldest turns until the history fits the budget, keeping at least the last turn."""
+        body = self._body(agent)
+        sizes = [estimate_tokens([message]) for message in body]
+        total = sum(sizes) + estimate_tokens(self._summary_messages())
+        drop = 0
+        for cut in (i for i in self._turn_starts(agent) if i > 0):
+            if total <= self.token_budget:
+                break
+            total -= sum(sizes[drop:cut])
+            drop = cut
+        if drop:
+            self._drop(agent, drop)
+
+    def _start_summary(self, agent: Any) -> None:
+        if self._job is not None:
+            return
+        starts = self._turn_starts(agent)
+        cut = starts[-self.window_turns] if len(starts) > self.window_turns else 0
+        fold = self._unsummarized + self._body(agent)[:cut]
+        if fold:
+            end = self.removed_message_count + cut
+            self._job = self._executor.submit(self._fold, self._summary, fold, end)
+
+    def _fold(self, summary: str | None, messages: Messages, end: int) -> tuple[str | None, int]:
+        transcript = render_transcript(messages)
+        return (self._summarize(summary, transcript) if transcript else summary), end
+
+    def _take_summary(self, agent: Any) -> bool:
+        """Swap a finished summary in for the messages it covers."""
+        job = self._job
+        if job is None or not job.done():
+            return False
+        self._job = None
+        if job.exception() is not None:
+            return False
+        summary, end = job.result()
+        if summary is None:
+            return False
+
+        body = self._body(agent)
+        covered = max(end - self.removed_message_count, 0)
+        self._unsummarized = self._unsummarized[end - self._summarized:]
+        self.removed_message_count += covered
+        self._summary, self._summarized = summary, end
+        agent.messages[:] = self._summary_messages() + body[covered:]
+        return True
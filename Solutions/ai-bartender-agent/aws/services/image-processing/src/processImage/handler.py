@@ -1,7 +1,9 @@
 """S3 Trigger - Process uploaded images and generate optimized versions."""
 
+import base64
 import json
 import os
+import sys
 import io
 import time
 from contextlib import contextmanager
@@ -13,8 +15,12 @@ from PIL import Image
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+sys.path.insert(0, "/opt/python")
+from shared import log_policy
+
 tracer = Tracer()
 logger = Logger()
+log_policy.install(logger)
 
 IMAGE_SIZES = {
     "thumbnail": (150, 150),
@@ -24,6 +30,9 @@ IMAGE_SIZES = {
 }
 
 WEBP_QUALITY = 85
+# Low-quality image placeholder, inlined into drink list responses (a few hundred bytes)
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
 
 _db_config = None
 
@@ -101,11 +110,8 @@ def upload_image_to_s3(
     )
 
 
-@tracer.capture_method
-def resize_and_convert_image(
-    image_data: bytes, target_size: tuple[int, int], quality: int = WEBP_QUALITY
-) -> bytes:
-    """Resize image and convert to WebP format."""
+def load_rgb_image(image_data: bytes) -> Image.Image:
+    """Decode the upload once and flatten transparency onto white."""
     img = Image.open(io.BytesIO(image_data))
 
     if img.mode in ("RGBA", "LA", "P"):
@@ -119,6 +125,15 @@ def resize_and_convert_image(
     elif img.mode != "RGB":
         img = img.convert("RGB")
 
+    return img
+
+
+@tracer.capture_method
+def resize_and_convert_image(
+    img: Image.Image, target_size: tuple[int, int], quality: int = WEBP_QUALITY
+) -> bytes:
+    """Resize a decoded image and convert to WebP format."""
+    img = img.copy()
     img.thumbnail(target_size, Image.Resampling.LANCZOS)
 
     output = io.BytesIO()
@@ -127,8 +142,21 @@ def resize_and_convert_image(
 
 
 @tracer.capture_method
-def update_drink_image_url(drink_id: str, image_url: str, max_retries: int = 3, retry_delay: float = 2.0) -> None:
-    """Update drink record with image URL. Retries if drink not yet visible."""
+def generate_placeholder(img: Image.Image) -> str:
+    """Tiny blurred WebP as a data URI so clients can paint before the real image loads."""
+    placeholder = img.copy()
+    placeholder.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.Resampling.BOX)
+
+    output = io.BytesIO()
+    placeholder.save(output, format="WEBP", quality=PLACEHOLDER_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(output.getvalue()).decode("ascii")
+
+
+@tracer.capture_method
+def update_drink_image_url(
+    drink_id: str, image_url: str, image_placeholder: str, max_retries: int = 3, retry_delay: float = 2.0
+) -> None:
+    """Update drink record with image URL and placeholder. Retries if drink not yet visible."""
     for attempt in range(1, max_retries + 1):
         with get_connection() as conn:
             with conn.cursor() as cur:
@@ -149,10 +177,10 @@ def update_drink_image_url(drink_id: str, image_url: str, max_retries: int = 3,
                 cur.execute(
                     """
                     UPDATE cocktails.drinks
-                    SET image_url = %s, updated_at = NOW()
+                    SET image_url = %s, image_placeholder = %s, updated_at = NOW()
                     WHERE id = %s
                     """,
-                    [image_url, drink_id],
+                    [image_url, image_placeholder, drink_id],
                 )
                 conn.commit()
                 logger.info("Updated drink image URL", extra={"drink_id": drink_id, "attempt": attempt})
@@ -171,7 +199,7 @@ def process_image(bucket: str, key: str) -> dict[str, str]:
     drink_id = parts[1]
     original_image = download_image_from_s3(bucket, key)
 
-    img = Image.open(io.BytesIO(original_image))
+    img = load_rgb_image(original_image)
     width, height = img.size
     if width < 400 or height < 400:
         raise ValueError(f"Image too small: {width}x{height}. Minimum: 400x400")
@@ -180,7 +208,7 @@ def process_image(bucket: str, key: str) -> dict[str, str]:
     cloudfront_domain = os.environ.get("CLOUDFRONT_DOMAIN", "")
 
     for size_name, dimensions in IMAGE_SIZES.items():
-        webp_image = resize_and_convert_image(original_image, dimensions)
+        webp_image = resize_and_convert_image(img, dimensions)
         output_key = f"images/optimized/{size_name}/{drink_id}.webp"
         upload_image_to_s3(bucket, output_key, webp_image)
 
@@ -193,7 +221,7 @@ def process_image(bucket: str, key: str) -> dict[str, str]:
 
     image_url = generated_urls.get("medium", "")
     if image_url:
-        update_drink_image_url(drink_id, image_url)
+        update_drink_image_url(drink_id, image_url, generate_placeholder(img))
 
     logger.info("Image processing complete", extra={"drink_id": drink_id, "sizes": len(generated_urls)})
     return generated_urls
@@ -203,7 +231,8 @@ def process_image(bucket: str, key: str) -> dict[str, str]:
 @tracer.capture_lambda_handler
 def handler(event: dict, context: LambdaContext) -> dict:
     """EventBridge trigger handler for S3 image uploads."""
-    logger.info("Processing event", extra={"event": event})
+    log_policy.start_invocation()
+    log_policy.log_payload(logger, "Processing event", event)
 
     try:
         detail = event.get("detail", {})
@@ -0,0 +1,29 @@
+-- =============================================================================
+-- AI Bartender - Order idempotency keys
+-- Stores the first response for a client-supplied Idempotency-Key so retried
+-- POST /orders requests are answered without creating a second order
+-- =============================================================================
+
+-- Schema Change: Up
+CREATE TABLE IF NOT EXISTS cocktails.order_idempotency_keys (
+    -- Aurora DSQL doesn't enforce foreign keys; validate in application layer
+    user_key UUID NOT NULL,
+    idempotency_key VARCHAR(255) NOT NULL,
+    order_id UUID NOT NULL,
+    drink_id UUID NOT NULL,
+    status_code INTEGER NOT NULL,
+    -- Aurora DSQL doesn't support JSON/JSONB as column types; store JSON as text
+    response_body TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (user_key, idempotency_key)
+);
+
+CREATE INDEX ASYNC IF NOT EXISTS idx_order_idempotency_keys_expires ON cocktails.order_idempotency_keys(expires_at);
+
+GRANT SELECT, INSERT, UPDATE, DELETE ON cocktails.order_idempotency_keys TO lambda_drink_writer;
+
+GRANT SELECT ON cocktails.order_idempotency_keys TO lambda_drink_reader;
+
+-- Schema Change: Down
+DROP TABLE IF EXISTS cocktails.order_idempotency_keys;
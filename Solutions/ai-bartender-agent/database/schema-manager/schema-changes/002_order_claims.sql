@@ -0,0 +1,11 @@
+-- =============================================================================
+-- AI Bartender - Order claims
+-- Records which bartender claimed an order from the pending queue
+-- =============================================================================
+
+-- Schema Change: Up
+ALTER TABLE cocktails.orders ADD COLUMN claimed_by VARCHAR(255);
+
+ALTER TABLE cocktails.orders ADD COLUMN claimed_at TIMESTAMP;
+
+-- No down section: Aurora DSQL doesn't support ALTER TABLE ... DROP COLUMN
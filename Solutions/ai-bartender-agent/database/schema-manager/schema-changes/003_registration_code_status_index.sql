@@ -0,0 +1,30 @@
+-- =============================================================================
+-- AI Bartender - Indexable registration code status
+-- is_used is the persisted "fully used" flag (register sets it when use_count
+-- reaches max_uses). Normalize legacy rows so listings can filter on is_used
+-- and expires_at directly instead of COALESCE expressions, and add an index
+-- that serves status filtering plus keyset pagination on (created_at, code).
+-- The backfill runs in batches of 1000 rows to stay under DSQL's per-transaction
+-- row limit
+-- =============================================================================
+
+-- Schema Change: Up
+-- Schema Change: Repeat
+UPDATE cocktails.registration_codes
+SET max_uses = COALESCE(max_uses, 1),
+    use_count = COALESCE(use_count, CASE WHEN is_used THEN 1 ELSE 0 END),
+    is_used = COALESCE(use_count, CASE WHEN is_used THEN 1 ELSE 0 END) >= COALESCE(max_uses, 1)
+WHERE code IN (
+    SELECT code FROM cocktails.registration_codes
+    WHERE max_uses IS NULL OR use_count IS NULL OR is_used IS NULL
+    LIMIT 1000
+);
+
+CREATE INDEX ASYNC IF NOT EXISTS idx_registration_codes_status_created ON cocktails.registration_codes(is_used, created_at, code);
+
+CREATE INDEX ASYNC IF NOT EXISTS idx_registration_codes_created_code ON cocktails.registration_codes(created_at, code);
+
+-- Schema Change: Down
+DROP INDEX IF EXISTS cocktails.idx_registration_codes_created_code;
+
+DROP INDEX IF EXISTS cocktails.idx_registration_codes_status_created;
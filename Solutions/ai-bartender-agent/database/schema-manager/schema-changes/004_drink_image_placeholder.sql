@@ -0,0 +1,10 @@
+-- =============================================================================
+-- AI Bartender - Drink image placeholders
+-- Tiny base64 WebP data URI written by processImage next to the optimized
+-- variants, so menu clients can paint a blurred tile before the image loads
+-- =============================================================================
+
+-- Schema Change: Up
+ALTER TABLE cocktails.drinks ADD COLUMN image_placeholder TEXT;
+
+-- No down section: Aurora DSQL doesn't support ALTER TABLE ... DROP COLUMN
@@ -0,0 +1,12 @@
+-- =============================================================================
+-- AI Bartender - Refresh token purge support
+-- purgeExpiredTokens deletes the oldest expired rows via idx_refresh_tokens_expires
+-- (from 000) and the oldest revoked rows via this index. revoked_at is NULL for
+-- live tokens, so the range scan only touches revoked ones
+-- =============================================================================
+
+-- Schema Change: Up
+CREATE INDEX ASYNC IF NOT EXISTS idx_refresh_tokens_revoked_at ON cocktails.refresh_tokens(revoked_at);
+
+-- Schema Change: Down
+DROP INDEX IF EXISTS cocktails.idx_refresh_tokens_revoked_at;
@@ -8,7 +8,10 @@ this tool to apply them in order.
 
 SQL files use the format: NNN_description.sql
 Each file can contain an "up" section and an optional "down" section
-separated by "-- Schema Change: Down".
+separated by "-- Schema Change: Down". A statement preceded by
+"-- Schema Change: Repeat" is run again, each time in its own transaction,
+until it changes no rows; use it for backfills that must stay under DSQL's
+per-transaction row limit.
 
 Usage:
     python schema_manager.py --action upgrade
@@ -37,6 +40,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Kept in the parsed SQL in front of a statement that apply_change repeats until it changes no rows
+REPEAT_MARKER = "-- Schema Change: Repeat"
+
 
 def load_config() -> Dict:
     """Load database configuration from config.json"""
@@ -171,6 +177,9 @@ class SchemaManager:
             if stripped.lower().startswith("-- schema change: up"):
                 section = "up"
                 continue
+            if stripped.lower().startswith(REPEAT_MARKER.lower()):
+                (up_lines if section == "up" else down_lines).append(REPEAT_MARKER)
+                continue
             if stripped.startswith("--") or not stripped:
                 continue
 
@@ -200,7 +209,16 @@ class SchemaManager:
             with conn.cursor() as cur:
                 logger.info(f"Applying schema change {version}: {name}")
                 for stmt in [s.strip() for s in up_sql.split(";") if s.strip()]:
-                    cur.execute(stmt)
+                    if not stmt.startswith(REPEAT_MARKER):
+                        cur.execute(stmt)
+                        continue
+                    batches = 0
+                    while True:
+                        cur.execute(stmt[len(REPEAT_MARKER):].strip())
+                        if cur.rowcount <= 0:
+                            break
+                        batches += 1
+                    logger.info(f"Repeated statement ran {batches} batch(es)")
         finally:
             conn.close()
 
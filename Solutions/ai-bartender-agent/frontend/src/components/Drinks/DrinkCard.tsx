@@ -81,6 +81,7 @@ const DrinkCard: React.FC<DrinkCardProps> = ({
           className="w-full aspect-[3/4]"
           lazy={true}
           objectFit="cover"
+          placeholder={drink.image_placeholder}
         />
 
         {/* Gradient Overlay */}
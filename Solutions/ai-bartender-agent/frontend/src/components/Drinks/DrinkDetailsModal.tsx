@@ -97,6 +97,7 @@ const DrinkDetailsModal: React.FC<DrinkDetailsModalProps> = ({
           className="w-full rounded-lg aspect-square"
           lazy={false}
           objectFit="cover"
+          placeholder={drink.image_placeholder}
         />
 
         {/* Content */}
@@ -10,6 +10,7 @@ interface ResponsiveImageProps {
   lazy?: boolean;
   cacheBuster?: string;  // Optional timestamp or version to bust cache
   objectFit?: 'cover' | 'contain' | 'fill';
+  placeholder?: string | null;  // Tiny inline image from the API, shown blurred until the real one loads
 }
 
 const CLOUDFRONT_DOMAIN = import.meta.env.VITE_CLOUDFRONT_DOMAIN;
@@ -38,6 +39,7 @@ export const ResponsiveImage: React.FC<ResponsiveImageProps> = ({
   lazy = true,
   cacheBuster,
   objectFit = 'cover',
+  placeholder,
 }) => {
   const [imageLoaded, setImageLoaded] = useState(false);
   const [imageError, setImageError] = useState(false);
@@ -108,8 +110,17 @@ export const ResponsiveImage: React.FC<ResponsiveImageProps> = ({
 
   return (
     <div className={`relative overflow-hidden ${className}`} ref={containerRef}>
-      {/* Placeholder while loading - fills the container */}
-      {!imageLoaded && inView && (
+      {/* Placeholder while loading - fills the container. The inline placeholder
+          needs no request, so it is painted even before the tile scrolls into view */}
+      {!imageLoaded && placeholder && (
+        <img
+          src={placeholder}
+          alt=""
+          aria-hidden="true"
+          className={`absolute inset-0 w-full h-full ${objectFitClass} filter blur-md scale-110`}
+        />
+      )}
+      {!imageLoaded && !placeholder && inView && (
         <div className="absolute inset-0 bg-gradient-to-br from-gray-200 to-gray-300 dark:from-gray-700 dark:to-gray-800 animate-pulse" />
       )}
 
@@ -41,6 +41,7 @@ export const useChat = () => {
     const request: ChatRequest = {
       message: text.trim(),
       session_id: sessionId || undefined,
+      stream_format: 'compact',
     };
 
     const newSessionId = await streamChatMessage(
@@ -45,6 +45,46 @@ export async function streamChatMessage(
 
     const decoder = new TextDecoder();
     let buffer = '';
+    // The server never resends the full reply; reassemble it from the chunks
+    let fullResponse = '';
+
+    const handleEvent = (eventName: string, data: string): boolean => {
+      if (request.stream_format === 'compact' && eventName === 'message') {
+        fullResponse += data;
+        onChunk(data, sessionId || '');
+        return false;
+      }
+
+      let parsed: ChatSSEEvent;
+      try {
+        parsed = JSON.parse(data);
+      } catch {
+        // Ignore malformed JSON lines (could be heartbeats or comments)
+        return false;
+      }
+
+      if (eventName === 'error' || 'error' in parsed) {
+        onError((parsed as { error: string }).error);
+        return true;
+      }
+
+      if (eventName === 'done' || ('done' in parsed && parsed.done)) {
+        const done = parsed as { sessionId: string; chars?: number };
+        sessionId = done.sessionId || sessionId;
+        if (done.chars !== undefined && done.chars !== fullResponse.length) {
+          console.warn(`Chat stream length mismatch: got ${fullResponse.length}, expected ${done.chars}`);
+        }
+        onDone(fullResponse, done.sessionId);
+        return true;
+      }
+
+      if ('chunk' in parsed) {
+        sessionId = parsed.sessionId || sessionId;
+        fullResponse += parsed.chunk;
+        onChunk(parsed.chunk, sessionId || '');
+      }
+      return false;
+    };
 
     while (true) {
       const { done, value } = await reader.read();
@@ -52,38 +92,25 @@ export async function streamChatMessage(
 
       buffer += decoder.decode(value, { stream: true });
 
-      // Parse SSE events from the buffer (format: "data: {json}\n\n")
+      // SSE events are separated by a blank line; multiple data: lines are joined with \n
       const events = buffer.split('\n\n');
       buffer = events.pop() || '';
 
       for (const event of events) {
-        const lines = event.split('\n');
-        for (const line of lines) {
-          if (line.startsWith('data: ')) {
-            const jsonStr = line.slice(6);
-            try {
-              const parsed: ChatSSEEvent = JSON.parse(jsonStr);
-
-              if ('error' in parsed) {
-                onError(parsed.error);
-                return sessionId;
-              }
-
-              if ('done' in parsed && parsed.done) {
-                sessionId = parsed.sessionId || sessionId;
-                onDone(parsed.response, parsed.sessionId);
-                return sessionId;
-              }
-
-              if ('chunk' in parsed) {
-                sessionId = parsed.sessionId || sessionId;
-                onChunk(parsed.chunk, parsed.sessionId);
-              }
-            } catch {
-              // Ignore malformed JSON lines (could be heartbeats or comments)
-            }
+        let eventName = 'message';
+        const dataLines: string[] = [];
+        for (const line of event.split('\n')) {
+          if (line.startsWith('event: ')) {
+            eventName = line.slice(7);
+          } else if (line.startsWith('data: ')) {
+            dataLines.push(line.slice(6));
+          } else if (line === 'data:') {
+            dataLines.push('');
           }
         }
+        if (dataLines.length > 0 && handleEvent(eventName, dataLines.join('\n'))) {
+          return sessionId;
+        }
       }
     }
 
@@ -10,13 +10,14 @@ export interface ChatMessage {
 
 export interface ChatSSEChunkEvent {
   chunk: string;
-  sessionId: string;
+  sessionId?: string;
 }
 
 export interface ChatSSEDoneEvent {
   done: true;
   sessionId: string;
-  response: string;
+  /** Length of the full reply in UTF-16 code units (string.length); the client reassembles it from the chunks */
+  chars: number;
 }
 
 export interface ChatSSEErrorEvent {
@@ -26,8 +27,12 @@ export interface ChatSSEErrorEvent {
 
 export type ChatSSEEvent = ChatSSEChunkEvent | ChatSSEDoneEvent | ChatSSEErrorEvent;
 
+export type ChatStreamFormat = 'json' | 'compact';
+
 export interface ChatRequest {
   message: string;
   session_id?: string;
   actor_id?: string;
+  /** compact: chunk text as raw SSE data lines, named done/error events */
+  stream_format?: ChatStreamFormat;
 }
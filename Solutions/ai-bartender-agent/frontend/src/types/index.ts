@@ -48,6 +48,7 @@ export interface Drink {
   ingredients: string[];  // Legacy - simple array, kept for backwards compatibility
   recipe?: DrinkRecipe;   // Structured recipe
   image_url: string;
+  image_placeholder?: string | null;  // base64 WebP data URI for instant blurred tiles
   is_active: boolean;
   created_at: string;
 }